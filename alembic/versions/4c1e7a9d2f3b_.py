@@ -0,0 +1,70 @@
+"""store schedule times as minutes since midnight
+
+Revision ID: 4c1e7a9d2f3b
+Revises: 8210830838bb
+Create Date: 2026-10-18 15:42:07.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = '4c1e7a9d2f3b'
+down_revision: Union[str, Sequence[str], None] = '8210830838bb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TIME_COLUMNS = ('start_time', 'end_time')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "UPDATE schedule SET "
+        + ", ".join(
+            f"{column} = CAST(substr({column}, 1, 2) AS INTEGER) * 60"
+            f" + CAST(substr({column}, 4, 2) AS INTEGER)"
+            for column in TIME_COLUMNS
+        )
+    )
+    with op.batch_alter_table('schedule', schema=None) as batch_op:
+        for column in TIME_COLUMNS:
+            batch_op.alter_column(
+                column,
+                existing_type=sqlmodel.sql.sqltypes.AutoString(),
+                type_=sa.Integer(),
+                existing_nullable=False,
+                postgresql_using=f'{column}::integer',
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('schedule', schema=None) as batch_op:
+        for column in TIME_COLUMNS:
+            batch_op.alter_column(
+                column,
+                existing_type=sa.Integer(),
+                type_=sqlmodel.sql.sqltypes.AutoString(),
+                existing_nullable=False,
+            )
+    schedule = sa.table(
+        'schedule',
+        sa.column('id', sa.Integer),
+        *(sa.column(column, sa.String) for column in TIME_COLUMNS),
+    )
+    bind = op.get_bind()
+    for row in bind.execute(sa.select(schedule)).all():
+        bind.execute(
+            schedule.update()
+            .where(schedule.c.id == row.id)
+            .values(
+                {
+                    column: '{:02d}:{:02d}'.format(*divmod(int(row._mapping[column]), 60))
+                    for column in TIME_COLUMNS
+                }
+            )
+        )
\ No newline at end of file
@@ -1,12 +1,16 @@
 import reflex as rx
+from app.export import export_api
 from app.states.state import State
 from app.pages import (
     dashboard_page,
     teachers_page,
     classes_page,
+    rooms_page,
     schedules_page,
+    timetable_page,
     rules_page,
     subject_requirements_page,
+    import_page,
 )
 
 app = rx.App(
@@ -19,4 +23,5 @@ app = rx.App(
             rel="stylesheet",
         ),
     ],
+    api_transformer=export_api,
 )
\ No newline at end of file
@@ -0,0 +1,171 @@
+import csv
+import io
+import json
+from typing import BinaryIO, Callable, Iterator, TypedDict
+
+import reflex as rx
+
+from app.models import ClassModel, SubjectRequirementModel, TeacherModel
+from app.scheduling.subjects import split_subjects
+
+
+class ImportRowError(TypedDict):
+    """A record that was skipped during a bulk import, and why."""
+
+    file: str
+    row: int
+    error: str
+
+
+class ImportLookups(TypedDict):
+    """Existing records that imported subject requirements may refer to."""
+
+    class_ids: set[int]
+    class_ids_by_name: dict[str, int | None]
+
+
+def read_records(filename: str, stream: BinaryIO) -> Iterator[tuple[int, object]]:
+    """Yields ``(row, record)`` for each record of a CSV, JSON or JSON-lines file.
+
+    CSV and JSON-lines files are decoded and parsed as they are read, a
+    buffer at a time, so a large upload is never held in memory whole. A
+    JSON file holds a single array, which is parsed in one go.
+
+    CSV rows are numbered by their line in the file, JSON records by their
+    position in the top-level array and JSON-lines records by their line.
+    A JSON-lines line that does not parse is yielded as the exception so it
+    can be reported against its row without stopping the import.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        name = filename.lower()
+        if name.endswith((".jsonl", ".ndjson")):
+            for row, line in enumerate(text, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield row, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield row, e
+        elif name.endswith(".json"):
+            records = json.load(text)
+            if not isinstance(records, list):
+                raise ValueError("Expected a JSON array of records.")
+            yield from enumerate(records, start=1)
+        else:
+            reader = csv.DictReader(text)
+            for record in reader:
+                yield reader.line_num, record
+    finally:
+        # The upload belongs to the caller; don't close it with the wrapper.
+        text.detach()
+
+
+def _text(record: dict, field: str, required: bool = True) -> str:
+    value = record.get(field)
+    value = "" if value is None else str(value).strip()
+    if required and not value:
+        raise ValueError(f"Missing {field}.")
+    return value
+
+
+def _integer(record: dict, field: str) -> int:
+    value = _text(record, field)
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{field} must be a whole number, got {value!r}.") from None
+
+
+def validate_teacher(record: dict, lookups: ImportLookups) -> dict:
+    email = _text(record, "email", required=False)
+    if email and "@" not in email:
+        raise ValueError(f"Invalid email {email!r}.")
+    return {
+        "name": _text(record, "name"),
+        "email": email,
+        "subject": ", ".join(split_subjects(_text(record, "subject"))),
+    }
+
+
+def validate_class(record: dict, lookups: ImportLookups) -> dict:
+    duration = _integer(record, "duration")
+    if not 0 < duration < 24 * 60:
+        raise ValueError("duration must be between 1 and 1439 minutes.")
+    size = _integer(record, "size") if _text(record, "size", required=False) else 0
+    if size < 0:
+        raise ValueError("size cannot be negative.")
+    return {
+        "name": _text(record, "name"),
+        "subject": _text(record, "subject"),
+        "duration": duration,
+        "size": size,
+    }
+
+
+def validate_subject_requirement(record: dict, lookups: ImportLookups) -> dict:
+    """Resolves the class by ``class_id`` or, failing that, by ``class_name``."""
+    if _text(record, "class_id", required=False):
+        class_id = _integer(record, "class_id")
+        if class_id not in lookups["class_ids"]:
+            raise ValueError(f"Unknown class_id {class_id}.")
+    else:
+        class_name = _text(record, "class_name")
+        if class_name not in lookups["class_ids_by_name"]:
+            raise ValueError(f"Unknown class {class_name!r}.")
+        class_id = lookups["class_ids_by_name"][class_name]
+        if class_id is None:
+            raise ValueError(f"Class name {class_name!r} is ambiguous; use class_id.")
+    sessions = (
+        _integer(record, "sessions") if _text(record, "sessions", required=False) else 1
+    )
+    if sessions < 1:
+        raise ValueError("sessions must be at least 1.")
+    return {
+        "class_id": class_id,
+        "subject": _text(record, "subject"),
+        "sessions": sessions,
+    }
+
+
+IMPORTERS: dict[str, tuple[type[rx.Model], Callable[[dict, ImportLookups], dict]]] = {
+    "teacher": (TeacherModel, validate_teacher),
+    "class": (ClassModel, validate_class),
+    "subject_requirement": (SubjectRequirementModel, validate_subject_requirement),
+}
+
+
+def valid_rows(
+    kind: str,
+    filename: str,
+    stream: BinaryIO,
+    lookups: ImportLookups,
+    errors: list[ImportRowError],
+) -> Iterator[dict]:
+    """Yields the validated rows of one file, appending the rejects to ``errors``.
+
+    A file that turns out to be unreadable part way through is reported
+    against the last row read; the rows before it are kept.
+    """
+    _, validate = IMPORTERS[kind]
+    row = 0
+    try:
+        for row, record in read_records(filename, stream):
+            try:
+                if isinstance(record, Exception):
+                    raise ValueError(f"Not valid JSON: {record}")
+                if not isinstance(record, dict):
+                    raise ValueError("Expected an object with named fields.")
+                yield validate(record, lookups)
+            except ValueError as e:
+                errors.append({"file": filename, "row": row, "error": str(e)})
+    except (UnicodeDecodeError, ValueError, csv.Error) as e:
+        errors.append({"file": filename, "row": row, "error": f"Unreadable file: {e}"})
+
+
+def import_summary(created: int, files: int, errors: list[ImportRowError]) -> str:
+    """Describes how an import went, for the summary under the upload form."""
+    return (
+        f"Imported {created} record(s) from {files} file(s); "
+        f"{len(errors)} row(s) skipped."
+    )
@@ -0,0 +1,12 @@
+import reflex as rx
+from reflex.vars.function import FunctionStringVar
+
+_TIME_LABEL = FunctionStringVar.create(
+    "((minutes) => [Math.floor(minutes / 60), minutes % 60]"
+    ".map((part) => String(part).padStart(2, '0')).join(':'))"
+)
+
+
+def time_label(minutes: rx.Var) -> rx.Var[str]:
+    """Formats minutes since midnight as "HH:MM" in the browser."""
+    return _TIME_LABEL.call(minutes).to(str)
\ No newline at end of file
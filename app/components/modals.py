@@ -7,17 +7,19 @@ def _form_input(
     name: str,
     placeholder: str,
     value: rx.Var,
-    on_change: rx.event.EventHandler,
     type: str = "text",
 ) -> rx.Component:
-    """Creates a styled form input with a label."""
+    """Creates a styled form input with a label.
+
+    The input is uncontrolled, so typing stays in the browser and the value
+    only reaches the state when the whole form is submitted.
+    """
     return rx.el.div(
         rx.el.label(label, class_name="text-sm font-medium text-gray-700"),
         rx.el.input(
             name=name,
             placeholder=placeholder,
             default_value=value,
-            on_change=on_change,
             type=type,
             class_name="mt-1 block w-full rounded-lg border-gray-200 bg-white px-4 py-2 text-gray-700 shadow-sm focus:border-orange-500 focus:ring-orange-500",
         ),
@@ -37,21 +39,18 @@ def teacher_modal_content() -> rx.Component:
             "teacher_name",
             "e.g. John Doe",
             State.teacher_name,
-            State.set_teacher_name,
         ),
         _form_input(
             "Subject Expertise",
             "teacher_subject",
             "e.g. Math, Science",
             State.teacher_subject,
-            State.set_teacher_subject,
         ),
         _form_input(
             "Email Address",
             "teacher_email",
             "e.g. john.doe@school.com",
             State.teacher_email,
-            State.set_teacher_email,
             type="email",
         ),
         rx.el.div(
@@ -84,21 +83,25 @@ def class_modal_content() -> rx.Component:
             "class_name",
             "e.g. Introduction to Physics",
             State.class_name,
-            State.set_class_name,
         ),
         _form_input(
             "Subject",
             "class_subject",
             "e.g. Science",
             State.class_subject,
-            State.set_class_subject,
         ),
         _form_input(
             "Duration (minutes)",
             "class_duration",
             "e.g. 60",
             State.class_duration,
-            State.set_class_duration,
+            type="number",
+        ),
+        _form_input(
+            "Class Size (students)",
+            "class_size",
+            "e.g. 25",
+            State.class_size,
             type="number",
         ),
         rx.el.div(
@@ -119,6 +122,44 @@ def class_modal_content() -> rx.Component:
     )
 
 
+def room_modal_content() -> rx.Component:
+    """The content for the 'Add/Edit Room' modal."""
+    return rx.el.form(
+        rx.el.h2(
+            rx.cond(State.is_editing, "Edit Room", "Add New Room"),
+            class_name="text-lg font-semibold text-gray-900 mb-4",
+        ),
+        _form_input(
+            "Room Name",
+            "room_name",
+            "e.g. Lab 2",
+            State.room_name,
+        ),
+        _form_input(
+            "Capacity (seats)",
+            "room_capacity",
+            "e.g. 30",
+            State.room_capacity,
+            type="number",
+        ),
+        rx.el.div(
+            rx.el.button(
+                "Cancel",
+                on_click=State.close_modal,
+                type="button",
+                class_name="w-full justify-center rounded-md border border-gray-300 bg-white px-4 py-2 text-sm font-medium text-gray-700 shadow-sm hover:bg-gray-50 focus:outline-none focus:ring-2 focus:ring-gray-500 focus:ring-offset-2",
+            ),
+            rx.el.button(
+                "Save Room",
+                type="submit",
+                class_name="w-full justify-center rounded-md border border-transparent bg-orange-600 px-4 py-2 text-sm font-medium text-white shadow-sm hover:bg-orange-700 focus:outline-none focus:ring-2 focus:ring-orange-500 focus:ring-offset-2",
+            ),
+            class_name="mt-5 sm:mt-6 grid grid-cols-2 gap-3",
+        ),
+        on_submit=State.save_room,
+    )
+
+
 def schedule_modal_content() -> rx.Component:
     """The content for the 'Add/Edit Schedule' modal."""
     return rx.el.form(
@@ -131,11 +172,11 @@ def schedule_modal_content() -> rx.Component:
             rx.el.select(
                 rx.el.option("Select a class", value="", disabled=True),
                 rx.foreach(
-                    State.classes,
+                    State.classes.values(),
                     lambda cls: rx.el.option(cls["name"], value=cls["id"].to_string()),
                 ),
-                value=State.schedule_class_id,
-                on_change=State.set_schedule_class_id,
+                name="schedule_class_id",
+                default_value=State.schedule_class_id,
                 class_name="mt-1 block w-full rounded-lg border-gray-200 bg-white px-4 py-2 text-gray-700 shadow-sm focus:border-orange-500 focus:ring-orange-500",
             ),
             class_name="mb-4",
@@ -145,13 +186,29 @@ def schedule_modal_content() -> rx.Component:
             rx.el.select(
                 rx.el.option("Select a teacher", value="", disabled=True),
                 rx.foreach(
-                    State.teachers,
+                    State.teachers.values(),
                     lambda teacher: rx.el.option(
                         teacher["name"], value=teacher["id"].to_string()
                     ),
                 ),
-                value=State.schedule_teacher_id,
-                on_change=State.set_schedule_teacher_id,
+                name="schedule_teacher_id",
+                default_value=State.schedule_teacher_id,
+                class_name="mt-1 block w-full rounded-lg border-gray-200 bg-white px-4 py-2 text-gray-700 shadow-sm focus:border-orange-500 focus:ring-orange-500",
+            ),
+            class_name="mb-4",
+        ),
+        rx.el.div(
+            rx.el.label("Room", class_name="text-sm font-medium text-gray-700"),
+            rx.el.select(
+                rx.el.option("No room", value=""),
+                rx.foreach(
+                    State.rooms.values(),
+                    lambda room: rx.el.option(
+                        room["name"], value=room["id"].to_string()
+                    ),
+                ),
+                name="schedule_room_id",
+                default_value=State.schedule_room_id,
                 class_name="mt-1 block w-full rounded-lg border-gray-200 bg-white px-4 py-2 text-gray-700 shadow-sm focus:border-orange-500 focus:ring-orange-500",
             ),
             class_name="mb-4",
@@ -163,8 +220,8 @@ def schedule_modal_content() -> rx.Component:
                     ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"],
                     lambda day: rx.el.option(day, value=day),
                 ),
-                value=State.schedule_day_of_week,
-                on_change=State.set_schedule_day_of_week,
+                name="schedule_day_of_week",
+                default_value=State.schedule_day_of_week,
                 class_name="mt-1 block w-full rounded-lg border-gray-200 bg-white px-4 py-2 text-gray-700 shadow-sm focus:border-orange-500 focus:ring-orange-500",
             ),
             class_name="mb-4",
@@ -174,7 +231,6 @@ def schedule_modal_content() -> rx.Component:
             "schedule_start_time",
             "e.g. 09:00",
             State.schedule_start_time,
-            State.set_schedule_start_time,
             type="time",
         ),
         rx.el.div(
@@ -207,6 +263,7 @@ def app_modal() -> rx.Component:
                     State.modal_type,
                     ("teacher", teacher_modal_content()),
                     ("class", class_modal_content()),
+                    ("room", room_modal_content()),
                     ("schedule", schedule_modal_content()),
                     ("rule", rule_modal_content()),
                     ("subject_requirement", subject_requirement_modal_content()),
@@ -232,13 +289,13 @@ def rule_modal_content() -> rx.Component:
             rx.el.select(
                 rx.el.option("Select a teacher", value="", disabled=True),
                 rx.foreach(
-                    State.teachers,
+                    State.teachers.values(),
                     lambda teacher: rx.el.option(
                         teacher["name"], value=teacher["id"].to_string()
                     ),
                 ),
-                value=State.rule_teacher_id,
-                on_change=State.set_rule_teacher_id,
+                name="rule_teacher_id",
+                default_value=State.rule_teacher_id,
                 class_name="mt-1 block w-full rounded-lg border-gray-200 bg-white px-4 py-2 text-gray-700 shadow-sm focus:border-orange-500 focus:ring-orange-500",
             ),
             class_name="mb-4",
@@ -248,7 +305,6 @@ def rule_modal_content() -> rx.Component:
             "rule_min_hours",
             "e.g. 10",
             State.rule_min_hours,
-            State.set_rule_min_hours,
             type="number",
         ),
         rx.el.div(
@@ -285,11 +341,11 @@ def subject_requirement_modal_content() -> rx.Component:
             rx.el.select(
                 rx.el.option("Select a class", value="", disabled=True),
                 rx.foreach(
-                    State.classes,
+                    State.classes.values(),
                     lambda cls: rx.el.option(cls["name"], value=cls["id"].to_string()),
                 ),
-                value=State.subject_requirement_class_id,
-                on_change=State.set_subject_requirement_class_id,
+                name="subject_requirement_class_id",
+                default_value=State.subject_requirement_class_id,
                 class_name="mt-1 block w-full rounded-lg border-gray-200 bg-white px-4 py-2 text-gray-700 shadow-sm focus:border-orange-500 focus:ring-orange-500",
             ),
             class_name="mb-4",
@@ -299,7 +355,13 @@ def subject_requirement_modal_content() -> rx.Component:
             "subject_requirement_subject",
             "e.g. Math",
             State.subject_requirement_subject,
-            State.set_subject_requirement_subject,
+        ),
+        _form_input(
+            "Sessions per Week",
+            "subject_requirement_sessions",
+            "e.g. 5",
+            State.subject_requirement_sessions,
+            type="number",
         ),
         rx.el.div(
             rx.el.button(
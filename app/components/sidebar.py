@@ -31,9 +31,12 @@ def sidebar() -> rx.Component:
             nav_item("Dashboard", "/", "layout-dashboard"),
             nav_item("Teachers", "/teachers", "users"),
             nav_item("Classes", "/classes", "book-open"),
+            nav_item("Rooms", "/rooms", "door-open"),
             nav_item("Schedules", "/schedules", "calendar-check"),
+            nav_item("Timetable", "/timetable", "calendar-range"),
             nav_item("Rules", "/rules", "gavel"),
             nav_item("Subject Requirements", "/subject_requirements", "book-check"),
+            nav_item("Import", "/import", "upload"),
             class_name="flex-1 overflow-auto py-2 grid items-start px-4 text-sm font-medium",
         ),
         class_name="hidden border-r bg-gray-50/40 md:block w-64",
@@ -0,0 +1,650 @@
+import functools
+import itertools
+from typing import TYPE_CHECKING, Callable, Iterable
+
+from app.models import (
+    ClassModel,
+    RoomModel,
+    RuleModel,
+    ScheduleModel,
+    SubjectRequirementModel,
+    TeacherModel,
+    delete_cascade,
+    delete_detaching,
+    delete_row,
+    insert_row,
+    load_rows,
+    patch_schedules,
+    replace_schedules,
+    update_row,
+)
+from app.references import ReferenceIndex
+from app.scheduling.occupancy import OccupancyGrid, Resource, booking_resources
+from app.scheduling.schedule_table import ScheduleTable
+from app.scheduling.subjects import SubjectIndex
+from app.scheduling.timetable import Timetable, TimetableRow
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+    from redis.asyncio.client import Pipeline
+
+VIEWS = ("teachers", "classes", "rooms", "rules", "subject_requirements", "schedules")
+GENERATION_KEY = "school_scheduler:dataset:generation"
+SNAPSHOT_KEY = "school_scheduler:dataset:snapshot"
+
+
+def _by_id(rows: list[dict]) -> dict[int, dict]:
+    """Keys rows by id, keeping their order for display."""
+    return {row["id"]: row for row in rows}
+
+
+def _resources(schedule: dict) -> list[Resource]:
+    return booking_resources(
+        schedule["teacher_id"], schedule["class_id"], schedule.get("room_id")
+    )
+
+
+def _versioned(*views: str) -> Callable:
+    """Caches a derived view until one of the given views changes version."""
+
+    def decorator(build: Callable) -> Callable:
+        @functools.wraps(build)
+        def wrapper(self: "Dataset"):
+            key = tuple(self.versions[view] for view in views)
+            cached = self._derived.get(build.__name__)
+            if cached is None or cached[0] != key:
+                cached = self._derived[build.__name__] = (key, build(self))
+            return cached[1]
+
+        return wrapper
+
+    return decorator
+
+
+class Dataset:
+    """The school's records and their indexes, shared by every session.
+
+    There is one instance per backend process. Sessions read the stores and
+    derived views directly and only remember the version of each view they
+    last showed. Mutating methods write through to the database, update the
+    indexes in place and move the views they changed to a new version, which
+    is how sessions notice what to re-send. Derived views are built once per
+    version, however many sessions show them.
+
+    With several backend workers, each holds its own copy and they agree on
+    a generation counter in Redis: a worker that changes the data bumps it
+    and stores its schedules as a compact ``ScheduleTable`` blob, and a
+    worker that finds itself behind reloads, taking the schedules from that
+    blob instead of the database when it matches the generation.
+    """
+
+    def __init__(self, days: list[str]):
+        self.teachers: dict[int, dict] = {}
+        self.classes: dict[int, dict] = {}
+        self.rooms: dict[int, dict] = {}
+        self.rules: dict[int, dict] = {}
+        self.subject_requirements: dict[int, dict] = {}
+        self.schedules: dict[int, dict] = {}
+        self.occupancy = OccupancyGrid()
+        self.timetable = Timetable(days)
+        self.references = ReferenceIndex()
+        self.subject_index = SubjectIndex()
+        self.class_durations: dict[int, int] = {}
+        self.rule_targets: dict[int, int] = {}
+        self.teacher_minutes: dict[int, int] = {}
+        self.compliant_teachers = 0
+        self.stale_classes: set[int] = set()
+        self.versions = dict.fromkeys(VIEWS, 0)
+        self.loaded = False
+        self.generation: int | None = None
+        self.subscribers: set[str] = set()
+        self._derived: dict[str, tuple[tuple[int, ...], object]] = {}
+
+    def touch(self, *views: str):
+        """Moves the given views to a new version."""
+        for view in views:
+            self.versions[view] += 1
+
+    def load(self, schedules: Iterable[dict] | None = None):
+        """Reloads every record from the database and rebuilds the indexes.
+
+        ``schedules`` replaces the schedule table read, for callers that
+        already hold a current copy of it.
+        """
+        teachers = load_rows(TeacherModel)
+        classes = load_rows(ClassModel)
+        rooms = load_rows(RoomModel)
+        rules = load_rows(RuleModel)
+        requirements = load_rows(SubjectRequirementModel)
+        self.teachers = _by_id(teachers)
+        self.classes = _by_id(classes)
+        self.rooms = _by_id(rooms)
+        self.rules = _by_id(rules)
+        self.subject_requirements = _by_id(requirements)
+        self.references.clear()
+        for rule in rules:
+            self.references.link("teacher", rule["teacher_id"], "rule", rule["id"])
+        for req in requirements:
+            self.references.link(
+                "class", req["class_id"], "subject_requirement", req["id"]
+            )
+        self.subject_index = SubjectIndex(teachers)
+        self.timetable.set_names("teacher", {t["id"]: t["name"] for t in teachers})
+        self.timetable.set_names("class", {c["id"]: c["name"] for c in classes})
+        self.timetable.set_names("room", {r["id"]: r["name"] for r in rooms})
+        self.class_durations = {c["id"]: c["duration"] for c in classes}
+        self.rule_targets = {r["teacher_id"]: r["min_hours"] for r in rules}
+        self._clear_schedules()
+        if schedules is None:
+            schedules = load_rows(ScheduleModel)
+        for schedule in schedules:
+            self._add_schedule(schedule)
+        # Edits made before this load are unknown, so a repair checks them all.
+        self.stale_classes = set(self.classes)
+        self.loaded = True
+        self.touch(*VIEWS)
+
+    async def pull(self, client: "Redis"):
+        """Catches up with the other workers if any of them changed the data."""
+        generation = int(await client.get(GENERATION_KEY) or 0)
+        if self.loaded and generation == self.generation:
+            return
+        snapshot_generation, blob = await client.hmget(
+            SNAPSHOT_KEY, ["generation", "schedules"]
+        )
+        schedules = None
+        if blob is not None and int(snapshot_generation) == generation:
+            try:
+                table = ScheduleTable.from_bytes(self.timetable.days, blob)
+            except ValueError:
+                # Written by a worker running another format version.
+                table = None
+            if table is not None:
+                schedules = table.records()
+        self.load(schedules)
+        self.generation = generation
+
+    async def push(self, client: "Redis"):
+        """Tells the other workers that this worker changed the data.
+
+        The snapshot is only replaced when this copy was current before the
+        change; otherwise the generation still moves on, so every worker,
+        this one included, reloads from the database on its next pull.
+        """
+        current = False
+
+        async def bump(pipe: "Pipeline"):
+            nonlocal current
+            generation = int(await pipe.get(GENERATION_KEY) or 0)
+            current = generation == self.generation
+            pipe.multi()
+            pipe.incr(GENERATION_KEY)
+            if current:
+                pipe.hset(
+                    SNAPSHOT_KEY,
+                    mapping={
+                        "generation": generation + 1,
+                        "schedules": self.schedule_blob(),
+                    },
+                )
+
+        results = await client.transaction(bump, GENERATION_KEY)
+        self.generation = results[0] if current else None
+
+    def _is_compliant(self, teacher_id: int) -> bool:
+        min_hours = self.rule_targets.get(teacher_id)
+        if min_hours is None:
+            return False
+        return self.teacher_minutes.get(teacher_id, 0) >= min_hours * 60
+
+    def _add_teacher_minutes(self, teacher_id: int, minutes: int):
+        """Adjusts a teacher's running total and the compliance counter."""
+        was_compliant = self._is_compliant(teacher_id)
+        self.teacher_minutes[teacher_id] = (
+            self.teacher_minutes.get(teacher_id, 0) + minutes
+        )
+        self.compliant_teachers += self._is_compliant(teacher_id) - was_compliant
+
+    def _sync_rule_target(self, teacher_id: int):
+        """Re-derives a teacher's minimum hours; the last matching rule wins."""
+        was_compliant = self._is_compliant(teacher_id)
+        rule_ids = self.references.dependents("teacher", teacher_id, "rule")
+        if rule_ids:
+            self.rule_targets[teacher_id] = self.rules[max(rule_ids)]["min_hours"]
+        else:
+            self.rule_targets.pop(teacher_id, None)
+        self.compliant_teachers += self._is_compliant(teacher_id) - was_compliant
+
+    def _set_class_duration(self, class_id: int, duration: int):
+        """Moves the hours of every schedule of a class to a new duration."""
+        delta = duration - self.class_durations.get(class_id, 0)
+        if not delta:
+            return
+        self.class_durations[class_id] = duration
+        for schedule_id in self.references.dependents("class", class_id, "schedule"):
+            self._add_teacher_minutes(self.schedules[schedule_id]["teacher_id"], delta)
+
+    def _mark_stale(self, parent: str, parent_id: int):
+        """Flags the classes booked with a teacher or room for the next repair."""
+        for schedule_id in self.references.dependents(parent, parent_id, "schedule"):
+            self.stale_classes.add(self.schedules[schedule_id]["class_id"])
+
+    def add_teacher(self, values: dict) -> dict:
+        teacher = insert_row(TeacherModel(**values))
+        self.teachers[teacher["id"]] = teacher
+        self.subject_index.add(teacher)
+        self.timetable.rename("teacher", teacher["id"], teacher["name"])
+        self.touch("teachers")
+        return teacher
+
+    def update_teacher(self, teacher_id: int, values: dict):
+        if teacher_id not in self.teachers:
+            return
+        update_row(TeacherModel, teacher_id, **values)
+        self.teachers[teacher_id].update(values)
+        self.subject_index.add(self.teachers[teacher_id])
+        self._mark_stale("teacher", teacher_id)
+        self.timetable.rename("teacher", teacher_id, values["name"])
+        self.touch("teachers", "schedules")
+
+    def delete_teacher(self, teacher_id: int) -> dict[str, int]:
+        """Deletes a teacher along with their schedules and rules.
+
+        Returns how many dependent records of each kind were removed.
+        """
+        schedule_ids = self.references.dependents("teacher", teacher_id, "schedule")
+        rule_ids = self.references.dependents("teacher", teacher_id, "rule")
+        delete_cascade(
+            TeacherModel,
+            teacher_id,
+            [ScheduleModel.teacher_id, RuleModel.teacher_id],
+        )
+        self._mark_stale("teacher", teacher_id)
+        for schedule_id in schedule_ids:
+            self._remove_schedule(schedule_id)
+        for rule_id in rule_ids:
+            self.rules.pop(rule_id)
+            self.references.unlink("teacher", teacher_id, "rule", rule_id)
+        self._sync_rule_target(teacher_id)
+        self.teacher_minutes.pop(teacher_id, None)
+        self.teachers.pop(teacher_id, None)
+        self.subject_index.remove(teacher_id)
+        self.timetable.forget("teacher", teacher_id)
+        self.touch("teachers", "schedules", "rules")
+        return {"schedule": len(schedule_ids), "rule": len(rule_ids)}
+
+    def add_class(self, values: dict) -> dict:
+        _class = insert_row(ClassModel(**values))
+        self.classes[_class["id"]] = _class
+        self.timetable.rename("class", _class["id"], _class["name"])
+        self.class_durations[_class["id"]] = _class["duration"]
+        self.touch("classes")
+        return _class
+
+    def update_class(self, class_id: int, values: dict):
+        if class_id not in self.classes:
+            return
+        update_row(ClassModel, class_id, **values)
+        self.classes[class_id].update(values)
+        self.stale_classes.add(class_id)
+        self.timetable.rename("class", class_id, values["name"])
+        self._set_class_duration(class_id, values["duration"])
+        self.touch("classes", "schedules")
+
+    def delete_class(self, class_id: int) -> dict[str, int]:
+        """Deletes a class along with its schedules and subject requirements.
+
+        Returns how many dependent records of each kind were removed.
+        """
+        schedule_ids = self.references.dependents("class", class_id, "schedule")
+        req_ids = self.references.dependents("class", class_id, "subject_requirement")
+        delete_cascade(
+            ClassModel,
+            class_id,
+            [ScheduleModel.class_id, SubjectRequirementModel.class_id],
+        )
+        for schedule_id in schedule_ids:
+            self._remove_schedule(schedule_id)
+        for req_id in req_ids:
+            self.subject_requirements.pop(req_id)
+            self.references.unlink("class", class_id, "subject_requirement", req_id)
+        self.class_durations.pop(class_id, None)
+        self.classes.pop(class_id, None)
+        self.stale_classes.discard(class_id)
+        self.timetable.forget("class", class_id)
+        self.touch("classes", "schedules", "subject_requirements")
+        return {"schedule": len(schedule_ids), "subject requirement": len(req_ids)}
+
+    def add_room(self, values: dict) -> dict:
+        room = insert_row(RoomModel(**values))
+        self.rooms[room["id"]] = room
+        self.timetable.rename("room", room["id"], room["name"])
+        self.touch("rooms")
+        return room
+
+    def update_room(self, room_id: int, values: dict):
+        if room_id not in self.rooms:
+            return
+        update_row(RoomModel, room_id, **values)
+        self.rooms[room_id].update(values)
+        self._mark_stale("room", room_id)
+        self.timetable.rename("room", room_id, values["name"])
+        self.touch("rooms", "schedules")
+
+    def delete_room(self, room_id: int) -> int:
+        """Deletes a room, keeping its schedules without a room.
+
+        Returns how many schedules lost their room.
+        """
+        schedule_ids = self.references.dependents("room", room_id, "schedule")
+        delete_detaching(RoomModel, room_id, [ScheduleModel.room_id])
+        for schedule_id in schedule_ids:
+            schedule = self._remove_schedule(schedule_id)
+            schedule["room_id"] = None
+            self._add_schedule(schedule)
+        self.rooms.pop(room_id, None)
+        self.timetable.forget("room", room_id)
+        self.touch("rooms", "schedules")
+        return len(schedule_ids)
+
+    def add_rule(self, values: dict) -> dict:
+        rule = insert_row(RuleModel(**values))
+        self.rules[rule["id"]] = rule
+        self.references.link("teacher", rule["teacher_id"], "rule", rule["id"])
+        self._sync_rule_target(rule["teacher_id"])
+        self.touch("rules")
+        return rule
+
+    def update_rule(self, rule_id: int, values: dict):
+        if rule_id not in self.rules:
+            return
+        rule = self.rules[rule_id]
+        old_teacher_id = rule["teacher_id"]
+        update_row(RuleModel, rule_id, **values)
+        rule.update(values)
+        self.references.unlink("teacher", old_teacher_id, "rule", rule_id)
+        self.references.link("teacher", rule["teacher_id"], "rule", rule_id)
+        self._sync_rule_target(old_teacher_id)
+        self._sync_rule_target(rule["teacher_id"])
+        self.touch("rules")
+
+    def delete_rule(self, rule_id: int):
+        delete_row(RuleModel, rule_id)
+        rule = self.rules.pop(rule_id, None)
+        if rule is None:
+            return
+        self.references.unlink("teacher", rule["teacher_id"], "rule", rule_id)
+        self._sync_rule_target(rule["teacher_id"])
+        self.touch("rules")
+
+    def add_subject_requirement(self, values: dict) -> dict:
+        req = insert_row(SubjectRequirementModel(**values))
+        self.subject_requirements[req["id"]] = req
+        self.stale_classes.add(req["class_id"])
+        self.references.link("class", req["class_id"], "subject_requirement", req["id"])
+        self.touch("subject_requirements")
+        return req
+
+    def update_subject_requirement(self, req_id: int, values: dict):
+        if req_id not in self.subject_requirements:
+            return
+        update_row(SubjectRequirementModel, req_id, **values)
+        req = self.subject_requirements[req_id]
+        self.references.unlink("class", req["class_id"], "subject_requirement", req_id)
+        self.stale_classes.add(req["class_id"])
+        req.update(values)
+        self.references.link("class", req["class_id"], "subject_requirement", req_id)
+        self.stale_classes.add(req["class_id"])
+        self.touch("subject_requirements")
+
+    def delete_subject_requirement(self, req_id: int):
+        delete_row(SubjectRequirementModel, req_id)
+        req = self.subject_requirements.pop(req_id, None)
+        if req is None:
+            return
+        self.references.unlink("class", req["class_id"], "subject_requirement", req_id)
+        self.touch("subject_requirements")
+
+    def add_imported(self, kind: str, rows: list[dict]):
+        """Adds rows that a bulk import has already inserted."""
+        if kind == "teacher":
+            self.teachers.update(_by_id(rows))
+            for teacher in rows:
+                self.subject_index.add(teacher)
+            self.timetable.update_names("teacher", {t["id"]: t["name"] for t in rows})
+            self.touch("teachers")
+        elif kind == "class":
+            self.classes.update(_by_id(rows))
+            self.class_durations.update({c["id"]: c["duration"] for c in rows})
+            self.timetable.update_names("class", {c["id"]: c["name"] for c in rows})
+            self.touch("classes")
+        else:
+            self.subject_requirements.update(_by_id(rows))
+            for req in rows:
+                self.references.link(
+                    "class", req["class_id"], "subject_requirement", req["id"]
+                )
+                self.stale_classes.add(req["class_id"])
+            self.touch("subject_requirements")
+
+    def _add_schedule(self, schedule: dict):
+        """Stores a schedule and books it into every index and total."""
+        self.schedules[schedule["id"]] = schedule
+        self.occupancy.add(
+            _resources(schedule),
+            schedule["day_of_week"],
+            schedule["start_time"],
+            schedule["end_time"],
+            schedule["id"],
+        )
+        self.timetable.add(schedule)
+        self.references.link(
+            "teacher", schedule["teacher_id"], "schedule", schedule["id"]
+        )
+        self.references.link("class", schedule["class_id"], "schedule", schedule["id"])
+        if schedule.get("room_id") is not None:
+            self.references.link(
+                "room", schedule["room_id"], "schedule", schedule["id"]
+            )
+        self._add_teacher_minutes(
+            schedule["teacher_id"], self.class_durations.get(schedule["class_id"], 0)
+        )
+
+    def _remove_schedule(self, schedule_id: int) -> dict | None:
+        """Drops a schedule and releases it from every index and total."""
+        schedule = self.schedules.pop(schedule_id, None)
+        if schedule is None:
+            return None
+        self.occupancy.remove(schedule_id)
+        self.timetable.remove(schedule_id)
+        self.references.unlink(
+            "teacher", schedule["teacher_id"], "schedule", schedule_id
+        )
+        self.references.unlink("class", schedule["class_id"], "schedule", schedule_id)
+        if schedule.get("room_id") is not None:
+            self.references.unlink("room", schedule["room_id"], "schedule", schedule_id)
+        self._add_teacher_minutes(
+            schedule["teacher_id"], -self.class_durations.get(schedule["class_id"], 0)
+        )
+        return schedule
+
+    def _clear_schedules(self):
+        """Removes every schedule along with its derived indexes and totals."""
+        self.schedules.clear()
+        self.occupancy.clear()
+        self.timetable.clear()
+        self.references.clear("schedule")
+        self.teacher_minutes.clear()
+        self.compliant_teachers = sum(
+            1 for min_hours in self.rule_targets.values() if min_hours <= 0
+        )
+
+    def clashes(self, schedule: dict, exclude_id: int | None = None) -> list[str]:
+        """Returns which of the teacher, class and room are already booked.
+
+        ``schedule`` holds the proposed booking's fields; the result lists
+        the kinds of resource that clash, in that order, and is empty when
+        the booking fits.
+        """
+        return [
+            kind
+            for kind, _ in self.occupancy.clashes(
+                _resources(schedule),
+                schedule["day_of_week"],
+                schedule["start_time"],
+                schedule["end_time"],
+                exclude_id=exclude_id,
+            )
+        ]
+
+    def add_schedule(self, values: dict) -> dict:
+        schedule = insert_row(ScheduleModel(**values))
+        self._add_schedule(schedule)
+        self.touch("schedules")
+        return schedule
+
+    def update_schedule(self, schedule_id: int, values: dict):
+        if schedule_id not in self.schedules:
+            return
+        update_row(ScheduleModel, schedule_id, **values)
+        schedule = self._remove_schedule(schedule_id)
+        self.stale_classes.add(schedule["class_id"])
+        schedule.update(values)
+        self.stale_classes.add(schedule["class_id"])
+        self._add_schedule(schedule)
+        self.touch("schedules")
+
+    def delete_schedule(self, schedule_id: int):
+        delete_row(ScheduleModel, schedule_id)
+        schedule = self._remove_schedule(schedule_id)
+        if schedule is not None:
+            self.stale_classes.add(schedule["class_id"])
+            self.touch("schedules")
+
+    def replace_schedules(self, schedules: list[dict]) -> list[int]:
+        """Replaces the whole timetable in the database and in memory.
+
+        As in ``apply_repair``, a schedule whose teacher, class or room was
+        deleted while it was generated, or that clashes with one before it,
+        is left out and its class marked stale. Returns the positions in
+        ``schedules`` that were left out.
+        """
+        check = OccupancyGrid()
+        kept, dropped = [], []
+        for index, schedule in enumerate(schedules):
+            if self._book_if_free(check, schedule, -index - 1):
+                kept.append(schedule)
+            else:
+                dropped.append(index)
+        created = replace_schedules(kept)
+        self._clear_schedules()
+        for schedule in created:
+            self._add_schedule(schedule)
+        self.stale_classes = {schedules[index]["class_id"] for index in dropped}
+        self.touch("schedules")
+        return dropped
+
+    def repair_scope(self) -> tuple[list[dict], list[dict]]:
+        """Takes the stale classes and returns their schedules and requirements.
+
+        The classes stop being stale; edits made from here on mark them again.
+        """
+        schedules, requirements = [], []
+        for class_id in self.stale_classes:
+            for schedule_id in self.references.dependents(
+                "class", class_id, "schedule"
+            ):
+                schedules.append(dict(self.schedules[schedule_id]))
+            for req_id in self.references.dependents(
+                "class", class_id, "subject_requirement"
+            ):
+                requirements.append(dict(self.subject_requirements[req_id]))
+        self.stale_classes.clear()
+        return schedules, requirements
+
+    def apply_repair(
+        self, removed: list[int], stretched: dict[int, int], added: list[dict]
+    ) -> list[int]:
+        """Applies a repair to the database and memory in one step.
+
+        Anything that stopped fitting while the repair was planned, because
+        of an edit in the meantime, is left out and its class marked stale
+        again. Returns the positions in ``added`` that were left out.
+        """
+        removed = [i for i in removed if i in self.schedules]
+        stretched = {i: end for i, end in stretched.items() if i in self.schedules}
+        check = self.occupancy.snapshot(exclude=[*removed, *stretched])
+        ends, kept, dropped = {}, [], []
+        for schedule_id, end in stretched.items():
+            schedule = {**self.schedules[schedule_id], "end_time": end}
+            if self._book_if_free(check, schedule, schedule_id):
+                ends[schedule_id] = end
+            else:
+                removed.append(schedule_id)
+                self.stale_classes.add(schedule["class_id"])
+        for index, schedule in enumerate(added):
+            if self._book_if_free(check, schedule, -index - 1):
+                kept.append(schedule)
+            else:
+                dropped.append(index)
+                self.stale_classes.add(schedule["class_id"])
+        created = patch_schedules(removed, ends, kept)
+        for schedule_id in removed:
+            self._remove_schedule(schedule_id)
+        for schedule_id, end in ends.items():
+            schedule = self._remove_schedule(schedule_id)
+            schedule["end_time"] = end
+            self._add_schedule(schedule)
+        for schedule in created:
+            self._add_schedule(schedule)
+        self.touch("schedules")
+        return dropped
+
+    def _book_if_free(
+        self, grid: OccupancyGrid, schedule: dict, booking_id: int
+    ) -> bool:
+        """Books a schedule into ``grid`` if its records exist and are free."""
+        room_id = schedule.get("room_id")
+        if (
+            schedule["class_id"] not in self.classes
+            or schedule["teacher_id"] not in self.teachers
+            or (room_id is not None and room_id not in self.rooms)
+        ):
+            return False
+        resources = _resources(schedule)
+        day = schedule["day_of_week"]
+        start, end = schedule["start_time"], schedule["end_time"]
+        if grid.overlaps(resources, day, start, end):
+            return False
+        grid.add(resources, day, start, end, booking_id)
+        return True
+
+    @_versioned("schedules")
+    def timetable_rows(self) -> list[TimetableRow]:
+        return self.timetable.rows()
+
+    @_versioned("schedules")
+    def schedule_blob(self) -> bytes:
+        return ScheduleTable.from_records(
+            self.timetable.days, self.schedules.values()
+        ).to_bytes()
+
+    @_versioned("schedules")
+    def recent_schedules(self) -> list[dict]:
+        return list(itertools.islice(reversed(self.schedules.values()), 5))
+
+    @_versioned("schedules", "classes", "teachers")
+    def teacher_hours(self) -> dict[int, float]:
+        return {
+            teacher_id: minutes / 60
+            for teacher_id, minutes in self.teacher_minutes.items()
+        }
+
+    @_versioned("rules", "teachers")
+    def teacher_rules(self) -> dict[int, int]:
+        return dict(self.rule_targets)
+
+    def rule_compliance(self) -> float:
+        if not self.rule_targets:
+            return 100.0
+        return self.compliant_teachers / len(self.rule_targets) * 100
\ No newline at end of file
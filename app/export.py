@@ -0,0 +1,165 @@
+import csv
+import datetime
+import io
+import itertools
+import json
+from typing import Callable, Iterable, Iterator
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.models import iter_schedule_export
+from app.scheduling.times import to_time_str
+
+EXPORT_FIELDS = [
+    "id",
+    "day_of_week",
+    "start_time",
+    "end_time",
+    "class_id",
+    "class_name",
+    "subject",
+    "teacher_id",
+    "teacher_name",
+    "teacher_email",
+    "room_id",
+    "room_name",
+]
+ROWS_PER_CHUNK = 500
+ICAL_DAYS = {
+    "Monday": "MO",
+    "Tuesday": "TU",
+    "Wednesday": "WE",
+    "Thursday": "TH",
+    "Friday": "FR",
+}
+
+
+def _chunked(lines: Iterable[str]) -> Iterator[str]:
+    """Joins lines into chunks so each write to the response carries many rows."""
+    lines = iter(lines)
+    while chunk := "".join(itertools.islice(lines, ROWS_PER_CHUNK)):
+        yield chunk
+
+
+def _time_labels(rows: Iterable[dict]) -> Iterator[dict]:
+    """Formats the start and end minutes of each row as "HH:MM"."""
+    for row in rows:
+        row["start_time"] = to_time_str(row["start_time"])
+        row["end_time"] = to_time_str(row["end_time"])
+        yield row
+
+
+def csv_lines(rows: Iterable[dict]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def ndjson_lines(rows: Iterable[dict]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row) + "\n"
+
+
+def _ical_text(value: str | None) -> str:
+    value = value or ""
+    for char in ("\\", ";", ","):
+        value = value.replace(char, "\\" + char)
+    return value.replace("\n", "\\n")
+
+
+def _ical_line(line: str) -> str:
+    """Folds a content line at 75 octets, as RFC 5545 requires."""
+    data = line.encode()
+    parts = []
+    limit = 75
+    while len(data) > limit:
+        cut = limit
+        while (data[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(data[:cut].decode())
+        data = data[cut:]
+        limit = 74
+    parts.append(data.decode())
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def ical_lines(rows: Iterable[dict]) -> Iterator[str]:
+    """Yields a calendar with one weekly recurring VEVENT per schedule.
+
+    Events start in the current week and carry no time zone, so they show at
+    the same wall-clock time in every calendar.
+    """
+    today = datetime.date.today()
+    week_start = today - datetime.timedelta(days=today.weekday())
+    dates = {
+        day: (week_start + datetime.timedelta(days=offset)).strftime("%Y%m%d")
+        for offset, day in enumerate(ICAL_DAYS)
+    }
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    yield _ical_line("BEGIN:VCALENDAR")
+    yield _ical_line("VERSION:2.0")
+    yield _ical_line("PRODID:-//School Scheduler//Timetable//EN")
+    for row in rows:
+        date = dates[row["day_of_week"]]
+        lines = [
+            "BEGIN:VEVENT",
+            f"UID:schedule-{row['id']}@school-scheduler",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART:{date}T{row['start_time'].replace(':', '')}00",
+            f"DTEND:{date}T{row['end_time'].replace(':', '')}00",
+            f"RRULE:FREQ=WEEKLY;BYDAY={ICAL_DAYS[row['day_of_week']]}",
+            f"SUMMARY:{_ical_text(row['class_name'])}",
+            f"DESCRIPTION:{_ical_text(row['teacher_name'])}",
+        ]
+        if row["room_name"]:
+            lines.append(f"LOCATION:{_ical_text(row['room_name'])}")
+        lines.append("END:VEVENT")
+        yield "".join(_ical_line(line) for line in lines)
+    yield _ical_line("END:VCALENDAR")
+
+
+EXPORT_FORMATS: dict[str, tuple[str, Callable[[Iterable[dict]], Iterator[str]]]] = {
+    "csv": ("text/csv", csv_lines),
+    "ics": ("text/calendar", ical_lines),
+    "ndjson": ("application/x-ndjson", ndjson_lines),
+}
+
+
+def _int_param(request: Request, name: str) -> int | None:
+    value = request.query_params.get(name)
+    return int(value) if value else None
+
+
+async def export_schedules(request: Request):
+    """Streams the filtered timetable as a chunked file download."""
+    fmt = request.path_params["fmt"]
+    if fmt not in EXPORT_FORMATS:
+        return PlainTextResponse(f"Unknown export format {fmt!r}.", status_code=404)
+    try:
+        teacher_id = _int_param(request, "teacher_id")
+        class_id = _int_param(request, "class_id")
+    except ValueError:
+        return PlainTextResponse("Ids must be whole numbers.", status_code=400)
+    media_type, render = EXPORT_FORMATS[fmt]
+    rows = iter_schedule_export(
+        teacher_id=teacher_id,
+        class_id=class_id,
+        day=request.query_params.get("day") or None,
+    )
+    return StreamingResponse(
+        _chunked(render(_time_labels(rows))),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="schedules.{fmt}"'},
+    )
+
+
+export_api = Starlette(routes=[Route("/export/schedules.{fmt}", export_schedules)])
\ No newline at end of file
@@ -0,0 +1,285 @@
+import itertools
+from typing import Iterable, Iterator
+
+import reflex as rx
+import sqlalchemy
+import sqlmodel
+
+
+class TeacherModel(rx.Model, table=True):
+    """Database row for a ``Teacher``."""
+
+    __tablename__ = "teacher"
+
+    name: str
+    email: str
+    subject: str
+
+
+class ClassModel(rx.Model, table=True):
+    """Database row for a ``Class``."""
+
+    __tablename__ = "school_class"
+
+    name: str
+    subject: str
+    duration: int
+    size: int = sqlmodel.Field(default=0, sa_column_kwargs={"server_default": "0"})
+
+
+class RoomModel(rx.Model, table=True):
+    """Database row for a ``Room``."""
+
+    __tablename__ = "room"
+
+    name: str
+    capacity: int
+
+
+class ScheduleModel(rx.Model, table=True):
+    """Database row for a ``Schedule``."""
+
+    __tablename__ = "schedule"
+    __table_args__ = (
+        sqlmodel.Index("ix_schedule_teacher_day", "teacher_id", "day_of_week"),
+    )
+
+    class_id: int = sqlmodel.Field(index=True)
+    teacher_id: int
+    day_of_week: str = sqlmodel.Field(index=True)
+    start_time: int
+    end_time: int
+    room_id: int | None = sqlmodel.Field(default=None, index=True)
+
+
+class RuleModel(rx.Model, table=True):
+    """Database row for a ``Rule``."""
+
+    __tablename__ = "rule"
+
+    teacher_id: int = sqlmodel.Field(index=True)
+    min_hours: int
+
+
+class SubjectRequirementModel(rx.Model, table=True):
+    """Database row for a ``SubjectRequirement``."""
+
+    __tablename__ = "subject_requirement"
+
+    class_id: int = sqlmodel.Field(index=True)
+    subject: str
+    sessions: int = sqlmodel.Field(default=1, sa_column_kwargs={"server_default": "1"})
+
+
+def load_rows(model: type[rx.Model]) -> list[dict]:
+    """Returns every row of a table as plain dicts, ordered by id."""
+    with rx.session() as session:
+        rows = session.exec(sqlmodel.select(model).order_by(model.id)).all()
+        return [row.model_dump() for row in rows]
+
+
+def insert_row(row: rx.Model) -> dict:
+    """Inserts a row and returns it, including its new id, as a dict."""
+    with rx.session() as session:
+        session.add(row)
+        session.commit()
+        session.refresh(row)
+        return row.model_dump()
+
+
+def insert_rows(
+    model: type[rx.Model], rows: Iterable[dict], chunk_size: int = 1000
+) -> list[dict]:
+    """Inserts rows in chunks within one transaction and returns them with ids.
+
+    ``rows`` is consumed lazily, one chunk at a time, so it can be a generator
+    over a large file. Nothing is committed unless every chunk is inserted.
+    """
+    table = model.__table__
+    statement = sqlalchemy.insert(table).returning(
+        *table.columns, sort_by_parameter_order=True
+    )
+    rows = iter(rows)
+    created = []
+    with rx.session() as session:
+        while chunk := list(itertools.islice(rows, chunk_size)):
+            result = session.exec(statement, params=chunk)
+            created.extend(dict(row._mapping) for row in result)
+        session.commit()
+    return created
+
+
+def update_row(model: type[rx.Model], row_id: int, **values):
+    """Updates the given columns of a single row by primary key."""
+    with rx.session() as session:
+        session.exec(sqlmodel.update(model).where(model.id == row_id).values(**values))
+        session.commit()
+
+
+def delete_row(model: type[rx.Model], row_id: int):
+    """Deletes a single row by primary key."""
+    with rx.session() as session:
+        session.exec(sqlmodel.delete(model).where(model.id == row_id))
+        session.commit()
+
+
+def delete_cascade(model: type[rx.Model], row_id: int, references: Iterable):
+    """Deletes a row and every row whose reference column points at it.
+
+    ``references`` are the referring columns, such as ``RuleModel.teacher_id``;
+    each is indexed, so only the affected rows are touched. Everything goes in
+    one transaction.
+    """
+    with rx.session() as session:
+        for column in references:
+            session.exec(sqlmodel.delete(column.class_).where(column == row_id))
+        session.exec(sqlmodel.delete(model).where(model.id == row_id))
+        session.commit()
+
+
+def delete_detaching(model: type[rx.Model], row_id: int, references: Iterable):
+    """Deletes a row after clearing every reference column that points at it.
+
+    Unlike ``delete_cascade``, the referring rows are kept, with the column
+    set to NULL. Everything goes in one transaction.
+    """
+    with rx.session() as session:
+        for column in references:
+            session.exec(
+                sqlmodel.update(column.class_)
+                .where(column == row_id)
+                .values({column.key: None})
+            )
+        session.exec(sqlmodel.delete(model).where(model.id == row_id))
+        session.commit()
+
+
+WEEKDAY_ORDER = sqlalchemy.case(
+    {"Monday": 0, "Tuesday": 1, "Wednesday": 2, "Thursday": 3, "Friday": 4},
+    value=ScheduleModel.day_of_week,
+)
+
+
+def _schedule_filters(
+    teacher_id: int | None, class_id: int | None, day: str | None
+) -> list:
+    filters = []
+    if teacher_id is not None:
+        filters.append(ScheduleModel.teacher_id == teacher_id)
+    if class_id is not None:
+        filters.append(ScheduleModel.class_id == class_id)
+    if day is not None:
+        filters.append(ScheduleModel.day_of_week == day)
+    return filters
+
+
+def query_schedules(
+    teacher_id: int | None = None,
+    class_id: int | None = None,
+    day: str | None = None,
+    sort: str = "day",
+    offset: int = 0,
+    limit: int = 25,
+) -> tuple[list[dict], int]:
+    """Returns one filtered, sorted page of schedules and the total match count.
+
+    Sorting by "teacher" or "class" orders by name; anything else orders by
+    weekday and start time.
+    """
+    filters = _schedule_filters(teacher_id, class_id, day)
+    query = sqlmodel.select(ScheduleModel).where(*filters)
+    order = [WEEKDAY_ORDER, ScheduleModel.start_time, ScheduleModel.id]
+    if sort == "teacher":
+        query = query.outerjoin(
+            TeacherModel, TeacherModel.id == ScheduleModel.teacher_id
+        )
+        order.insert(0, TeacherModel.name)
+    elif sort == "class":
+        query = query.outerjoin(ClassModel, ClassModel.id == ScheduleModel.class_id)
+        order.insert(0, ClassModel.name)
+    with rx.session() as session:
+        total = session.exec(
+            sqlmodel.select(sqlalchemy.func.count())
+            .select_from(ScheduleModel)
+            .where(*filters)
+        ).one()
+        rows = session.exec(query.order_by(*order).offset(offset).limit(limit)).all()
+        return [row.model_dump() for row in rows], total
+
+
+def iter_schedule_export(
+    teacher_id: int | None = None,
+    class_id: int | None = None,
+    day: str | None = None,
+    chunk_size: int = 1000,
+) -> Iterator[dict]:
+    """Yields schedules joined with their class, teacher and room, in weekday order.
+
+    Rows are fetched from the database ``chunk_size`` at a time, so the whole
+    timetable is never held in memory.
+    """
+    query = (
+        sqlmodel.select(
+            ScheduleModel.id,
+            ScheduleModel.day_of_week,
+            ScheduleModel.start_time,
+            ScheduleModel.end_time,
+            ScheduleModel.class_id,
+            ClassModel.name.label("class_name"),
+            ClassModel.subject,
+            ScheduleModel.teacher_id,
+            TeacherModel.name.label("teacher_name"),
+            TeacherModel.email.label("teacher_email"),
+            ScheduleModel.room_id,
+            RoomModel.name.label("room_name"),
+        )
+        .outerjoin(ClassModel, ClassModel.id == ScheduleModel.class_id)
+        .outerjoin(TeacherModel, TeacherModel.id == ScheduleModel.teacher_id)
+        .outerjoin(RoomModel, RoomModel.id == ScheduleModel.room_id)
+        .where(*_schedule_filters(teacher_id, class_id, day))
+        .order_by(WEEKDAY_ORDER, ScheduleModel.start_time, ScheduleModel.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    with rx.session() as session:
+        for row in session.exec(query):
+            yield dict(row._mapping)
+
+
+def patch_schedules(
+    removed: Iterable[int], ends: dict[int, int], added: list[dict]
+) -> list[dict]:
+    """Applies a timetable repair in one transaction and returns the new rows.
+
+    ``removed`` schedules are deleted, ``ends`` maps schedules to a new end
+    time and ``added`` are inserted.
+    """
+    with rx.session() as session:
+        removed = list(removed)
+        if removed:
+            session.exec(
+                sqlmodel.delete(ScheduleModel).where(ScheduleModel.id.in_(removed))
+            )
+        for schedule_id, end_time in ends.items():
+            session.exec(
+                sqlmodel.update(ScheduleModel)
+                .where(ScheduleModel.id == schedule_id)
+                .values(end_time=end_time)
+            )
+        rows = [ScheduleModel(**schedule) for schedule in added]
+        session.add_all(rows)
+        session.flush()
+        created = [row.model_dump() for row in rows]
+        session.commit()
+        return created
+
+
+def replace_schedules(schedules: list[dict]) -> list[dict]:
+    """Replaces the whole timetable in one transaction and returns the new rows."""
+    with rx.session() as session:
+        session.exec(sqlmodel.delete(ScheduleModel))
+        rows = [ScheduleModel(**schedule) for schedule in schedules]
+        session.add_all(rows)
+        session.flush()
+        created = [row.model_dump() for row in rows]
+        session.commit()
+        return created
\ No newline at end of file
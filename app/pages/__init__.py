@@ -1,6 +1,9 @@
 from .schedules import schedules_page
+from .timetable import timetable_page
 from .teachers import teachers_page
 from .classes import classes_page
+from .rooms import rooms_page
 from .placeholder_pages import dashboard_page
 from .rules import rules_page
-from .subject_requirements import subject_requirements_page
\ No newline at end of file
+from .subject_requirements import subject_requirements_page
+from .bulk_import import import_page
@@ -0,0 +1,152 @@
+import reflex as rx
+from app.states.state import State
+from app.pages.layout import main_layout
+
+UPLOAD_ID = "bulk_import"
+
+IMPORT_KINDS = [
+    ("teacher", "Teachers", "name, email, subject"),
+    ("class", "Classes", "name, subject, duration, size"),
+    (
+        "subject_requirement",
+        "Subject Requirements",
+        "class_id or class_name, subject, sessions",
+    ),
+]
+
+
+def import_error_row(error: rx.Var[dict]) -> rx.Component:
+    return rx.el.tr(
+        rx.el.td(error["file"], class_name="px-6 py-3 text-sm text-gray-700"),
+        rx.el.td(error["row"], class_name="px-6 py-3 text-sm text-gray-700"),
+        rx.el.td(error["error"], class_name="px-6 py-3 text-sm text-red-600"),
+        class_name="border-b",
+    )
+
+
+def import_report() -> rx.Component:
+    return rx.el.div(
+        rx.el.div(
+            rx.el.p(State.import_summary, class_name="text-sm text-gray-700"),
+            rx.cond(
+                State.import_error_count > 0,
+                rx.el.button(
+                    rx.icon("download", class_name="mr-2 h-4 w-4"),
+                    "Download error report",
+                    on_click=State.download_import_report,
+                    class_name="inline-flex items-center rounded-md border border-gray-300 bg-white px-3 py-1.5 text-sm font-medium text-gray-700 shadow-sm hover:bg-gray-50",
+                ),
+            ),
+            class_name="flex items-center justify-between mb-4",
+        ),
+        rx.cond(
+            State.import_error_count > 0,
+            rx.el.div(
+                rx.el.table(
+                    rx.el.thead(
+                        rx.el.tr(
+                            *[
+                                rx.el.th(
+                                    label,
+                                    class_name="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider",
+                                )
+                                for label in ("File", "Row", "Error")
+                            ]
+                        )
+                    ),
+                    rx.el.tbody(rx.foreach(State.import_errors, import_error_row)),
+                    class_name="w-full",
+                ),
+                rx.cond(
+                    State.import_error_count > State.import_errors.length(),
+                    rx.el.p(
+                        f"Showing the first {State.import_errors.length()} of {State.import_error_count} skipped rows.",
+                        class_name="px-6 py-3 text-xs text-gray-500",
+                    ),
+                ),
+                class_name="bg-white border border-gray-200 rounded-xl shadow-sm overflow-x-auto",
+            ),
+        ),
+        class_name="mt-6",
+    )
+
+
+@rx.page(route="/import", on_load=State.load_data)
+def import_page() -> rx.Component:
+    return main_layout(
+        rx.el.div(
+            rx.el.div(
+                rx.el.h1(
+                    "Bulk Import",
+                    class_name="text-2xl font-bold text-gray-800 tracking-tight",
+                ),
+                rx.el.p(
+                    "Load teachers, classes or subject requirements from CSV, JSON or JSON-lines files.",
+                    class_name="text-gray-500",
+                ),
+                class_name="mb-6",
+            ),
+            rx.el.div(
+                rx.el.select(
+                    *[
+                        rx.el.option(label, value=kind)
+                        for kind, label, _ in IMPORT_KINDS
+                    ],
+                    value=State.import_kind,
+                    on_change=State.set_import_kind,
+                    class_name="block rounded-lg border-gray-200 bg-white px-4 py-2 text-sm text-gray-700 shadow-sm focus:border-orange-500 focus:ring-orange-500",
+                ),
+                rx.el.p(
+                    "Columns: ",
+                    rx.match(
+                        State.import_kind,
+                        *[(kind, columns) for kind, _, columns in IMPORT_KINDS],
+                        "",
+                    ),
+                    class_name="text-sm text-gray-500",
+                ),
+                class_name="flex items-center gap-4 mb-4",
+            ),
+            rx.upload.root(
+                rx.el.div(
+                    rx.icon("upload", class_name="h-10 w-10 text-gray-400 mb-3"),
+                    rx.el.p(
+                        "Drop files here or click to choose",
+                        class_name="text-sm font-medium text-gray-700",
+                    ),
+                    rx.el.p(
+                        rx.foreach(
+                            rx.selected_files(UPLOAD_ID),
+                            lambda name: rx.el.span(name, class_name="mr-2"),
+                        ),
+                        class_name="text-xs text-gray-500 mt-1",
+                    ),
+                    class_name="flex flex-col items-center justify-center text-center p-8",
+                ),
+                id=UPLOAD_ID,
+                multiple=True,
+                accept={
+                    "text/csv": [".csv"],
+                    "application/json": [".json"],
+                    "application/x-ndjson": [".jsonl", ".ndjson"],
+                },
+                class_name="border-2 border-dashed border-gray-200 rounded-xl bg-white cursor-pointer hover:border-orange-300",
+            ),
+            rx.el.div(
+                rx.el.button(
+                    "Clear",
+                    on_click=rx.clear_selected_files(UPLOAD_ID),
+                    class_name="rounded-md border border-gray-300 bg-white px-4 py-2 text-sm font-medium text-gray-700 shadow-sm hover:bg-gray-50",
+                ),
+                rx.el.button(
+                    rx.icon("file-up", class_name="mr-2 h-4 w-4"),
+                    "Import",
+                    on_click=State.import_files(rx.upload_files(upload_id=UPLOAD_ID)),
+                    class_name="inline-flex items-center rounded-md bg-orange-600 px-4 py-2 text-sm font-medium text-white shadow hover:bg-orange-600/90",
+                ),
+                class_name="flex justify-end gap-3 mt-4",
+            ),
+            rx.cond(State.import_summary != "", import_report()),
+            class_name="animate-fade-in",
+        )
+    )
@@ -23,6 +23,10 @@ def class_card(cls: rx.Var[dict]) -> rx.Component:
                         f"{cls['duration']} mins",
                         class_name="text-xs font-medium bg-blue-100 text-blue-600 px-2 py-1 rounded-full",
                     ),
+                    rx.el.span(
+                        f"{cls['size']} students",
+                        class_name="text-xs font-medium bg-green-100 text-green-600 px-2 py-1 rounded-full",
+                    ),
                     class_name="flex items-center gap-2 mt-1",
                 ),
                 class_name="flex-1",
@@ -46,7 +50,7 @@ def class_card(cls: rx.Var[dict]) -> rx.Component:
     )
 
 
-@rx.page(route="/classes")
+@rx.page(route="/classes", on_load=State.load_data)
 def classes_page() -> rx.Component:
     return main_layout(
         rx.el.div(
@@ -70,9 +74,9 @@ def classes_page() -> rx.Component:
                 class_name="flex items-center justify-between mb-6",
             ),
             rx.cond(
-                State.classes.length() > 0,
+                State.classes.values().length() > 0,
                 rx.el.div(
-                    rx.foreach(State.classes, class_card),
+                    rx.foreach(State.classes.values(), class_card),
                     class_name="grid gap-4 md:grid-cols-2 lg:grid-cols-3",
                 ),
                 rx.el.div(
@@ -90,4 +94,4 @@ def classes_page() -> rx.Component:
             ),
             class_name="animate-fade-in",
         )
-    )
\ No newline at end of file
+    )
@@ -14,4 +14,4 @@ def main_layout(child: rx.Component) -> rx.Component:
         ),
         app_modal(),
         class_name="flex min-h-screen w-full bg-gray-50/70 font-['Roboto']",
-    )
\ No newline at end of file
+    )
@@ -1,7 +1,8 @@
 import reflex as rx
+from app.components.formatting import time_label
 from app.pages.layout import main_layout
 from app.states.state import State
-from app.pages.schedules import ScheduleState
+from app.scheduling.solver import SOLVERS
 
 
 def stat_card(label: str, value: rx.Var, icon: str) -> rx.Component:
@@ -77,8 +78,8 @@ def teacher_compliance_row(teacher: rx.Var[dict]) -> rx.Component:
 
 
 def recent_schedule_item(schedule: rx.Var[dict]) -> rx.Component:
-    teacher = ScheduleState.get_teacher_by_id.get(schedule["teacher_id"], {})
-    cls = ScheduleState.get_class_by_id.get(schedule["class_id"], {})
+    teacher = State.teachers.get(schedule["teacher_id"], {})
+    cls = State.classes.get(schedule["class_id"], {})
     return rx.el.li(
         rx.el.div(
             rx.icon("calendar-check", class_name="h-5 w-5 text-orange-500"),
@@ -87,7 +88,7 @@ def recent_schedule_item(schedule: rx.Var[dict]) -> rx.Component:
         rx.el.div(
             rx.el.p(cls.get("name", "..."), class_name="font-medium text-gray-800"),
             rx.el.p(
-                f"{schedule['day_of_week']}, {schedule['start_time']}",
+                f"{schedule['day_of_week']}, {time_label(schedule['start_time'])}",
                 class_name="text-sm text-gray-500",
             ),
             class_name="flex-1",
@@ -107,7 +108,20 @@ def recent_schedule_item(schedule: rx.Var[dict]) -> rx.Component:
     )
 
 
-@rx.page(route="/")
+def unplaced_requirement_item(req: rx.Var[dict]) -> rx.Component:
+    cls = State.classes.get(req["class_id"], {})
+    return rx.el.li(
+        rx.icon("circle-alert", class_name="h-4 w-4 text-yellow-600"),
+        rx.el.span(
+            cls.get("name", "Unknown Class"),
+            class_name="text-sm font-medium text-gray-800",
+        ),
+        rx.el.span(req["subject"], class_name="text-sm text-gray-500"),
+        class_name="flex items-center gap-2",
+    )
+
+
+@rx.page(route="/", on_load=State.load_data)
 def dashboard_page() -> rx.Component:
     return main_layout(
         rx.el.div(
@@ -116,35 +130,120 @@ def dashboard_page() -> rx.Component:
                 class_name="text-2xl font-bold text-gray-800 tracking-tight mb-6",
             ),
             rx.el.div(
-                stat_card("Total Teachers", State.teachers.length(), "users"),
-                stat_card("Total Classes", State.classes.length(), "book-open"),
-                stat_card("Total Schedules", State.schedules.length(), "calendar-days"),
+                stat_card("Total Teachers", State.teachers.values().length(), "users"),
+                stat_card(
+                    "Total Classes", State.classes.values().length(), "book-open"
+                ),
+                stat_card("Total Schedules", State.schedule_count, "calendar-days"),
                 stat_card(
                     "Rule Compliance", State.rule_compliance.to_string() + "%", "gavel"
                 ),
                 class_name="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-6 mb-8",
             ),
             rx.el.div(
-                rx.el.button(
-                    rx.icon("bot", class_name="mr-2 h-4 w-4"),
-                    "Generate Schedule",
-                    on_click=State.generate_schedule,
-                    is_loading=State.is_generating_schedule,
-                    class_name="inline-flex items-center justify-center whitespace-nowrap rounded-md text-sm font-medium transition-colors focus-visible:outline-none focus-visible:ring-1 focus-visible:ring-ring disabled:pointer-events-none disabled:opacity-50 bg-orange-600 text-white shadow hover:bg-orange-600/90 h-9 px-4 py-2 mb-6",
+                rx.el.div(
+                    rx.el.button(
+                        rx.icon("bot", class_name="mr-2 h-4 w-4"),
+                        "Generate Schedule",
+                        on_click=State.generate_schedule,
+                        is_loading=State.is_generating_schedule,
+                        class_name="inline-flex items-center justify-center whitespace-nowrap rounded-md text-sm font-medium transition-colors focus-visible:outline-none focus-visible:ring-1 focus-visible:ring-ring disabled:pointer-events-none disabled:opacity-50 bg-orange-600 text-white shadow hover:bg-orange-600/90 h-9 px-4 py-2",
+                    ),
+                    rx.el.select(
+                        rx.el.option("Rebuild timetable", value="rebuild"),
+                        rx.el.option("Repair after edits", value="repair"),
+                        value=State.generation_mode,
+                        on_change=State.set_generation_mode,
+                        class_name="block rounded-lg border-gray-200 bg-white px-4 py-2 text-sm text-gray-700 shadow-sm focus:border-orange-500 focus:ring-orange-500",
+                    ),
+                    rx.el.select(
+                        *[
+                            rx.el.option(solver.label, value=name)
+                            for name, solver in SOLVERS.items()
+                        ],
+                        value=State.generation_solver,
+                        on_change=State.set_generation_solver,
+                        class_name="block rounded-lg border-gray-200 bg-white px-4 py-2 text-sm text-gray-700 shadow-sm focus:border-orange-500 focus:ring-orange-500",
+                    ),
+                    rx.el.select(
+                        *[
+                            rx.el.option(
+                                "Single run" if n == 1 else f"Best of {n}",
+                                value=str(n),
+                            )
+                            for n in (1, 4, 8, 16)
+                        ],
+                        value=State.generation_attempts,
+                        on_change=State.set_generation_attempts,
+                        class_name="block rounded-lg border-gray-200 bg-white px-4 py-2 text-sm text-gray-700 shadow-sm focus:border-orange-500 focus:ring-orange-500",
+                    ),
+                    rx.el.select(
+                        *[
+                            rx.el.option(
+                                "No optimization" if n == 0 else f"Optimize for {n} s",
+                                value=str(n),
+                            )
+                            for n in (0, 2, 5, 15)
+                        ],
+                        value=State.generation_optimize_seconds,
+                        on_change=State.set_generation_optimize_seconds,
+                        class_name="block rounded-lg border-gray-200 bg-white px-4 py-2 text-sm text-gray-700 shadow-sm focus:border-orange-500 focus:ring-orange-500",
+                    ),
+                    class_name="flex items-center gap-3 mb-6",
                 ),
                 rx.cond(
-                    State.is_generating_schedule,
+                    State.generation_message != "",
                     rx.el.div(
-                        rx.el.progress(
-                            value=State.generation_progress, class_name="w-full"
+                        rx.cond(
+                            State.is_generating_schedule,
+                            rx.el.progress(
+                                value=State.generation_progress, class_name="w-full"
+                            ),
                         ),
                         rx.el.p(
                             State.generation_message,
                             class_name="text-sm text-gray-500 mt-2 text-center",
                         ),
+                        rx.el.div(
+                            rx.cond(
+                                State.generation_job_status == "running",
+                                rx.el.button(
+                                    rx.icon("square", class_name="mr-2 h-4 w-4"),
+                                    "Cancel",
+                                    on_click=State.cancel_generation,
+                                    class_name="inline-flex items-center rounded-md border border-gray-300 bg-white px-3 py-1.5 text-sm font-medium text-gray-700 shadow-sm hover:bg-gray-50",
+                                ),
+                            ),
+                            rx.cond(
+                                State.generation_resumable,
+                                rx.el.button(
+                                    rx.icon("play", class_name="mr-2 h-4 w-4"),
+                                    "Resume",
+                                    on_click=State.resume_generation,
+                                    class_name="inline-flex items-center rounded-md border border-transparent bg-orange-600 px-3 py-1.5 text-sm font-medium text-white shadow-sm hover:bg-orange-700",
+                                ),
+                            ),
+                            class_name="flex justify-center gap-2 mt-2",
+                        ),
                         class_name="mb-6 p-4 border rounded-lg bg-gray-50",
                     ),
                 ),
+                rx.cond(
+                    State.unplaced_requirements.length() > 0,
+                    rx.el.div(
+                        rx.el.p(
+                            "Requirements that could not be placed",
+                            class_name="text-sm font-semibold text-yellow-800 mb-2",
+                        ),
+                        rx.el.ul(
+                            rx.foreach(
+                                State.unplaced_requirements, unplaced_requirement_item
+                            ),
+                            class_name="space-y-1",
+                        ),
+                        class_name="mb-6 p-4 border border-yellow-200 rounded-lg bg-yellow-50",
+                    ),
+                ),
             ),
             rx.el.div(
                 rx.el.div(
@@ -171,7 +270,9 @@ def dashboard_page() -> rx.Component:
                                 )
                             ),
                             rx.el.tbody(
-                                rx.foreach(State.teachers, teacher_compliance_row),
+                                rx.foreach(
+                                    State.teachers.values(), teacher_compliance_row
+                                ),
                                 class_name="bg-white divide-y divide-gray-200",
                             ),
                             class_name="min-w-full divide-y divide-gray-200",
@@ -186,7 +287,7 @@ def dashboard_page() -> rx.Component:
                     ),
                     rx.el.div(
                         rx.el.ul(
-                            rx.foreach(State.schedules.reverse(), recent_schedule_item),
+                            rx.foreach(State.recent_schedules, recent_schedule_item),
                             class_name="space-y-2",
                         ),
                         class_name="bg-white border border-gray-200 rounded-xl p-4 shadow-sm h-full",
@@ -1,11 +1,10 @@
 import reflex as rx
 from app.states.state import State
 from app.pages.layout import main_layout
-from app.pages.schedules import ScheduleState
 
 
 def rule_card(rule: rx.Var[dict]) -> rx.Component:
-    teacher = ScheduleState.get_teacher_by_id.get(rule["teacher_id"], {})
+    teacher = State.teachers.get(rule["teacher_id"], {})
     return rx.el.div(
         rx.el.div(
             rx.image(
@@ -41,7 +40,7 @@ def rule_card(rule: rx.Var[dict]) -> rx.Component:
     )
 
 
-@rx.page(route="/rules")
+@rx.page(route="/rules", on_load=State.load_data)
 def rules_page() -> rx.Component:
     return main_layout(
         rx.el.div(
@@ -65,8 +64,10 @@ def rules_page() -> rx.Component:
                 class_name="flex items-center justify-between mb-6",
             ),
             rx.cond(
-                State.rules.length() > 0,
-                rx.el.div(rx.foreach(State.rules, rule_card), class_name="grid gap-4"),
+                State.rules.values().length() > 0,
+                rx.el.div(
+                    rx.foreach(State.rules.values(), rule_card), class_name="grid gap-4"
+                ),
                 rx.el.div(
                     rx.icon("gavel", class_name="h-12 w-12 text-gray-400 mb-4"),
                     rx.el.h3(
@@ -82,4 +83,4 @@ def rules_page() -> rx.Component:
             ),
             class_name="animate-fade-in",
         )
-    )
\ No newline at end of file
+    )
@@ -1,23 +1,13 @@
 import reflex as rx
-from app.states.state import State, Teacher, Class
+from app.components.formatting import time_label
+from app.states.state import State
 from app.pages.layout import main_layout
 
 
-class ScheduleState(rx.State):
-    @rx.var
-    async def get_teacher_by_id(self) -> dict[int, dict]:
-        state = await self.get_state(State)
-        return {teacher["id"]: teacher for teacher in state.teachers}
-
-    @rx.var
-    async def get_class_by_id(self) -> dict[int, dict]:
-        state = await self.get_state(State)
-        return {cls["id"]: cls for cls in state.classes}
-
-
 def schedule_card(schedule: rx.Var[dict]) -> rx.Component:
-    teacher = ScheduleState.get_teacher_by_id.get(schedule["teacher_id"], {})
-    cls = ScheduleState.get_class_by_id.get(schedule["class_id"], {})
+    teacher = State.teachers.get(schedule["teacher_id"], {})
+    cls = State.classes.get(schedule["class_id"], {})
+    room = State.rooms.get(schedule["room_id"], {})
     return rx.el.div(
         rx.el.div(
             rx.el.div(
@@ -26,9 +16,16 @@ def schedule_card(schedule: rx.Var[dict]) -> rx.Component:
                     class_name="font-semibold text-gray-800",
                 ),
                 rx.el.p(
-                    f"{schedule['day_of_week']}, {schedule['start_time']} - {schedule['end_time']}",
+                    f"{schedule['day_of_week']}, {time_label(schedule['start_time'])} - {time_label(schedule['end_time'])}",
                     class_name="text-sm text-gray-500",
                 ),
+                rx.cond(
+                    schedule["room_id"],
+                    rx.el.p(
+                        room.get("name", "Unknown Room"),
+                        class_name="text-xs text-gray-400",
+                    ),
+                ),
                 class_name="flex-1",
             ),
             rx.el.div(
@@ -60,7 +57,109 @@ def schedule_card(schedule: rx.Var[dict]) -> rx.Component:
     )
 
 
-@rx.page(route="/schedules")
+SELECT_CLASS = "block rounded-lg border-gray-200 bg-white px-4 py-2 text-sm text-gray-700 shadow-sm focus:border-orange-500 focus:ring-orange-500"
+PAGER_BUTTON_CLASS = "inline-flex items-center justify-center rounded-md border border-gray-200 bg-white p-2 text-gray-600 shadow-sm hover:bg-gray-50 disabled:pointer-events-none disabled:opacity-50"
+
+
+def schedule_filters() -> rx.Component:
+    return rx.el.div(
+        rx.el.select(
+            rx.el.option("All teachers", value=""),
+            rx.foreach(
+                State.teachers.values(),
+                lambda teacher: rx.el.option(
+                    teacher["name"], value=teacher["id"].to_string()
+                ),
+            ),
+            value=State.schedule_filter_teacher_id,
+            on_change=lambda value: State.filter_schedules("teacher", value),
+            class_name=SELECT_CLASS,
+        ),
+        rx.el.select(
+            rx.el.option("All classes", value=""),
+            rx.foreach(
+                State.classes.values(),
+                lambda cls: rx.el.option(cls["name"], value=cls["id"].to_string()),
+            ),
+            value=State.schedule_filter_class_id,
+            on_change=lambda value: State.filter_schedules("class", value),
+            class_name=SELECT_CLASS,
+        ),
+        rx.el.select(
+            rx.el.option("All days", value=""),
+            *[
+                rx.el.option(day, value=day)
+                for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+            ],
+            value=State.schedule_filter_day,
+            on_change=lambda value: State.filter_schedules("day", value),
+            class_name=SELECT_CLASS,
+        ),
+        rx.el.select(
+            rx.el.option("Sort by day", value="day"),
+            rx.el.option("Sort by teacher", value="teacher"),
+            rx.el.option("Sort by class", value="class"),
+            value=State.schedule_sort,
+            on_change=lambda value: State.filter_schedules("sort", value),
+            class_name=SELECT_CLASS,
+        ),
+        rx.el.div(schedule_exports(), class_name="ml-auto"),
+        class_name="flex flex-wrap items-center gap-3 mb-6",
+    )
+
+
+def export_link(label: str, fmt: str) -> rx.Component:
+    """Links to a streamed download of the schedules matching the filters."""
+    return rx.el.a(
+        rx.icon("download", class_name="mr-2 h-4 w-4"),
+        label,
+        href=f"{rx.config.get_config().api_url}/export/schedules.{fmt}"
+        f"?teacher_id={State.schedule_filter_teacher_id}"
+        f"&class_id={State.schedule_filter_class_id}"
+        f"&day={State.schedule_filter_day}",
+        class_name="inline-flex items-center rounded-md border border-gray-200 bg-white px-3 py-1.5 text-sm font-medium text-gray-700 shadow-sm hover:bg-gray-50",
+    )
+
+
+def schedule_exports() -> rx.Component:
+    return rx.el.div(
+        export_link("CSV", "csv"),
+        export_link("Calendar", "ics"),
+        export_link("NDJSON", "ndjson"),
+        class_name="flex items-center gap-2",
+    )
+
+
+def schedule_pager() -> rx.Component:
+    return rx.el.div(
+        rx.el.p(
+            f"{State.schedule_total} schedules",
+            class_name="text-sm text-gray-500",
+        ),
+        rx.el.div(
+            rx.el.button(
+                rx.icon("chevron-left", class_name="h-4 w-4"),
+                on_click=lambda: State.change_schedule_page(-1),
+                disabled=State.schedule_page == 0,
+                class_name=PAGER_BUTTON_CLASS,
+            ),
+            rx.el.span(
+                f"Page {State.schedule_page + 1} of {State.schedule_page_count}",
+                class_name="text-sm font-medium text-gray-700",
+            ),
+            rx.el.button(
+                rx.icon("chevron-right", class_name="h-4 w-4"),
+                on_click=lambda: State.change_schedule_page(1),
+                disabled=State.schedule_page + 1 >= State.schedule_page_count,
+                class_name=PAGER_BUTTON_CLASS,
+            ),
+            class_name="flex items-center gap-3",
+        ),
+        class_name="flex items-center justify-between mt-6",
+    )
+
+
+@rx.page(route="/schedules", on_load=State.load_data)
 def schedules_page() -> rx.Component:
     return main_layout(
         rx.el.div(
@@ -83,10 +182,15 @@ def schedules_page() -> rx.Component:
                 ),
                 class_name="flex items-center justify-between mb-6",
             ),
+            schedule_filters(),
             rx.cond(
-                State.schedules.length() > 0,
+                State.schedule_total > 0,
                 rx.el.div(
-                    rx.foreach(State.schedules, schedule_card), class_name="grid gap-4"
+                    rx.el.div(
+                        rx.foreach(State.schedule_rows, schedule_card),
+                        class_name="grid gap-4",
+                    ),
+                    schedule_pager(),
                 ),
                 rx.el.div(
                     rx.icon(
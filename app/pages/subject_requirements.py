@@ -1,12 +1,11 @@
 import reflex as rx
 from app.states.state import State
 from app.pages.layout import main_layout
-from app.pages.schedules import ScheduleState
 
 
 def requirement_card(req: rx.Var[dict]) -> rx.Component:
     """Renders a card for a single subject requirement."""
-    cls = ScheduleState.get_class_by_id.get(req["class_id"], {})
+    cls = State.classes.get(req["class_id"], {})
     return rx.el.div(
         rx.el.div(
             rx.el.div(
@@ -19,7 +18,8 @@ def requirement_card(req: rx.Var[dict]) -> rx.Component:
                     class_name="font-semibold text-gray-800",
                 ),
                 rx.el.p(
-                    f"Requires subject: {req['subject']}",
+                    f"Requires subject: {req['subject']}, "
+                    f"{req['sessions']} session(s) a week",
                     class_name="text-sm text-gray-500",
                 ),
             ),
@@ -42,7 +42,7 @@ def requirement_card(req: rx.Var[dict]) -> rx.Component:
     )
 
 
-@rx.page(route="/subject_requirements")
+@rx.page(route="/subject_requirements", on_load=State.load_data)
 def subject_requirements_page() -> rx.Component:
     """The page for managing subject requirements for classes."""
     return main_layout(
@@ -67,9 +67,9 @@ def subject_requirements_page() -> rx.Component:
                 class_name="flex items-center justify-between mb-6",
             ),
             rx.cond(
-                State.subject_requirements.length() > 0,
+                State.subject_requirements.values().length() > 0,
                 rx.el.div(
-                    rx.foreach(State.subject_requirements, requirement_card),
+                    rx.foreach(State.subject_requirements.values(), requirement_card),
                     class_name="grid gap-4 md:grid-cols-2 lg:grid-cols-3",
                 ),
                 rx.el.div(
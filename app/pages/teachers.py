@@ -87,7 +87,7 @@ def teacher_card(teacher: rx.Var[dict]) -> rx.Component:
     )
 
 
-@rx.page(route="/teachers")
+@rx.page(route="/teachers", on_load=State.load_data)
 def teachers_page() -> rx.Component:
     return main_layout(
         rx.el.div(
@@ -110,9 +110,9 @@ def teachers_page() -> rx.Component:
                 class_name="flex items-center justify-between mb-6",
             ),
             rx.cond(
-                State.teachers.length() > 0,
+                State.teachers.values().length() > 0,
                 rx.el.div(
-                    rx.foreach(State.teachers, teacher_card),
+                    rx.foreach(State.teachers.values(), teacher_card),
                     class_name="grid gap-4 md:grid-cols-2 lg:grid-cols-3",
                 ),
                 rx.el.div(
@@ -130,4 +130,4 @@ def teachers_page() -> rx.Component:
             ),
             class_name="animate-fade-in",
         )
-    )
\ No newline at end of file
+    )
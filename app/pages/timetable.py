@@ -0,0 +1,105 @@
+import reflex as rx
+from app.components.formatting import time_label
+from app.states.state import State, WEEKDAYS
+from app.pages.layout import main_layout
+
+CLASS_COLORS = [
+    "bg-orange-100 border-orange-200 text-orange-800",
+    "bg-purple-100 border-purple-200 text-purple-800",
+    "bg-blue-100 border-blue-200 text-blue-800",
+    "bg-green-100 border-green-200 text-green-800",
+    "bg-pink-100 border-pink-200 text-pink-800",
+    "bg-yellow-100 border-yellow-200 text-yellow-800",
+]
+
+
+def timetable_entry(entry: rx.Var[dict]) -> rx.Component:
+    color = rx.Var.create(CLASS_COLORS)[entry["class_id"] % len(CLASS_COLORS)]
+    return rx.el.div(
+        rx.el.p(entry["class_name"], class_name="text-xs font-semibold truncate"),
+        rx.el.p(entry["teacher_name"], class_name="text-xs truncate"),
+        rx.cond(
+            entry["room_name"],
+            rx.el.p(entry["room_name"], class_name="text-xs truncate"),
+        ),
+        rx.el.p(
+            f"{time_label(entry['start_time'])} - {time_label(entry['end_time'])}",
+            class_name="text-[11px] opacity-75",
+        ),
+        on_click=lambda: State.open_modal("schedule", entry["id"]),
+        class_name="p-2 rounded-md border cursor-pointer hover:shadow-sm " + color,
+    )
+
+
+def timetable_row(row: rx.Var[dict]) -> rx.Component:
+    return rx.el.tr(
+        rx.el.td(
+            row["label"],
+            class_name="px-3 py-2 text-xs font-medium text-gray-500 align-top whitespace-nowrap",
+        ),
+        rx.foreach(
+            row["cells"],
+            lambda cell: rx.el.td(
+                rx.el.div(rx.foreach(cell, timetable_entry), class_name="grid gap-1"),
+                class_name="px-2 py-2 align-top border-l border-gray-100",
+            ),
+        ),
+        class_name="border-b border-gray-100",
+    )
+
+
+@rx.page(route="/timetable", on_load=State.load_data)
+def timetable_page() -> rx.Component:
+    return main_layout(
+        rx.el.div(
+            rx.el.div(
+                rx.el.h1(
+                    "Weekly Timetable",
+                    class_name="text-2xl font-bold text-gray-800 tracking-tight",
+                ),
+                rx.el.p(
+                    "Every scheduled class for the week, by hour and day.",
+                    class_name="text-gray-500",
+                ),
+                class_name="mb-6",
+            ),
+            rx.cond(
+                State.timetable.length() > 0,
+                rx.el.div(
+                    rx.el.table(
+                        rx.el.thead(
+                            rx.el.tr(
+                                rx.el.th(class_name="w-16"),
+                                *[
+                                    rx.el.th(
+                                        day,
+                                        class_name="px-2 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider",
+                                    )
+                                    for day in WEEKDAYS
+                                ],
+                                class_name="border-b border-gray-200",
+                            )
+                        ),
+                        rx.el.tbody(rx.foreach(State.timetable, timetable_row)),
+                        class_name="w-full table-fixed",
+                    ),
+                    class_name="bg-white border border-gray-200 rounded-xl shadow-sm overflow-x-auto",
+                ),
+                rx.el.div(
+                    rx.icon(
+                        "calendar-range", class_name="h-12 w-12 text-gray-400 mb-4"
+                    ),
+                    rx.el.h3(
+                        "Nothing Scheduled Yet",
+                        class_name="text-lg font-semibold text-gray-700",
+                    ),
+                    rx.el.p(
+                        "Add schedules or generate them from the dashboard.",
+                        class_name="text-sm text-gray-500",
+                    ),
+                    class_name="flex flex-col items-center justify-center text-center p-8 border-2 border-dashed border-gray-200 rounded-xl",
+                ),
+            ),
+            class_name="animate-fade-in",
+        )
+    )
\ No newline at end of file
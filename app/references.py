@@ -0,0 +1,39 @@
+class ReferenceIndex:
+    """The records that point at each teacher or class, kept as they change.
+
+    Every record that refers to a parent is linked under ``(parent, id)``
+    and grouped by its own kind, so everything a delete would orphan is found
+    without scanning any store, in time proportional to what is found.
+    """
+
+    def __init__(self):
+        self._children: dict[tuple[str, int], dict[str, set[int]]] = {}
+
+    def link(self, parent: str, parent_id: int, kind: str, record_id: int):
+        self._children.setdefault((parent, parent_id), {}).setdefault(kind, set()).add(
+            record_id
+        )
+
+    def unlink(self, parent: str, parent_id: int, kind: str, record_id: int):
+        children = self._children.get((parent, parent_id))
+        if children is None or kind not in children:
+            return
+        children[kind].discard(record_id)
+        if not children[kind]:
+            del children[kind]
+        if not children:
+            del self._children[(parent, parent_id)]
+
+    def dependents(self, parent: str, parent_id: int, kind: str) -> set[int]:
+        """Returns a copy of the ids of ``kind`` that refer to the parent."""
+        return set(self._children.get((parent, parent_id), {}).get(kind, ()))
+
+    def clear(self, kind: str | None = None):
+        """Forgets every link, or only the links from records of one kind."""
+        if kind is None:
+            self._children.clear()
+            return
+        for key, children in list(self._children.items()):
+            children.pop(kind, None)
+            if not children:
+                del self._children[key]
\ No newline at end of file
@@ -0,0 +1,88 @@
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class Period:
+    """A span of the school day in minutes since midnight.
+
+    Breaks are periods in which nothing is taught.
+    """
+
+    label: str
+    start: int
+    end: int
+    is_break: bool = False
+
+
+@dataclass
+class BellSchedule:
+    """The periods and breaks of each school day.
+
+    ``periods`` apply to every day in ``days`` unless ``day_periods`` gives a
+    day its own list, such as a short Friday. A day without periods has no
+    lessons. Back-to-back teaching periods form one block, and a class may
+    start every ``step`` minutes from the start of a block as long as it ends
+    within it, so it never runs into a break or past the end of the day.
+    """
+
+    days: list[str]
+    periods: list[Period]
+    day_periods: dict[str, list[Period]] = field(default_factory=dict)
+    step: int = 15
+
+    def periods_for(self, day: str) -> list[Period]:
+        return sorted(self.day_periods.get(day, self.periods), key=lambda p: p.start)
+
+    def teaching_blocks(self, day: str) -> list[tuple[int, int]]:
+        """Returns the day's runs of back-to-back teaching periods."""
+        blocks: list[tuple[int, int]] = []
+        for period in self.periods_for(day):
+            if period.is_break:
+                continue
+            if blocks and blocks[-1][1] == period.start:
+                blocks[-1] = (blocks[-1][0], period.end)
+            else:
+                blocks.append((period.start, period.end))
+        return blocks
+
+
+class SlotTable:
+    """Feasible class start times per day and duration, computed once.
+
+    The starts for a duration are built the first time they are asked for,
+    or up front for ``durations``, and shared from then on. Solvers only ever
+    try these starts, so no attempt is spent on a slot that would cross a
+    break or spill past the school day.
+    """
+
+    def __init__(self, bells: BellSchedule, durations: tuple[int, ...] = ()):
+        self.step = bells.step
+        self._blocks = {day: bells.teaching_blocks(day) for day in bells.days}
+        self.days = [day for day in bells.days if self._blocks[day]]
+        self._starts: dict[tuple[str, int], tuple[int, ...]] = {}
+        for duration in durations:
+            for day in self.days:
+                self.starts(day, duration)
+
+    def starts(self, day: str, duration: int) -> tuple[int, ...]:
+        """Returns every start at which a class of the duration fits the day."""
+        key = (day, duration)
+        starts = self._starts.get(key)
+        if starts is None:
+            starts = self._starts[key] = tuple(
+                start
+                for block_start, block_end in self._blocks.get(day, ())
+                for start in range(block_start, block_end - duration + 1, self.step)
+            )
+        return starts
+
+    def blocks(self, day: str) -> list[tuple[int, int]]:
+        """Returns the day's teaching blocks as ``(start, end)`` minutes."""
+        return self._blocks.get(day, [])
+
+    def fits(self, day: str, start: int, end: int) -> bool:
+        """Returns True if [start, end) lies within one teaching block."""
+        return any(
+            block_start <= start and end <= block_end
+            for block_start, block_end in self._blocks.get(day, ())
+        )
\ No newline at end of file
@@ -0,0 +1,137 @@
+import asyncio
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.synchronize import Event
+from typing import Callable
+
+from app.scheduling.solver import SchedulingProblem, SolverResult, get_solver
+
+STOP_POLL_INTERVAL = 0.25
+
+_executor: ProcessPoolExecutor | None = None
+_executor_stop: Event | None = None
+# The stop event of the run a pool worker serves, set by its initializer.
+_stop: Event | None = None
+
+
+def get_executor(stop: Event | None = None) -> ProcessPoolExecutor:
+    """Returns the process pool shared by generation runs that share ``stop``.
+
+    Synchronization primitives can only reach a worker when it is spawned,
+    so the pool's workers are handed ``stop`` then, and a run with another
+    stop event gets a new pool.
+    """
+    global _executor, _executor_stop
+    if _executor is not None and _executor_stop is not stop:
+        shutdown_executor()
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_set_stop,
+            initargs=(stop,),
+        )
+        _executor_stop = stop
+    return _executor
+
+
+def _set_stop(stop: Event | None):
+    global _stop
+    _stop = stop
+
+
+def shutdown_executor():
+    """Shuts down the shared process pool, if one was started."""
+    global _executor, _executor_stop
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = _executor_stop = None
+
+
+def run_attempt(
+    solver_name: str, problem: SchedulingProblem, seed: int
+) -> SolverResult:
+    """Runs one seeded solver attempt. Executed inside a pool worker.
+
+    The attempt stops at its next progress report once the pool's stop
+    event is set, returning what it has placed.
+    """
+    should_stop = _stop.is_set if _stop is not None else None
+    return get_solver(solver_name, seed=seed, should_stop=should_stop).solve(problem)
+
+
+def score_result(problem: SchedulingProblem, result: SolverResult) -> tuple:
+    """Scores a result; lower is better.
+
+    Unplaced requirements dominate, followed by the total hours teachers fall
+    short of their minimum-hours rules.
+    """
+    durations = {c["id"]: c["duration"] for c in problem.classes}
+    hours: dict[int, float] = {}
+    for placement in result.placements:
+        teacher_id = placement["teacher_id"]
+        hours[teacher_id] = (
+            hours.get(teacher_id, 0) + durations[placement["class_id"]] / 60
+        )
+    teacher_rules = {rule["teacher_id"]: rule["min_hours"] for rule in problem.rules}
+    deficit = sum(
+        max(0, min_hours - hours.get(teacher_id, 0))
+        for teacher_id, min_hours in teacher_rules.items()
+    )
+    return len(result.unplaced), deficit
+
+
+async def generate_best(
+    solver_name: str,
+    problem: SchedulingProblem,
+    attempts: int,
+    on_attempt: Callable[[int, int], None] | None = None,
+    on_best: Callable[[SolverResult], None] | None = None,
+    stop: Event | None = None,
+) -> SolverResult:
+    """Fans out seeded attempts over the process pool and keeps the best one.
+
+    ``on_best`` sees each new best result as attempts finish. Once ``stop``
+    is set, attempts that have not started are cancelled, running ones stop
+    where they are without being waited for, and the best finished one is
+    returned; with none finished, every requirement is reported unplaced.
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_executor(stop)
+    base_seed = random.randrange(2**32)
+    pending = {
+        loop.run_in_executor(
+            executor, run_attempt, solver_name, problem, base_seed + attempt
+        )
+        for attempt in range(attempts)
+    }
+    best, best_score, done = None, None, 0
+    while pending:
+        finished, pending = await asyncio.wait(
+            pending, timeout=STOP_POLL_INTERVAL, return_when=asyncio.FIRST_COMPLETED
+        )
+        for future in finished:
+            result = future.result()
+            score = score_result(problem, result)
+            if best_score is None or score < best_score:
+                best, best_score = result, score
+                if on_best is not None:
+                    on_best(best)
+            done += 1
+            if on_attempt is not None:
+                on_attempt(done, attempts)
+        if pending and stop is not None and stop.is_set():
+            for future in pending:
+                future.cancel()
+            break
+    if best is None:
+        return SolverResult(
+            unplaced=[
+                req["id"]
+                for req in problem.requirements
+                for _ in range(req.get("sessions", 1))
+            ]
+        )
+    return best
\ No newline at end of file
@@ -0,0 +1,564 @@
+import asyncio
+import atexit
+import dataclasses
+import json
+import multiprocessing
+import os
+import queue
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from multiprocessing.synchronize import Event
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from app.scheduling.bells import SlotTable
+from app.scheduling.generation import generate_best, shutdown_executor
+from app.scheduling.occupancy import OccupancyGrid, booking_resources
+from app.scheduling.optimizer import LocalSearchOptimizer
+from app.scheduling.solver import (
+    SchedulingProblem,
+    SolverResult,
+    get_solver,
+    room_options,
+)
+from app.scheduling.subjects import SubjectIndex
+
+JOBS_DIR = Path(".jobs")
+KEEP_JOBS = 20
+REPORT_INTERVAL = 0.25
+CHECKPOINT_INTERVAL = 5.0
+SHUTDOWN_TIMEOUT = 10.0
+ACTIVE_STATUSES = ("running", "cancelling")
+RESUMABLE_STATUSES = ("cancelled", "interrupted", "failed")
+INTERRUPTED_MESSAGE = "Interrupted by a server restart. Resume to carry on."
+
+
+@dataclass
+class GenerationJob:
+    """One run of the schedule generator, as saved in its job file.
+
+    ``mode``, ``solver``, ``attempts`` and ``optimize_seconds`` are the
+    options it was started with, and ``owner`` the process running it.
+    ``done`` and ``total`` count the progress of its current step, which
+    ``message`` describes. ``checkpoint`` holds the placements of every
+    requirement that was fully placed when it last saved, for a resumed run
+    to keep, and ``unplaced`` the requirement ids it left over once done.
+    """
+
+    id: str
+    mode: str
+    solver: str
+    attempts: int
+    optimize_seconds: float
+    status: str = "running"
+    owner: int = 0
+    done: int = 0
+    total: int = 0
+    message: str = ""
+    created: float = field(default_factory=time.time)
+    checkpoint: list[dict] = field(default_factory=list)
+    unplaced: list[int] = field(default_factory=list)
+
+    @property
+    def active(self) -> bool:
+        return self.status in ACTIVE_STATUSES
+
+    @property
+    def resumable(self) -> bool:
+        return self.status in RESUMABLE_STATUSES
+
+
+def complete_placements(placements: list[dict], sessions: dict[int, int]) -> list[dict]:
+    """Keeps the placements of requirements that have all their sessions."""
+    counts: dict[int, int] = {}
+    for placement in placements:
+        req_id = placement["requirement_id"]
+        counts[req_id] = counts.get(req_id, 0) + 1
+    return [
+        placement
+        for placement in placements
+        if counts[placement["requirement_id"]]
+        == sessions.get(placement["requirement_id"])
+    ]
+
+
+def resume_problem(
+    problem: SchedulingProblem, checkpoint: list[dict]
+) -> tuple[SchedulingProblem, list[dict]]:
+    """Narrows a problem to what a checkpoint has not placed yet.
+
+    ``problem`` is built from the data as it is now, which may have changed
+    since the checkpoint was saved. A requirement keeps its checkpointed
+    sessions only if it still asks for that many, and each of them still has
+    a qualified teacher, the class's duration, a place in the bell schedule
+    and a room that seats the class, without clashing with the sessions kept
+    before it. Returns the remaining requirements booked around the kept
+    placements, and the kept placements.
+    """
+    requirements = {req["id"]: req for req in problem.requirements}
+    classes = {c["id"]: c for c in problem.classes}
+    subjects = SubjectIndex(problem.teachers)
+    rooms = room_options(problem)
+    by_requirement: dict[int, list[dict]] = {}
+    for placement in checkpoint:
+        by_requirement.setdefault(placement["requirement_id"], []).append(placement)
+    grid = OccupancyGrid()
+    kept: list[dict] = []
+    loads: dict[int, int] = {}
+    for req_id, placements in by_requirement.items():
+        req = requirements.get(req_id)
+        if (
+            req is None
+            or len(placements) != req.get("sessions", 1)
+            or not all(
+                _still_valid(p, req, classes, subjects, rooms, problem.slots)
+                for p in placements
+            )
+        ):
+            continue
+        bookings = [
+            (
+                booking_resources(p["teacher_id"], p["class_id"], p["room_id"]),
+                p["day_of_week"],
+                p["start_time"],
+                p["end_time"],
+            )
+            for p in placements
+        ]
+        if any(grid.overlaps(*booking) for booking in bookings):
+            continue
+        for booking, placement in zip(bookings, placements):
+            kept.append(placement)
+            grid.add(*booking, -len(kept))
+            _, _, start, end = booking
+            teacher_id = placement["teacher_id"]
+            loads[teacher_id] = loads.get(teacher_id, 0) + end - start
+    placed = {placement["requirement_id"] for placement in kept}
+    narrowed = dataclasses.replace(
+        problem,
+        requirements=[req for req in problem.requirements if req["id"] not in placed],
+        booked=grid,
+        loads=loads,
+    )
+    return narrowed, kept
+
+
+def _still_valid(
+    placement: dict,
+    req: dict,
+    classes: dict[int, dict],
+    subjects: SubjectIndex,
+    rooms: dict[int, tuple[int, ...]] | None,
+    slots: SlotTable,
+) -> bool:
+    _class = classes.get(placement["class_id"])
+    room_id = placement["room_id"]
+    return (
+        _class is not None
+        and placement["class_id"] == req["class_id"]
+        and placement["end_time"] - placement["start_time"] == _class["duration"]
+        and subjects.qualified(placement["teacher_id"], req["subject"])
+        and slots.fits(
+            placement["day_of_week"], placement["start_time"], placement["end_time"]
+        )
+        and (room_id is None if rooms is None else room_id in rooms[_class["id"]])
+    )
+
+
+class _Reporter:
+    """Throttles what a worker process sends back to its job runner."""
+
+    def __init__(
+        self,
+        job: GenerationJob,
+        problem: SchedulingProblem,
+        events: multiprocessing.Queue,
+    ):
+        self.events = events
+        self.checkpoints = job.mode == "rebuild"
+        self.sessions = {
+            req["id"]: req.get("sessions", 1) for req in problem.requirements
+        }
+        self.kept: list[dict] = []
+        self._sent = self._saved = time.monotonic()
+
+    def progress(
+        self, message: str, placed: Callable[[], list[dict]] | None = None
+    ) -> Callable[[int, int], None]:
+        """Returns an ``on_progress`` callback that also checkpoints ``placed``."""
+
+        def on_progress(done: int, total: int):
+            now = time.monotonic()
+            if now - self._sent >= REPORT_INTERVAL:
+                self._sent = now
+                self.events.put(("progress", done, total, message.format(done, total)))
+            if placed is not None and now - self._saved >= CHECKPOINT_INTERVAL:
+                self._saved = now
+                self.checkpoint(placed())
+
+        return on_progress
+
+    def checkpoint(self, placements: list[dict]):
+        if self.checkpoints:
+            self.events.put(
+                (
+                    "checkpoint",
+                    complete_placements(self.kept + placements, self.sessions),
+                )
+            )
+
+
+def run_job(
+    job: GenerationJob,
+    problem: SchedulingProblem,
+    events: multiprocessing.Queue,
+    stop: Event,
+):
+    """Runs a job's solver and optimizer. Executed in the job's worker process.
+
+    A job with a checkpoint keeps what is still valid of it and only solves
+    the rest. Progress and checkpoints go back through ``events`` as
+    ``("progress", done, total, message)`` and ``("checkpoint", placements)``,
+    then the outcome as ``("finished", result, cancelled)`` or
+    ``("failed", error)``. Setting ``stop`` cancels the job at its next
+    progress report; the work done so far is checkpointed first.
+    """
+    try:
+        reporter = _Reporter(job, problem, events)
+        narrowed = problem
+        if job.checkpoint:
+            narrowed, reporter.kept = resume_problem(problem, job.checkpoint)
+        result = _solve(job, narrowed, reporter, stop)
+        result = SolverResult(
+            placements=reporter.kept + result.placements, unplaced=result.unplaced
+        )
+        if job.optimize_seconds and job.mode == "rebuild" and not stop.is_set():
+            optimizer = LocalSearchOptimizer(
+                time_budget=job.optimize_seconds,
+                on_progress=reporter.progress("Optimizing the timetable ({}%)..."),
+                should_stop=stop.is_set,
+            )
+            result = optimizer.optimize(problem, result)
+        if stop.is_set():
+            reporter.kept = []
+            reporter.checkpoint(result.placements)
+        events.put(("finished", result, stop.is_set()))
+    except Exception as error:
+        events.put(("failed", f"{type(error).__name__}: {error}"))
+    finally:
+        shutdown_executor()
+
+
+def _solve(
+    job: GenerationJob,
+    problem: SchedulingProblem,
+    reporter: _Reporter,
+    stop: Event,
+) -> SolverResult:
+    if job.attempts > 1:
+        return asyncio.run(
+            generate_best(
+                job.solver,
+                problem,
+                job.attempts,
+                on_attempt=reporter.progress("Finished {} of {} attempts..."),
+                on_best=lambda best: reporter.checkpoint(best.placements),
+                stop=stop,
+            )
+        )
+    solver = get_solver(job.solver, should_stop=stop.is_set)
+    solver.on_progress = reporter.progress(
+        "Placed {} of {} sessions...", solver.placed
+    )
+    return solver.solve(problem)
+
+
+class JobRunner:
+    """Runs generation jobs in worker processes and keeps their job files.
+
+    Each job runs in a spawned process of its own, so it carries on whatever
+    happens to the browser session that started it, and the event loop only
+    polls it for progress. A job's file is rewritten whenever its status
+    changes or it checkpoints. Jobs that a file shows as active but whose
+    owner process is gone were cut short by a restart and are marked
+    interrupted, ready to resume. Jobs are run by the backend process that
+    started them; when it shuts down, its running jobs are stopped with a
+    checkpoint and marked interrupted in the same way. Any backend process
+    can cancel a job: one that does not run it leaves a cancel file next to
+    the job file, which the owner looks for each time it polls the worker.
+    """
+
+    def __init__(
+        self, directory: Path = JOBS_DIR, poll_interval: float = REPORT_INTERVAL
+    ):
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self._jobs: dict[str, GenerationJob] | None = None
+        self._stops: dict[str, Event] = {}
+        # The job, problem, process and event queue of each job running here.
+        self._workers: dict[
+            str,
+            tuple[
+                GenerationJob,
+                SchedulingProblem,
+                multiprocessing.Process,
+                multiprocessing.Queue,
+            ],
+        ] = {}
+        atexit.register(self.shutdown)
+
+    @property
+    def jobs(self) -> dict[str, GenerationJob]:
+        if self._jobs is None:
+            self._jobs = self._load()
+        return self._jobs
+
+    def _load(self) -> dict[str, GenerationJob]:
+        jobs = {}
+        for path in self.directory.glob("*.json"):
+            try:
+                job = GenerationJob(**json.loads(path.read_text()))
+            except (OSError, ValueError, TypeError):
+                continue
+            if job.active and not _process_alive(job.owner):
+                job.status = "interrupted"
+                job.message = INTERRUPTED_MESSAGE
+                self.save(job)
+            jobs[job.id] = job
+        return jobs
+
+    def latest(self) -> GenerationJob | None:
+        return max(self.jobs.values(), key=lambda job: job.created, default=None)
+
+    def active(self) -> GenerationJob | None:
+        """Returns the job running in any backend process, if there is one.
+
+        The job files are read again first, since other backend processes
+        start and finish jobs too; jobs started here stay as they are held
+        in memory.
+        """
+        jobs = self._load()
+        jobs.update((job_id, self.jobs[job_id]) for job_id in self._stops)
+        self._jobs = jobs
+        return next((job for job in jobs.values() if job.active), None)
+
+    def create(
+        self, mode: str, solver: str, attempts: int, optimize_seconds: float
+    ) -> GenerationJob:
+        job = GenerationJob(
+            id=uuid.uuid4().hex[:12],
+            mode=mode,
+            solver=solver,
+            attempts=attempts,
+            optimize_seconds=optimize_seconds,
+        )
+        self.jobs[job.id] = job
+        self._prune()
+        self.save(job)
+        return job
+
+    def _prune(self):
+        """Forgets the oldest finished jobs beyond ``KEEP_JOBS``."""
+        jobs = sorted(self.jobs.values(), key=lambda job: job.created, reverse=True)
+        for job in jobs[KEEP_JOBS:]:
+            if not job.active:
+                del self.jobs[job.id]
+                (self.directory / f"{job.id}.json").unlink(missing_ok=True)
+                self._cancel_request(job.id).unlink(missing_ok=True)
+
+    def _cancel_request(self, job_id: str) -> Path:
+        return self.directory / f"{job_id}.cancel"
+
+    def save(self, job: GenerationJob):
+        """Writes a job file, replacing the old one in a single step.
+
+        The job becomes the copy this runner holds, in case the files were
+        read again while it was being changed.
+        """
+        if self._jobs is not None:
+            self._jobs[job.id] = job
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{job.id}.json"
+        temporary = path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(asdict(job)))
+        os.replace(temporary, path)
+
+    def start(self, job: GenerationJob):
+        """Marks a new or resumed job running, so it can be cancelled at once."""
+        job.status = "running"
+        job.owner = os.getpid()
+        job.done = job.total = 0
+        job.message = "Generating schedule..."
+        self._stops[job.id] = multiprocessing.get_context("spawn").Event()
+        # A resumed job keeps its id; an old request must not cancel it again.
+        self._cancel_request(job.id).unlink(missing_ok=True)
+        self.save(job)
+
+    def cancel(self, job_id: str) -> bool:
+        """Asks a running job to stop; it keeps a checkpoint to resume from.
+
+        A job running in another backend process is asked to stop through
+        its cancel file. Returns False when the job is not running.
+        """
+        stop = self._stops.get(job_id)
+        if stop is None:
+            job = self.active()
+            if job is None or job.id != job_id or job.status != "running":
+                return False
+            self._cancel_request(job_id).touch()
+            return True
+        job = self.jobs[job_id]
+        if job.status != "running":
+            return False
+        stop.set()
+        job.status = "cancelling"
+        job.message = "Cancelling..."
+        self.save(job)
+        return True
+
+    def fail(self, job: GenerationJob, error: str):
+        job.status = "failed"
+        job.message = f"Generation failed: {error}."
+        self._stops.pop(job.id, None)
+        self.save(job)
+
+    def finish(self, job: GenerationJob, message: str, unplaced: list[int]):
+        job.status = "completed"
+        job.done = job.total
+        job.message = message
+        job.checkpoint = []
+        job.unplaced = unplaced
+        self.save(job)
+
+    async def run(
+        self,
+        job: GenerationJob,
+        problem: SchedulingProblem,
+        on_update: Callable[[], Awaitable[None]],
+    ) -> SolverResult | None:
+        """Runs a started job in a new worker process and waits for it.
+
+        ``on_update`` is awaited after each poll that changed the job.
+        Returns the result for the caller to commit, which then calls
+        ``finish``, or None when the job was cancelled or failed.
+        """
+        context = multiprocessing.get_context("spawn")
+        events = context.Queue()
+        stop = self._stops[job.id]
+        process = context.Process(
+            target=run_job, args=(job, problem, events, stop), daemon=False
+        )
+        process.start()
+        self._workers[job.id] = (job, problem, process, events)
+        outcome = None
+        shown = None
+        try:
+            while outcome is None:
+                await asyncio.sleep(self.poll_interval)
+                if job.status == "running" and self._cancel_request(job.id).exists():
+                    self.cancel(job.id)
+                alive = process.is_alive()
+                outcome = self._drain(job, events)
+                if outcome is None and not alive:
+                    outcome = ("failed", "the worker process exited unexpectedly")
+                status = (job.status, job.done, job.total, job.message)
+                if status != shown:
+                    shown = status
+                    await on_update()
+        except asyncio.CancelledError:
+            # The backend is shutting down and cancelled the task waiting here.
+            self._interrupt(job.id)
+            raise
+        finally:
+            self._stops.pop(job.id, None)
+            self._workers.pop(job.id, None)
+            self._cancel_request(job.id).unlink(missing_ok=True)
+        await asyncio.to_thread(process.join)
+        if outcome[0] == "failed":
+            self.fail(job, outcome[1])
+            return None
+        _, result, cancelled = outcome
+        if cancelled:
+            sessions = sum(req.get("sessions", 1) for req in problem.requirements)
+            job.status = "cancelled"
+            job.message = (
+                f"Cancelled with {len(job.checkpoint)} of {sessions} session(s)"
+                " saved. Resume to carry on."
+                if job.mode == "rebuild"
+                else "Cancelled."
+            )
+            self.save(job)
+            return None
+        return result
+
+    def shutdown(self):
+        """Interrupts the jobs still running in this process. Runs at exit.
+
+        Without this, exiting would wait on the worker processes for as long
+        as their jobs take.
+        """
+        for job_id in list(self._workers):
+            self._interrupt(job_id)
+
+    def _interrupt(self, job_id: str, timeout: float = SHUTDOWN_TIMEOUT):
+        """Stops a job's worker and leaves the job interrupted, to resume later.
+
+        The worker checkpoints what it placed once stopped; the checkpoint is
+        saved with the job, or the whole result if the job had just finished.
+        A worker that does not exit within ``timeout`` seconds is terminated.
+        """
+        job, problem, process, events = self._workers.pop(job_id)
+        self._stops[job_id].set()
+        deadline = time.monotonic() + timeout
+        outcome = self._drain(job, events)
+        while outcome is None and process.is_alive() and time.monotonic() < deadline:
+            time.sleep(0.05)
+            outcome = self._drain(job, events)
+        if outcome is None:
+            outcome = self._drain(job, events)
+        if (
+            outcome is not None
+            and outcome[0] == "finished"
+            and not outcome[2]
+            and job.mode == "rebuild"
+        ):
+            sessions = {
+                req["id"]: req.get("sessions", 1) for req in problem.requirements
+            }
+            job.checkpoint = complete_placements(outcome[1].placements, sessions)
+        process.join(max(0.0, deadline - time.monotonic()))
+        if process.is_alive():
+            process.terminate()
+        job.status = "interrupted"
+        job.message = INTERRUPTED_MESSAGE
+        self.save(job)
+
+    def _drain(self, job: GenerationJob, events: multiprocessing.Queue) -> tuple | None:
+        """Applies the worker's queued events to the job; returns its outcome."""
+        while True:
+            try:
+                event = events.get_nowait()
+            except queue.Empty:
+                return None
+            if event[0] == "progress":
+                _, job.done, job.total, job.message = event
+                if job.status == "cancelling":
+                    job.message = "Cancelling..."
+            elif event[0] == "checkpoint":
+                job.checkpoint = event[1]
+                self.save(job)
+            else:
+                return event
+
+
+def _process_alive(pid: int) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
\ No newline at end of file
@@ -0,0 +1,155 @@
+from typing import Iterable
+
+Resource = tuple[str, int]
+
+
+def booking_resources(
+    teacher_id: int, class_id: int, room_id: int | None
+) -> list[Resource]:
+    """The resources a lesson holds: its teacher, its class and any room."""
+    resources = [("teacher", teacher_id), ("class", class_id)]
+    if room_id is not None:
+        resources.append(("room", room_id))
+    return resources
+
+
+def span_mask(start: int, end: int) -> int:
+    """Returns a bitmask with one bit set per minute in [start, end)."""
+    return ((1 << (end - start)) - 1) << start
+
+
+class OccupancyGrid:
+    """Busy minutes per (resource, day), one integer bitmask per row.
+
+    A resource is a ``(kind, id)`` pair such as ``("teacher", 3)`` or
+    ``("room", 7)``, and a booking holds every resource it names. Bit ``m``
+    of a row is set when the resource is booked during minute ``m`` of that
+    day, so a row costs about 180 bytes however many schedules it holds.
+    Checking a booking against several resources ORs their rows into one
+    mask and then tests each candidate span with a single AND, so another
+    dimension adds one OR per check rather than another pass over the
+    candidates. The span of every booking is remembered by id so it can be
+    released, or ignored when re-checking a booking that is being edited.
+    Rows hold no overlapping bookings, because every insertion path checks
+    for a conflict first.
+    """
+
+    def __init__(self):
+        self._rows: dict[tuple[Resource, str], int] = {}
+        self._spans: dict[int, tuple[tuple[Resource, ...], str, int, int]] = {}
+
+    def add(
+        self,
+        resources: Iterable[Resource],
+        day: str,
+        start: int,
+        end: int,
+        booking_id: int,
+    ):
+        resources = tuple(resources)
+        mask = span_mask(start, end)
+        for resource in resources:
+            key = (resource, day)
+            self._rows[key] = self._rows.get(key, 0) | mask
+        self._spans[booking_id] = (resources, day, start, end)
+
+    def remove(self, booking_id: int):
+        span = self._spans.pop(booking_id, None)
+        if span is not None:
+            self._release(span)
+
+    def _release(self, span: tuple[tuple[Resource, ...], str, int, int]):
+        resources, day, start, end = span
+        mask = ~span_mask(start, end)
+        for resource in resources:
+            key = (resource, day)
+            row = self._rows[key] & mask
+            if row:
+                self._rows[key] = row
+            else:
+                del self._rows[key]
+
+    def _resource_row(
+        self, resource: Resource, day: str, excluded: tuple | None
+    ) -> int:
+        row = self._rows.get((resource, day), 0)
+        if excluded is not None and excluded[1] == day and resource in excluded[0]:
+            row &= ~span_mask(excluded[2], excluded[3])
+        return row
+
+    def busy(self, resource: Resource, day: str) -> int:
+        """Returns the busy minutes of one resource on a day."""
+        return self._rows.get((resource, day), 0)
+
+    def row(
+        self,
+        resources: Iterable[Resource],
+        day: str,
+        exclude_id: int | None = None,
+    ) -> int:
+        """Returns when any of the resources is busy, minus one booking if given."""
+        excluded = self._spans.get(exclude_id)
+        row = 0
+        for resource in resources:
+            row |= self._resource_row(resource, day, excluded)
+        return row
+
+    def overlaps(
+        self,
+        resources: Iterable[Resource],
+        day: str,
+        start: int,
+        end: int,
+        exclude_id: int | None = None,
+    ) -> bool:
+        """Returns True if [start, end) overlaps a booking of any resource."""
+        return bool(self.row(resources, day, exclude_id) & span_mask(start, end))
+
+    def clashes(
+        self,
+        resources: Iterable[Resource],
+        day: str,
+        start: int,
+        end: int,
+        exclude_id: int | None = None,
+    ) -> list[Resource]:
+        """Returns the resources already booked during [start, end)."""
+        excluded = self._spans.get(exclude_id)
+        mask = span_mask(start, end)
+        return [
+            resource
+            for resource in resources
+            if self._resource_row(resource, day, excluded) & mask
+        ]
+
+    def free_starts(
+        self,
+        resources: Iterable[Resource],
+        day: str,
+        starts: Iterable[int],
+        duration: int,
+    ) -> list[int]:
+        """Returns the candidate starts where every resource is free."""
+        row = self.row(resources, day)
+        if not row:
+            return list(starts)
+        return [s for s in starts if not row & span_mask(s, s + duration)]
+
+    def snapshot(self, exclude: Iterable[int] = ()) -> "OccupancyGrid":
+        """Returns a copy holding the same busy minutes, less some bookings.
+
+        The copied bookings are fixed: they keep their minutes busy but can
+        no longer be released, so only bookings added to the copy afterwards
+        are tracked by id. Copying only duplicates one integer per row.
+        """
+        grid = OccupancyGrid()
+        grid._rows = dict(self._rows)
+        for booking_id in exclude:
+            span = self._spans.get(booking_id)
+            if span is not None:
+                grid._release(span)
+        return grid
+
+    def clear(self):
+        self._rows.clear()
+        self._spans.clear()
\ No newline at end of file
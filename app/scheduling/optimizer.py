@@ -0,0 +1,390 @@
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from app.scheduling.occupancy import OccupancyGrid, span_mask
+from app.scheduling.solver import (
+    SchedulingProblem,
+    SolverResult,
+    daily_limit,
+    room_options,
+)
+from app.scheduling.subjects import SubjectIndex
+
+CHECK_EVERY = 1024
+
+
+@dataclass(frozen=True)
+class ObjectiveWeights:
+    """Penalties of the soft constraints, per hour.
+
+    ``gap`` applies to each idle hour between a teacher's first and last
+    lesson of a day, not counting breaks. ``balance`` applies to the square
+    of each teacher's daily hours, so a week spread evenly over the days
+    costs less than the same hours bunched together. ``deficit`` applies to
+    each hour a teacher falls short of a minimum-hours rule.
+    """
+
+    gap: float = 1.0
+    balance: float = 0.1
+    deficit: float = 4.0
+
+
+class LocalSearchOptimizer:
+    """Improves a finished timetable by simulated annealing.
+
+    Each move takes one lesson to a random day and start, sometimes with
+    another teacher of the subject, and keeps its room when that room is
+    still free or else takes the smallest free room that seats the class.
+    Moves that would double-book a teacher, class or room, or put more of a
+    requirement's sessions on one day than its daily limit, are rejected
+    before they are scored, and starts come from the slot table, so every
+    state the search visits satisfies the hard constraints. Lessons of a
+    requirement with several sessions keep their teacher.
+
+    A move changes at most two (teacher, day) rows and, when the teacher
+    changes, two teachers' weekly minutes, so it is scored from those alone.
+    Busy minutes are kept as one bitmask per teacher and day, which makes
+    idle time and daily load a few integer operations per row.
+
+    The temperature cools geometrically over ``time_budget`` seconds, or
+    until ``should_stop`` returns True. The search may end on a worse state
+    than one it passed through, so the best timetable it saw is kept and
+    returned. The result is never worse than the timetable it was given.
+    """
+
+    def __init__(
+        self,
+        time_budget: float = 2.0,
+        weights: ObjectiveWeights = ObjectiveWeights(),
+        seed: int | None = None,
+        on_progress: Callable[[int, int], None] | None = None,
+        start_temperature: float = 1.0,
+        end_temperature: float = 0.005,
+        teacher_move_rate: float = 0.2,
+        should_stop: Callable[[], bool] | None = None,
+    ):
+        self.time_budget = time_budget
+        self.weights = weights
+        self.rng = random.Random(seed)
+        self.on_progress = on_progress
+        self.start_temperature = start_temperature
+        self.end_temperature = end_temperature
+        self.teacher_move_rate = teacher_move_rate
+        self.should_stop = should_stop
+        self.moves = 0
+        self.accepted = 0
+        self.initial_cost = 0.0
+        self.final_cost = 0.0
+
+    def optimize(
+        self, problem: SchedulingProblem, result: SolverResult
+    ) -> SolverResult:
+        """Returns an improved copy of ``result``, or ``result`` itself."""
+        self.moves = self.accepted = 0
+        if not result.placements:
+            return result
+        self._build(problem, result.placements)
+        self.initial_cost = self.final_cost = self._cost
+        self._anneal()
+        if self._cost >= self.initial_cost:
+            return result
+        self.final_cost = self._cost
+        placements = []
+        for i, placement in enumerate(result.placements):
+            start = self._starts[i]
+            placements.append(
+                {
+                    **placement,
+                    "teacher_id": self._teacher_ids[i],
+                    "room_id": self._room_ids[i],
+                    "day_of_week": self._days_of[i],
+                    "start_time": start,
+                    "end_time": start + self._durations[i],
+                }
+            )
+        return SolverResult(placements=placements, unplaced=list(result.unplaced))
+
+    def cost(self) -> float:
+        """Recomputes the objective of the current timetable from scratch."""
+        total = sum(self._row_cost(day, row) for (_, day), row in self._rows.items())
+        return total + sum(
+            self._deficit_cost(teacher_id, minutes)
+            for teacher_id, minutes in self._minutes.items()
+        )
+
+    def _build(self, problem: SchedulingProblem, placements: list[dict]):
+        subjects = {req["id"]: req["subject"] for req in problem.requirements}
+        sessions = {req["id"]: req.get("sessions", 1) for req in problem.requirements}
+        index = SubjectIndex(problem.teachers)
+        rooms = room_options(problem)
+        self._slots = problem.slots
+        self._day_list = list(problem.slots.days)
+        self._breaks = {day: self._break_mask(day) for day in self._day_list}
+        self._min_minutes = {
+            rule["teacher_id"]: rule["min_hours"] * 60 for rule in problem.rules
+        }
+        self._grid = OccupancyGrid()
+        self._rows: dict[tuple[int, str], int] = {}
+        self._minutes: dict[int, int] = {}
+        self._teacher_ids: list[int] = []
+        self._room_ids: list[int | None] = []
+        self._days_of: list[str] = []
+        self._starts: list[int] = []
+        self._durations: list[int] = []
+        self._class_ids: list[int] = []
+        self._req_ids: list[int] = []
+        self._limits: list[int] = []
+        self._day_counts: dict[tuple[int, str], int] = {}
+        self._eligible: list[list[int]] = []
+        self._room_choices: list[tuple[int, ...] | None] = []
+        for i, placement in enumerate(placements):
+            teacher_id = placement["teacher_id"]
+            day = placement["day_of_week"]
+            start = placement["start_time"]
+            duration = placement["end_time"] - start
+            self._teacher_ids.append(teacher_id)
+            self._room_ids.append(placement["room_id"])
+            self._days_of.append(day)
+            self._starts.append(start)
+            self._durations.append(duration)
+            self._class_ids.append(placement["class_id"])
+            req_id = placement["requirement_id"]
+            self._req_ids.append(req_id)
+            self._limits.append(
+                daily_limit(sessions.get(req_id, 1), len(self._day_list))
+            )
+            self._day_counts[(req_id, day)] = self._day_counts.get((req_id, day), 0) + 1
+            if sessions.get(req_id, 1) > 1:
+                self._eligible.append([teacher_id])
+            else:
+                self._eligible.append(
+                    index.teachers_for(subjects.get(req_id, "")) or [teacher_id]
+                )
+            self._room_choices.append(
+                None if rooms is None else rooms.get(placement["class_id"], ())
+            )
+            self._grid.add(
+                self._shared_resources(placement["class_id"], placement["room_id"]),
+                day,
+                start,
+                start + duration,
+                i,
+            )
+            key = (teacher_id, day)
+            self._rows[key] = self._rows.get(key, 0) | span_mask(
+                start, start + duration
+            )
+            self._minutes[teacher_id] = self._minutes.get(teacher_id, 0) + duration
+        for teacher_id in self._min_minutes:
+            self._minutes.setdefault(teacher_id, 0)
+        self._cost = self.cost()
+
+    def _break_mask(self, day: str) -> int:
+        """Minutes between the day's teaching blocks, which are never idle."""
+        blocks = self._slots.blocks(day)
+        mask = 0
+        for (_, end), (start, _) in zip(blocks, blocks[1:]):
+            mask |= span_mask(end, start)
+        return mask
+
+    @staticmethod
+    def _shared_resources(class_id: int, room_id: int | None) -> list:
+        resources = [("class", class_id)]
+        if room_id is not None:
+            resources.append(("room", room_id))
+        return resources
+
+    def _row_cost(self, day: str, row: int) -> float:
+        if not row:
+            return 0.0
+        low = (row & -row).bit_length() - 1
+        high = row.bit_length()
+        busy = row.bit_count()
+        idle = (
+            high - low - busy - (self._breaks[day] & span_mask(low, high)).bit_count()
+        )
+        weights = self.weights
+        return weights.gap * idle / 60 + weights.balance * (busy / 60) ** 2
+
+    def _deficit_cost(self, teacher_id: int, minutes: int) -> float:
+        shortfall = self._min_minutes.get(teacher_id, 0) - minutes
+        return self.weights.deficit * shortfall / 60 if shortfall > 0 else 0.0
+
+    def _free_room(self, i: int, day: str, start: int, end: int) -> int | None:
+        """Returns a room for lesson ``i`` at the new time, or -1 if none is free."""
+        choices = self._room_choices[i]
+        if choices is None:
+            return None
+        current = self._room_ids[i]
+        grid = self._grid
+        if current is not None and not grid.overlaps(
+            (("room", current),), day, start, end, exclude_id=i
+        ):
+            return current
+        for room_id in choices:
+            if room_id != current and not grid.overlaps(
+                (("room", room_id),), day, start, end, exclude_id=i
+            ):
+                return room_id
+        return -1
+
+    def _anneal(self):
+        rng = self.rng
+        random_ = rng.random
+        count = len(self._starts)
+        rows = self._rows
+        minutes = self._minutes
+        row_cost = self._row_cost
+        deficit_cost = self._deficit_cost
+        grid = self._grid
+        day_counts = self._day_counts
+        limits = self._limits
+        temperature = self.start_temperature
+        cooling = self.end_temperature / self.start_temperature
+        began = time.perf_counter()
+        deadline = began + self.time_budget
+        # Where each lesson moved since the best timetable so far was, so the
+        # best one can be put back at the end without copying every lesson
+        # each time it improves.
+        best_cost = self._cost
+        at_best: dict[int, tuple[int, int | None, str, int]] = {}
+        while True:
+            if self.moves % CHECK_EVERY == 0:
+                now = time.perf_counter()
+                if now >= deadline or (
+                    self.should_stop is not None and self.should_stop()
+                ):
+                    break
+                fraction = (now - began) / self.time_budget
+                temperature = self.start_temperature * cooling**fraction
+                if self.on_progress is not None:
+                    self.on_progress(int(fraction * 100), 100)
+            self.moves += 1
+            i = int(random_() * count)
+            old_teacher = self._teacher_ids[i]
+            old_day = self._days_of[i]
+            old_start = self._starts[i]
+            duration = self._durations[i]
+            teacher = old_teacher
+            if random_() < self.teacher_move_rate:
+                eligible = self._eligible[i]
+                teacher = eligible[int(random_() * len(eligible))]
+            day = self._day_list[int(random_() * len(self._day_list))]
+            starts = self._slots.starts(day, duration)
+            if not starts:
+                continue
+            start = starts[int(random_() * len(starts))]
+            if teacher == old_teacher and day == old_day and start == old_start:
+                continue
+            req_id = self._req_ids[i]
+            if day != old_day and day_counts.get((req_id, day), 0) >= limits[i]:
+                continue
+            lesson = (1 << duration) - 1
+            old_mask = lesson << old_start
+            new_mask = lesson << start
+            old_key = (old_teacher, old_day)
+            new_key = (teacher, day)
+            old_row = rows[old_key]
+            if old_key == new_key:
+                new_row = (old_row & ~old_mask) | new_mask
+                if (old_row & ~old_mask) & new_mask:
+                    continue
+            else:
+                target_row = rows.get(new_key, 0)
+                if target_row & new_mask:
+                    continue
+            end = start + duration
+            if grid.overlaps(
+                (("class", self._class_ids[i]),), day, start, end, exclude_id=i
+            ):
+                continue
+            room_id = self._free_room(i, day, start, end)
+            if room_id == -1:
+                continue
+            if old_key == new_key:
+                delta = row_cost(day, new_row) - row_cost(day, old_row)
+            else:
+                left_row = old_row & ~old_mask
+                delta = (
+                    row_cost(old_day, left_row)
+                    + row_cost(day, target_row | new_mask)
+                    - row_cost(old_day, old_row)
+                    - row_cost(day, target_row)
+                )
+            if teacher != old_teacher:
+                delta += (
+                    deficit_cost(old_teacher, minutes[old_teacher] - duration)
+                    + deficit_cost(teacher, minutes.get(teacher, 0) + duration)
+                    - deficit_cost(old_teacher, minutes[old_teacher])
+                    - deficit_cost(teacher, minutes.get(teacher, 0))
+                )
+            if delta > 0 and random_() >= math.exp(-delta / temperature):
+                continue
+            self.accepted += 1
+            self._cost += delta
+            if i not in at_best:
+                at_best[i] = (old_teacher, self._room_ids[i], old_day, old_start)
+            if old_key == new_key:
+                rows[old_key] = new_row
+            else:
+                if left_row:
+                    rows[old_key] = left_row
+                else:
+                    del rows[old_key]
+                rows[new_key] = target_row | new_mask
+                if teacher != old_teacher:
+                    minutes[old_teacher] -= duration
+                    minutes[teacher] = minutes.get(teacher, 0) + duration
+            if day != old_day:
+                day_counts[(req_id, old_day)] -= 1
+                day_counts[(req_id, day)] = day_counts.get((req_id, day), 0) + 1
+            grid.remove(i)
+            grid.add(
+                self._shared_resources(self._class_ids[i], room_id), day, start, end, i
+            )
+            self._teacher_ids[i] = teacher
+            self._room_ids[i] = room_id
+            self._days_of[i] = day
+            self._starts[i] = start
+            if self._cost < best_cost:
+                best_cost = self._cost
+                at_best.clear()
+        self._restore(at_best)
+        self._cost = best_cost
+        if self.on_progress is not None:
+            self.on_progress(100, 100)
+
+    def _restore(self, lessons: dict[int, tuple[int, int | None, str, int]]):
+        """Moves lessons back to the given ``(teacher, room, day, start)``.
+
+        All of them are lifted out before any is put back, so a lesson never
+        lands on one that has not moved back yet.
+        """
+        rows, minutes, day_counts = self._rows, self._minutes, self._day_counts
+        for i in lessons:
+            teacher, day = self._teacher_ids[i], self._days_of[i]
+            start, duration = self._starts[i], self._durations[i]
+            row = rows[(teacher, day)] & ~span_mask(start, start + duration)
+            if row:
+                rows[(teacher, day)] = row
+            else:
+                del rows[(teacher, day)]
+            minutes[teacher] -= duration
+            day_counts[(self._req_ids[i], day)] -= 1
+            self._grid.remove(i)
+        for i, (teacher, room_id, day, start) in lessons.items():
+            end = start + self._durations[i]
+            rows[(teacher, day)] = rows.get((teacher, day), 0) | span_mask(start, end)
+            minutes[teacher] = minutes.get(teacher, 0) + end - start
+            key = (self._req_ids[i], day)
+            day_counts[key] = day_counts.get(key, 0) + 1
+            self._grid.add(
+                self._shared_resources(self._class_ids[i], room_id), day, start, end, i
+            )
+            self._teacher_ids[i] = teacher
+            self._room_ids[i] = room_id
+            self._days_of[i] = day
+            self._starts[i] = start
\ No newline at end of file
@@ -0,0 +1,119 @@
+from dataclasses import dataclass, field
+
+from app.scheduling.bells import SlotTable
+from app.scheduling.occupancy import OccupancyGrid, booking_resources
+from app.scheduling.subjects import SubjectIndex
+
+
+@dataclass
+class RepairPlan:
+    """How a repair changes the timetable around a set of edited classes.
+
+    ``removed`` are schedules that can no longer stand, ``stretched`` maps
+    schedules that only needed their end moved to the new end time, and
+    ``requirements`` are the requirements left unmet. ``booked`` is the
+    timetable as it will be once the removals and stretches are applied,
+    for the solver to place the unmet requirements around.
+    """
+
+    removed: list[int] = field(default_factory=list)
+    stretched: dict[int, int] = field(default_factory=dict)
+    requirements: list[dict] = field(default_factory=list)
+    booked: OccupancyGrid = field(default_factory=OccupancyGrid)
+
+
+def plan_repair(
+    schedules: list[dict],
+    requirements: list[dict],
+    teachers: dict[int, dict],
+    classes: dict[int, dict],
+    rooms: dict[int, dict],
+    slots: SlotTable,
+    occupancy: OccupancyGrid,
+    subjects: SubjectIndex,
+) -> RepairPlan:
+    """Works out what has to change after edits to some classes.
+
+    ``schedules`` and ``requirements`` are those of the edited classes only;
+    the rest of the timetable is only seen through ``occupancy`` and is left
+    as it is, so the work grows with the edit rather than the school.
+
+    A schedule is removed when its teacher or class is gone, when it no
+    longer fits the bell schedule or when its room no longer seats the
+    class. A schedule whose class changed duration keeps its teacher, day,
+    start and room if the new length still fits there, and is removed
+    otherwise. Each session of a requirement is then met by a remaining
+    schedule of its class whose teacher is qualified in its subject. A
+    requirement left short of sessions loses the ones it still has and is
+    placed again whole, so that its sessions stay with one teacher and spread
+    over the week; schedules that meet no requirement are kept as they are.
+    """
+    plan = RepairPlan()
+    resized = []
+    for schedule in schedules:
+        _class = classes.get(schedule["class_id"])
+        room_id = schedule.get("room_id")
+        room = rooms.get(room_id) if room_id is not None else None
+        if (
+            _class is None
+            or schedule["teacher_id"] not in teachers
+            or (room_id is not None and room is None)
+            or (room is not None and room["capacity"] < _class["size"])
+        ):
+            plan.removed.append(schedule["id"])
+        elif schedule["end_time"] - schedule["start_time"] != _class["duration"]:
+            resized.append(schedule)
+        elif not slots.fits(
+            schedule["day_of_week"], schedule["start_time"], schedule["end_time"]
+        ):
+            plan.removed.append(schedule["id"])
+    plan.booked = occupancy.snapshot(
+        exclude=plan.removed + [schedule["id"] for schedule in resized]
+    )
+    stretched = []
+    for schedule in resized:
+        day = schedule["day_of_week"]
+        start = schedule["start_time"]
+        end = start + classes[schedule["class_id"]]["duration"]
+        resources = booking_resources(
+            schedule["teacher_id"], schedule["class_id"], schedule.get("room_id")
+        )
+        if slots.fits(day, start, end) and not plan.booked.overlaps(
+            resources, day, start, end
+        ):
+            # Negative ids keep fixed lessons apart from the ids that solvers
+            # book under.
+            plan.booked.add(resources, day, start, end, -schedule["id"])
+            plan.stretched[schedule["id"]] = end
+            stretched.append((resources, day, start, end, -schedule["id"]))
+        else:
+            plan.removed.append(schedule["id"])
+    removed = set(plan.removed)
+    taught: dict[int, list[dict]] = {}
+    for schedule in schedules:
+        if schedule["id"] not in removed:
+            taught.setdefault(schedule["class_id"], []).append(schedule)
+    dropped = []
+    for req in requirements:
+        remaining = taught.get(req["class_id"], [])
+        matched = [
+            schedule
+            for schedule in remaining
+            if subjects.qualified(schedule["teacher_id"], req["subject"])
+        ][: req.get("sessions", 1)]
+        for schedule in matched:
+            remaining.remove(schedule)
+        if len(matched) < req.get("sessions", 1):
+            dropped.extend(schedule["id"] for schedule in matched)
+            plan.requirements.append(req)
+    if dropped:
+        plan.removed.extend(dropped)
+        for schedule_id in dropped:
+            plan.stretched.pop(schedule_id, None)
+        plan.booked = occupancy.snapshot(
+            exclude={*plan.removed, *(schedule["id"] for schedule in resized)}
+        )
+        for booking in stretched:
+            if -booking[-1] in plan.stretched:
+                plan.booked.add(*booking)
+    return plan
\ No newline at end of file
@@ -0,0 +1,107 @@
+import struct
+import sys
+from array import array
+from typing import Iterable, Iterator
+
+MAGIC = b"SCHD"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<4sBI")
+COLUMNS = (
+    ("ids", "i"),
+    ("class_ids", "i"),
+    ("teacher_ids", "i"),
+    ("room_ids", "i"),
+    ("day_indexes", "B"),
+    ("starts", "H"),
+    ("ends", "H"),
+)
+
+
+class ScheduleTable:
+    """Schedules stored column-wise in typed arrays.
+
+    The day is kept as its index into ``days``, times as 16-bit minutes
+    since midnight and a missing room as room id 0, so a row costs 21 bytes
+    instead of a dict, and the whole table serializes to one binary blob: a
+    small header followed by each column's raw bytes, little-endian.
+    """
+
+    def __init__(self, days: list[str]):
+        self.days = days
+        self._day_index = {day: index for index, day in enumerate(days)}
+        for name, typecode in COLUMNS:
+            setattr(self, name, array(typecode))
+
+    @classmethod
+    def from_records(
+        cls, days: list[str], schedules: Iterable[dict]
+    ) -> "ScheduleTable":
+        table = cls(days)
+        schedules = list(schedules)
+        table.ids.extend(s["id"] for s in schedules)
+        table.class_ids.extend(s["class_id"] for s in schedules)
+        table.teacher_ids.extend(s["teacher_id"] for s in schedules)
+        table.room_ids.extend(s.get("room_id") or 0 for s in schedules)
+        table.day_indexes.extend(table._day_index[s["day_of_week"]] for s in schedules)
+        table.starts.extend(s["start_time"] for s in schedules)
+        table.ends.extend(s["end_time"] for s in schedules)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def records(self) -> Iterator[dict]:
+        """Yields each row back as a ``Schedule`` dict."""
+        days = self.days
+        for id_, class_id, teacher_id, room_id, day, start, end in zip(
+            self.ids,
+            self.class_ids,
+            self.teacher_ids,
+            self.room_ids,
+            self.day_indexes,
+            self.starts,
+            self.ends,
+        ):
+            yield {
+                "id": id_,
+                "class_id": class_id,
+                "teacher_id": teacher_id,
+                "room_id": room_id or None,
+                "day_of_week": days[day],
+                "start_time": start,
+                "end_time": end,
+            }
+
+    def to_bytes(self) -> bytes:
+        parts = [HEADER.pack(MAGIC, FORMAT_VERSION, len(self))]
+        for name, _ in COLUMNS:
+            column = getattr(self, name)
+            if sys.byteorder == "big":
+                column = array(column.typecode, column)
+                column.byteswap()
+            parts.append(column.tobytes())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, days: list[str], data: bytes) -> "ScheduleTable":
+        """Reads a blob written by ``to_bytes``.
+
+        Raises ValueError if the blob is not a schedule table of this format.
+        """
+        if len(data) < HEADER.size:
+            raise ValueError("Schedule blob is truncated.")
+        magic, version, count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Not a schedule blob of a supported version.")
+        table = cls(days)
+        offset = HEADER.size
+        for name, _ in COLUMNS:
+            column = getattr(table, name)
+            size = count * column.itemsize
+            if offset + size > len(data):
+                raise ValueError("Schedule blob is truncated.")
+            column.frombytes(data[offset : offset + size])
+            if sys.byteorder == "big":
+                column.byteswap()
+            offset += size
+        return table
\ No newline at end of file
@@ -0,0 +1,778 @@
+import heapq
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, TypedDict
+
+from app.scheduling.bells import SlotTable
+from app.scheduling.occupancy import OccupancyGrid, booking_resources, span_mask
+from app.scheduling.subjects import SubjectIndex
+
+
+class Placement(TypedDict):
+    """A requirement placed at a concrete teacher, room, day and time."""
+
+    requirement_id: int
+    class_id: int
+    teacher_id: int
+    room_id: int | None
+    day_of_week: str
+    start_time: int
+    end_time: int
+
+
+@dataclass
+class SchedulingProblem:
+    """Everything a solver needs to place the subject requirements.
+
+    Each requirement asks for ``sessions`` lessons a week, one when it does
+    not say. Without ``rooms``, placements get no room and rooms are not
+    checked.
+    ``booked`` holds lessons already in the timetable, which placements
+    have to work around and which are never moved, and ``loads`` the
+    minutes each teacher already teaches there.
+    """
+
+    teachers: list[dict]
+    classes: list[dict]
+    requirements: list[dict]
+    slots: SlotTable
+    rules: list[dict] = field(default_factory=list)
+    rooms: list[dict] = field(default_factory=list)
+    booked: OccupancyGrid | None = None
+    loads: dict[int, int] = field(default_factory=dict)
+
+
+@dataclass
+class SolverResult:
+    """Placed lessons, and a requirement id for each session left unplaced."""
+
+    placements: list[Placement] = field(default_factory=list)
+    unplaced: list[int] = field(default_factory=list)
+
+
+class ScheduleSolver:
+    """Base class for schedule generation engines.
+
+    Once ``should_stop`` returns True a solver stops early and returns what
+    it has placed, with everything else reported unplaced.
+    """
+
+    label = ""
+
+    def __init__(
+        self,
+        seed: int | None = None,
+        on_progress: Callable[[int, int], None] | None = None,
+        should_stop: Callable[[], bool] | None = None,
+    ):
+        self.rng = random.Random(seed)
+        self.on_progress = on_progress
+        self.should_stop = should_stop
+
+    def solve(self, problem: SchedulingProblem) -> SolverResult:
+        raise NotImplementedError
+
+    def placed(self) -> list[Placement]:
+        """Returns the placements made so far, for calls from ``on_progress``."""
+        raise NotImplementedError
+
+    def _report(self, done: int, total: int):
+        if self.on_progress is not None:
+            self.on_progress(done, total)
+
+    def _stopping(self) -> bool:
+        return self.should_stop is not None and self.should_stop()
+
+    def _open_slots(
+        self,
+        grid: OccupancyGrid,
+        teacher_id: int,
+        class_id: int,
+        rooms: tuple[int, ...] | None,
+        day: str,
+        starts: tuple[int, ...],
+        duration: int,
+    ) -> Iterator[tuple[int, int | None]]:
+        """Yields ``(start, room_id)`` wherever teacher, class and a room are free.
+
+        ``rooms`` are the ids the class fits in, best fit first, or None when
+        the problem has no rooms. Each start gets the first free room. The
+        teacher and class are checked together with one combined row, and a
+        start during which every room is busy is skipped without trying them.
+        """
+        free = grid.free_starts(
+            (("teacher", teacher_id), ("class", class_id)), day, starts, duration
+        )
+        if rooms is None:
+            for start in free:
+                yield start, None
+            return
+        if not rooms or not free:
+            return
+        room_rows = [
+            (room_id, grid.row((("room", room_id),), day)) for room_id in rooms
+        ]
+        all_busy = -1
+        for _, row in room_rows:
+            all_busy &= row
+        for start in free:
+            mask = span_mask(start, start + duration)
+            if all_busy & mask:
+                continue
+            for room_id, row in room_rows:
+                if not row & mask:
+                    yield start, room_id
+                    break
+
+
+class GreedySolver(ScheduleSolver):
+    """Places all sessions of a requirement at once, with one teacher.
+
+    Qualified teachers are tried least loaded first, ties in random order.
+    For each, the days are read in an order whose first days are spread
+    evenly over the week, taking up to the daily limit of the earliest free
+    starts of each day; the earliest starts pack lessons together instead of
+    leaving gaps too short for another class. Reading stops once there is a
+    day for every session, and past one session a day the extra sessions go
+    round the days in turn. The first teacher with room for every session
+    takes them all; if none has, the one with room for the most does and the
+    rest are reported unplaced.
+    """
+
+    label = "Greedy (random)"
+
+    def solve(self, problem: SchedulingProblem) -> SolverResult:
+        result = self._result = SolverResult()
+        classes = {c["id"]: c for c in problem.classes}
+        subjects = SubjectIndex(problem.teachers)
+        loads = dict(problem.loads)
+        grid = _start_grid(problem)
+        rooms = room_options(problem)
+        days = list(problem.slots.days)
+        total = len(problem.requirements)
+        for done, req in enumerate(problem.requirements):
+            self._report(done, total)
+            if self._stopping():
+                for rest in problem.requirements[done:]:
+                    result.unplaced.extend([rest["id"]] * rest.get("sessions", 1))
+                break
+            target_class = classes.get(req["class_id"])
+            sessions = req.get("sessions", 1)
+            if not target_class:
+                result.unplaced.extend([req["id"]] * sessions)
+                continue
+            eligible = subjects.teachers_for(req["subject"])
+            self.rng.shuffle(eligible)
+            eligible.sort(key=lambda teacher_id: loads.get(teacher_id, 0))
+            duration = target_class["duration"]
+            class_rooms = None if rooms is None else rooms[req["class_id"]]
+            best_teacher, best = None, []
+            for teacher_id in eligible:
+                chosen = self._sessions(
+                    grid,
+                    teacher_id,
+                    req["class_id"],
+                    class_rooms,
+                    problem.slots,
+                    self._day_order(days, sessions),
+                    duration,
+                    sessions,
+                )
+                if len(chosen) > len(best):
+                    best_teacher, best = teacher_id, chosen
+                    if len(best) == sessions:
+                        break
+            for day, start, room_id in best:
+                end = start + duration
+                grid.add(
+                    booking_resources(best_teacher, req["class_id"], room_id),
+                    day,
+                    start,
+                    end,
+                    len(result.placements),
+                )
+                result.placements.append(
+                    _placement(req, best_teacher, room_id, day, start, end)
+                )
+            if best:
+                loads[best_teacher] = loads.get(best_teacher, 0) + duration * len(best)
+            result.unplaced.extend([req["id"]] * (sessions - len(best)))
+        return result
+
+    def placed(self) -> list[Placement]:
+        return list(self._result.placements)
+
+    def _day_order(self, days: list[str], sessions: int) -> list[str]:
+        """Orders the days so that the first ``sessions`` are evenly spaced."""
+        count = len(days)
+        if sessions >= count:
+            offset = self.rng.randrange(count) if count else 0
+            return days[offset:] + days[:offset]
+        step = count / sessions
+        phase = self.rng.random() * step
+        picked = {int(phase + i * step) for i in range(sessions)}
+        rest = [day for i, day in enumerate(days) if i not in picked]
+        self.rng.shuffle(rest)
+        return [days[i] for i in sorted(picked)] + rest
+
+    def _sessions(
+        self,
+        grid: OccupancyGrid,
+        teacher_id: int,
+        class_id: int,
+        rooms: tuple[int, ...] | None,
+        slots: SlotTable,
+        days: list[str],
+        duration: int,
+        sessions: int,
+    ) -> list[tuple[str, int, int | None]]:
+        """Returns up to ``sessions`` free ``(day, start, room_id)`` for a teacher.
+
+        Nothing is booked, so sessions on the same day are kept apart here.
+        """
+        limit = daily_limit(sessions, len(days))
+        by_day = []
+        for day in days:
+            options = []
+            end = 0
+            for start, room_id in self._open_slots(
+                grid,
+                teacher_id,
+                class_id,
+                rooms,
+                day,
+                slots.starts(day, duration),
+                duration,
+            ):
+                if start >= end:
+                    options.append((day, start, room_id))
+                    end = start + duration
+                    if len(options) == limit:
+                        break
+            if options:
+                by_day.append(options)
+                if len(by_day) == sessions:
+                    break
+        chosen = [
+            options[i] for i in range(limit) for options in by_day if i < len(options)
+        ]
+        return chosen[:sessions]
+
+
+class BacktrackingSolver(ScheduleSolver):
+    """Backtracking search with forward checking and MRV ordering.
+
+    Each session of a requirement is a variable whose domain is every free
+    (teacher, day, start) of an eligible teacher, with a room the class fits
+    in. No teacher, class or room is ever double-booked. Once one session of
+    a requirement is placed, the others only take its teacher, on days still
+    under the daily limit, furthest from the days already used first.
+
+    Domain sizes are kept per requirement, as the number of starts at which
+    one of its teachers and its class are both free on its open days. They
+    are summed from the free starts of each (teacher, class, day). A
+    teacher shared between subjects therefore counts as taken for every
+    requirement as soon as one takes them, and a requirement whose teachers
+    are only free while its class is busy has no values left. Rooms only
+    narrow the values generated, so with rooms the sizes are an upper bound.
+    An assignment only marks its teacher and class as changed; a size is
+    recounted when its requirement comes up next and one of its teachers or
+    its class changed since it was counted. Bookings only shrink domains, so
+    a size that is out of date can only sort a requirement too late, never
+    hide one with fewer values.
+
+    The next requirement is the one with the fewest values left. Its values
+    are tried first on a teacher with room for all of its sessions, then on
+    the teacher with the most free minutes beyond what the other
+    requirements still need of them, which keeps shared teachers for the
+    requirements that depend on them. Within a day, starts that pack the
+    lesson against a block edge or another lesson come before the rest.
+
+    A requirement whose domain is wiped out undoes the choices since the last
+    one that touched its teachers or class and tries the next value there.
+    It is reported unplaced instead once ``max_retries`` of those have not
+    freed it, once ``max_backtracks`` are spent in all, or when its teachers
+    have no free start left at all, since moving other lessons around cannot
+    make room then. A requirement whose teachers and class are free but
+    whose rooms are not is reported as unplaced straight away.
+
+    Those limits make one run give up early rather than search for ever,
+    so a run that leaves sessions unplaced is restarted from scratch with
+    other random choices and twice the limits. The best run is kept. The
+    search stops once every session is placed, after ``patience`` restarts
+    in a row that placed no more, or once ``time_budget`` seconds are spent.
+    """
+
+    label = "Constraint solver"
+
+    def __init__(
+        self,
+        seed: int | None = None,
+        on_progress: Callable[[int, int], None] | None = None,
+        max_backtracks: int = 20000,
+        should_stop: Callable[[], bool] | None = None,
+        max_retries: int = 10,
+        time_budget: float = 10.0,
+        patience: int = 2,
+    ):
+        super().__init__(seed, on_progress, should_stop)
+        self.max_backtracks = max_backtracks
+        self.max_retries = max_retries
+        self.time_budget = time_budget
+        self.patience = patience
+
+    def solve(self, problem: SchedulingProblem) -> SolverResult:
+        self._deadline = time.perf_counter() + self.time_budget
+        self._best: SolverResult | None = None
+        self._progress = 0
+        retries, backtracks = self.max_retries, self.max_backtracks
+        stalled = 0
+        while True:
+            self._build(problem)
+            self._search(retries, backtracks)
+            result = self._result()
+            if self._best is None or len(result.unplaced) < len(self._best.unplaced):
+                self._best, stalled = result, 0
+            else:
+                stalled += 1
+            if (
+                not self._best.unplaced
+                or stalled > self.patience
+                or self._stopping()
+                or time.perf_counter() >= self._deadline
+            ):
+                return self._best
+            retries, backtracks = retries * 2, backtracks * 2
+
+    def placed(self) -> list[Placement]:
+        placements = [
+            _placement(self._reqs[var], *value)
+            for var, value in self._assignment.items()
+        ]
+        if self._best is not None and len(self._best.placements) > len(placements):
+            return list(self._best.placements)
+        return placements
+
+    def _result(self) -> SolverResult:
+        result = SolverResult()
+        for var, req in enumerate(self._reqs):
+            value = self._assignment.get(var)
+            if value is None:
+                result.unplaced.append(req["id"])
+            else:
+                result.placements.append(_placement(req, *value))
+        return result
+
+    def _build(self, problem: SchedulingProblem):
+        classes = {c["id"]: c for c in problem.classes}
+        subjects = SubjectIndex(problem.teachers)
+        self._days = list(problem.slots.days)
+        self._slots = problem.slots
+        self._day_index = {day: i for i, day in enumerate(self._days)}
+        self._rooms = room_options(problem)
+        self._grid = _start_grid(problem)
+        self._reqs: list[dict] = []
+        self._pending: dict[int, list[int]] = {}
+        self._eligible: dict[int, tuple[int, ...]] = {}
+        self._class_of: dict[int, int] = {}
+        self._durations: dict[int, int] = {}
+        self._limits: dict[int, int] = {}
+        teachers: dict[int, None] = {}
+        for req in problem.requirements:
+            sessions = req.get("sessions", 1)
+            variables = list(range(len(self._reqs), len(self._reqs) + sessions))
+            self._reqs.extend([req] * sessions)
+            target_class = classes.get(req["class_id"])
+            eligible = tuple(subjects.teachers_for(req["subject"]))
+            if not target_class or not eligible:
+                continue
+            req_id, class_id = req["id"], req["class_id"]
+            self._pending[req_id] = variables[::-1]
+            self._eligible[req_id] = eligible
+            self._class_of[req_id] = class_id
+            self._durations[req_id] = target_class["duration"]
+            self._limits[req_id] = daily_limit(sessions, len(self._days))
+            teachers.update(dict.fromkeys(eligible))
+        self._class_durations = {c["id"]: c["duration"] for c in problem.classes}
+        self._teacher_of: dict[int, tuple[int, int]] = {}
+        self._day_use: dict[tuple[int, str], int] = {}
+        self._counts: dict[tuple[int, str, int], int] = {}
+        self._free: dict[tuple[int, int, str], int] = {}
+        self._free_minutes = {
+            teacher_id: self._teaching_minutes(teacher_id) for teacher_id in teachers
+        }
+        self._demand = dict.fromkeys(teachers, 0.0)
+        self._step = 0
+        self._changed: dict[tuple[str, int], int] = {}
+        self._counted: dict[int, int] = {}
+        self._sizes: dict[int, int] = {}
+        self._heap: list = []
+        for req_id in self._pending:
+            self._claim(req_id, 1)
+            self._resize(req_id)
+        self._assignment: dict[int, tuple[int, int | None, str, int, int]] = {}
+        self._backtracks = 0
+        self._given_up = 0
+        self._total = sum(len(pending) for pending in self._pending.values())
+
+    def _count(self, teacher_id: int, class_id: int, day: str) -> int:
+        """Counts the starts at which a teacher and a class are both free."""
+        busy = self._grid.busy
+        return self._free_starts(
+            busy(("teacher", teacher_id), day) | busy(("class", class_id), day),
+            day,
+            self._class_durations[class_id],
+        )
+
+    def _free_starts(self, row: int, day: str, duration: int) -> int:
+        """Counts the starts free in a busy row, remembering rows seen before."""
+        key = (row, day, duration)
+        count = self._counts.get(key)
+        if count is None:
+            count = self._counts[key] = sum(
+                1
+                for start in self._slots.starts(day, duration)
+                if not row & span_mask(start, start + duration)
+            )
+        return count
+
+    def _teaching_minutes(self, teacher_id: int) -> int:
+        """The minutes of the week's teaching blocks a teacher has free."""
+        free = 0
+        for day in self._days:
+            blocks = 0
+            for start, end in self._slots.blocks(day):
+                blocks |= span_mask(start, end)
+            free += (blocks & ~self._grid.busy(("teacher", teacher_id), day)).bit_count()
+        return free
+
+    def _allowed(self, req_id: int) -> tuple[int, ...]:
+        placed = self._teacher_of.get(req_id)
+        return (placed[0],) if placed else self._eligible[req_id]
+
+    def _is_open(self, req_id: int, day: str) -> bool:
+        return self._day_use.get((req_id, day), 0) < self._limits[req_id]
+
+    def _resize(self, req_id: int):
+        """Recounts a requirement's domain from scratch."""
+        class_id = self._class_of[req_id]
+        size = 0
+        for teacher_id in self._allowed(req_id):
+            for day in self._days:
+                if self._is_open(req_id, day):
+                    free = self._free[(teacher_id, class_id, day)] = self._count(
+                        teacher_id, class_id, day
+                    )
+                    size += free
+        self._sizes[req_id] = size
+        self._counted[req_id] = self._step
+        self._push(req_id)
+
+    def _outdated(self, req_id: int) -> bool:
+        """Returns True if a requirement's teachers or class changed since its count."""
+        counted, changed = self._counted[req_id], self._changed
+        if changed.get(("class", self._class_of[req_id]), 0) > counted:
+            return True
+        return any(
+            changed.get(("teacher", teacher_id), 0) > counted
+            for teacher_id in self._allowed(req_id)
+        )
+
+    def _push(self, req_id: int):
+        if self._pending[req_id]:
+            heapq.heappush(
+                self._heap,
+                (self._sizes[req_id], -len(self._pending[req_id]), req_id),
+            )
+
+    def _select(self) -> int | None:
+        """Returns the waiting requirement with the fewest values left.
+
+        A requirement that comes up with an out-of-date size is recounted and
+        pushed again. Sizes that grew are not pushed again straight away:
+        their old entry sorts too early, and is replaced once it comes up.
+        """
+        while self._heap:
+            size, remaining, req_id = self._heap[0]
+            pending = self._pending[req_id]
+            if pending and (size, remaining) == (self._sizes[req_id], -len(pending)):
+                if not self._outdated(req_id):
+                    return req_id
+                heapq.heappop(self._heap)
+                self._resize(req_id)
+                continue
+            heapq.heappop(self._heap)
+            if pending and size < self._sizes[req_id]:
+                self._push(req_id)
+        return None
+
+    def _claim(self, req_id: int, sign: int):
+        """Adds or takes back what a requirement still needs of its teachers.
+
+        The minutes of its waiting sessions are shared evenly between the
+        teachers it may still take.
+        """
+        teachers = self._allowed(req_id)
+        share = (
+            sign
+            * len(self._pending[req_id])
+            * self._durations[req_id]
+            / len(teachers)
+        )
+        for teacher_id in teachers:
+            self._demand[teacher_id] += share
+
+    def _touch(self, teacher_id: int, class_id: int):
+        """Marks a teacher and a class as booked or freed at this step."""
+        self._step += 1
+        self._changed[("teacher", teacher_id)] = self._step
+        self._changed[("class", class_id)] = self._step
+
+    def _values(self, req_id: int, var: int):
+        """Yields free values for a session, least contended teacher first."""
+        req = self._reqs[var]
+        duration = self._durations[req_id]
+        class_id = req["class_id"]
+        rooms = None if self._rooms is None else self._rooms[class_id]
+        teachers = list(self._allowed(req_id))
+        if len(teachers) > 1:
+            remaining = len(self._pending[req_id])
+            self.rng.shuffle(teachers)
+            teachers.sort(
+                key=lambda t: (
+                    -min(remaining, self._open_day_count(req_id, t)),
+                    self._demand[t] - self._free_minutes[t],
+                )
+            )
+        days = self._open_days(req_id)
+        loose = []
+        for teacher_id in teachers:
+            for day in days:
+                busy = self._grid.row(
+                    (("teacher", teacher_id), ("class", class_id)), day
+                )
+                edges = {start for start, _ in self._slots.blocks(day)}
+                for start, room_id in self._open_slots(
+                    self._grid,
+                    teacher_id,
+                    class_id,
+                    rooms,
+                    day,
+                    self._slots.starts(day, duration),
+                    duration,
+                ):
+                    value = (teacher_id, room_id, day, start, start + duration)
+                    if start in edges or busy >> (start - 1) & 1:
+                        yield value
+                    else:
+                        loose.append(value)
+        yield from loose
+
+    def _open_day_count(self, req_id: int, teacher_id: int) -> int:
+        """Counts the sessions a teacher could still take on days with a free start."""
+        class_id = self._class_of[req_id]
+        return sum(
+            self._limits[req_id]
+            for day in self._days
+            if self._free[(teacher_id, class_id, day)] and self._is_open(req_id, day)
+        )
+
+    def _open_days(self, req_id: int) -> list[str]:
+        """Days below the daily limit, furthest from the placed sessions first."""
+        used = [
+            self._day_index[day]
+            for day in self._days
+            for _ in range(self._day_use.get((req_id, day), 0))
+        ]
+        days = [day for day in self._days if self._is_open(req_id, day)]
+        self.rng.shuffle(days)
+        if used:
+            days.sort(key=lambda day: -min(abs(self._day_index[day] - i) for i in used))
+        return days
+
+    def _assign(self, var: int, value: tuple[int, int | None, str, int, int]):
+        teacher_id, room_id, day, start, end = value
+        req_id = self._reqs[var]["id"]
+        class_id = self._reqs[var]["class_id"]
+        self._claim(req_id, -1)
+        self._pending[req_id].pop()
+        self._teacher_of.setdefault(req_id, (teacher_id, var))
+        self._day_use[(req_id, day)] = self._day_use.get((req_id, day), 0) + 1
+        self._claim(req_id, 1)
+        self._assignment[var] = value
+        self._grid.add(
+            booking_resources(teacher_id, class_id, room_id), day, start, end, var
+        )
+        self._free_minutes[teacher_id] -= end - start
+        self._touch(teacher_id, class_id)
+        self._resize(req_id)
+
+    def _unassign(self, var: int):
+        teacher_id, _, day, start, end = self._assignment.pop(var)
+        req_id = self._reqs[var]["id"]
+        class_id = self._reqs[var]["class_id"]
+        self._grid.remove(var)
+        self._free_minutes[teacher_id] += end - start
+        self._claim(req_id, -1)
+        self._day_use[(req_id, day)] -= 1
+        self._pending[req_id].append(var)
+        if self._teacher_of[req_id][1] == var:
+            del self._teacher_of[req_id]
+        self._claim(req_id, 1)
+        self._touch(teacher_id, class_id)
+        self._resize(req_id)
+
+    def _try_next(self, frame: list) -> bool:
+        """Undoes the frame's current value and assigns its next one."""
+        var, values = frame
+        if var in self._assignment:
+            self._unassign(var)
+        value = next(values, None)
+        if value is None:
+            return False
+        self._assign(var, value)
+        return True
+
+    def _search(self, max_retries: int, max_backtracks: int):
+        frames: list[list] = []
+        self._retries: dict[int, int] = {}
+        while True:
+            # Progress never goes back when a restart begins again from nothing.
+            self._progress = max(
+                self._progress, len(self._assignment) + self._given_up
+            )
+            self._report(self._progress, self._total)
+            req_id = self._select()
+            if (
+                req_id is None
+                or self._stopping()
+                or (self._best is not None and time.perf_counter() >= self._deadline)
+            ):
+                return
+            if self._sizes[req_id]:
+                var = self._pending[req_id][-1]
+                frame = [var, self._values(req_id, var)]
+                if self._try_next(frame):
+                    frames.append(frame)
+                else:
+                    # Teachers and class are free but every fitting room is
+                    # not; undoing the last choice rarely changes that.
+                    self._give_up(req_id)
+                continue
+            retries = self._retries.get(req_id, 0)
+            if (
+                self._backtracks >= max_backtracks
+                or retries >= max_retries
+                or not frames
+                or not self._teachers_free(req_id)
+            ):
+                self._give_up(req_id)
+                continue
+            self._retries[req_id] = retries + 1
+            self._backtracks += 1
+            self._jump_back(frames, req_id)
+            while frames and not self._try_next(frames[-1]):
+                frames.pop()
+            if not frames:
+                self._give_up(req_id)
+
+    def _teachers_free(self, req_id: int) -> bool:
+        """Returns True if one of a requirement's teachers has a start left."""
+        duration = self._durations[req_id]
+        busy = self._grid.busy
+        return any(
+            self._free_starts(busy(("teacher", teacher_id), day), day, duration)
+            for teacher_id in self._allowed(req_id)
+            for day in self._days
+            if self._is_open(req_id, day)
+        )
+
+    def _jump_back(self, frames: list[list], req_id: int):
+        """Undoes the choices made since the last one that narrowed a requirement.
+
+        Only a session booked with one of the requirement's teachers, with
+        its class or as one of its own sessions can have emptied its domain,
+        so later choices are undone without trying their other values.
+        """
+        teachers = set(self._eligible[req_id])
+        class_id = self._class_of[req_id]
+        while len(frames) > 1:
+            var = frames[-1][0]
+            if (
+                self._assignment[var][0] in teachers
+                or self._reqs[var]["class_id"] == class_id
+            ):
+                return
+            self._unassign(var)
+            frames.pop()
+
+    def _give_up(self, req_id: int):
+        """Drops a session that cannot be placed alongside the others."""
+        self._claim(req_id, -1)
+        self._pending[req_id].pop()
+        self._claim(req_id, 1)
+        self._given_up += 1
+        self._push(req_id)
+
+
+SOLVERS: dict[str, type[ScheduleSolver]] = {
+    "backtracking": BacktrackingSolver,
+    "greedy": GreedySolver,
+}
+
+
+def get_solver(
+    name: str,
+    seed: int | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+    should_stop: Callable[[], bool] | None = None,
+) -> ScheduleSolver:
+    """Returns a solver instance by name, defaulting to backtracking."""
+    return SOLVERS.get(name, BacktrackingSolver)(
+        seed=seed, on_progress=on_progress, should_stop=should_stop
+    )
+
+
+def daily_limit(sessions: int, day_count: int) -> int:
+    """The most sessions of one requirement that may share a day.
+
+    Sessions go on different days while the week has enough of them, and are
+    shared out as evenly as possible beyond that.
+    """
+    return max(1, -(-sessions // max(day_count, 1)))
+
+
+def _start_grid(problem: SchedulingProblem) -> OccupancyGrid:
+    """Returns the grid a solver books into, holding any already booked lessons."""
+    if problem.booked is None:
+        return OccupancyGrid()
+    return problem.booked.snapshot()
+
+
+def room_options(problem: SchedulingProblem) -> dict[int, tuple[int, ...]] | None:
+    """Maps each class to the rooms it fits in, smallest first.
+
+    Returns None when the problem has no rooms, so rooms go unchecked.
+    """
+    if not problem.rooms:
+        return None
+    rooms = sorted(problem.rooms, key=lambda r: (r["capacity"], r["id"]))
+    return {
+        c["id"]: tuple(r["id"] for r in rooms if r["capacity"] >= c.get("size", 0))
+        for c in problem.classes
+    }
+
+
+def _placement(
+    req: dict, teacher_id: int, room_id: int | None, day: str, start: int, end: int
+) -> Placement:
+    return {
+        "requirement_id": req["id"],
+        "class_id": req["class_id"],
+        "teacher_id": teacher_id,
+        "room_id": room_id,
+        "day_of_week": day,
+        "start_time": start,
+        "end_time": end,
+    }
\ No newline at end of file
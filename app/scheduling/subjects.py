@@ -0,0 +1,49 @@
+from typing import Iterable
+
+
+def split_subjects(text: str) -> tuple[str, ...]:
+    """Returns the subjects in a comma-separated list, in order, once each."""
+    subjects: dict[str, None] = {}
+    for part in text.split(","):
+        subject = part.strip()
+        if subject:
+            subjects[subject] = None
+    return tuple(subjects)
+
+
+class SubjectIndex:
+    """The teachers qualified in each subject, kept as teachers change.
+
+    A teacher's ``subject`` field lists every subject they can teach, comma
+    separated, so one teacher can meet requirements of several subjects.
+    Finding who can teach a subject is one dictionary lookup instead of a
+    scan over every teacher.
+    """
+
+    def __init__(self, teachers: Iterable[dict] = ()):
+        self._teachers: dict[str, dict[int, None]] = {}
+        self._subjects: dict[int, tuple[str, ...]] = {}
+        for teacher in teachers:
+            self.add(teacher)
+
+    def add(self, teacher: dict):
+        """Indexes a teacher, replacing what was indexed for them before."""
+        self.remove(teacher["id"])
+        subjects = split_subjects(teacher["subject"])
+        self._subjects[teacher["id"]] = subjects
+        for subject in subjects:
+            self._teachers.setdefault(subject, {})[teacher["id"]] = None
+
+    def remove(self, teacher_id: int):
+        for subject in self._subjects.pop(teacher_id, ()):
+            teachers = self._teachers[subject]
+            del teachers[teacher_id]
+            if not teachers:
+                del self._teachers[subject]
+
+    def teachers_for(self, subject: str) -> list[int]:
+        """Returns the ids of the teachers qualified in a subject."""
+        return list(self._teachers.get(subject, ()))
+
+    def qualified(self, teacher_id: int, subject: str) -> bool:
+        return subject in self._subjects.get(teacher_id, ())
\ No newline at end of file
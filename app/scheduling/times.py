@@ -0,0 +1,10 @@
+def to_minutes(time_str: str) -> int:
+    """Converts an "HH:MM" string into minutes since midnight."""
+    hours, minutes = time_str.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def to_time_str(minutes: int) -> str:
+    """Formats minutes since midnight as an "HH:MM" string."""
+    hours, minutes = divmod(minutes % (24 * 60), 60)
+    return f"{hours:02d}:{minutes:02d}"
\ No newline at end of file
@@ -0,0 +1,126 @@
+import bisect
+from typing import TypedDict
+
+
+class TimetableEntry(TypedDict):
+    """A schedule as shown in the weekly timetable, with names resolved."""
+
+    id: int
+    class_id: int
+    teacher_id: int
+    room_id: int | None
+    class_name: str
+    teacher_name: str
+    room_name: str
+    start_time: int
+    end_time: int
+
+
+class TimetableRow(TypedDict):
+    """One hour of the weekly timetable, with one cell per day."""
+
+    hour: int
+    label: str
+    cells: list[list[TimetableEntry]]
+
+
+class Timetable:
+    """Schedules bucketed by start hour and day, kept sorted as they change.
+
+    Each cell holds its entries ordered by (start_time, id), and the position
+    of every entry is remembered by id, so adding or removing one schedule
+    only touches its own cell. Entries carry the class, teacher and room
+    names, resolved from name maps kept alongside, so the page can render the
+    week without looking anything up.
+    """
+
+    def __init__(self, days: list[str]):
+        self.days = list(days)
+        self._cells: dict[tuple[int, int], list[TimetableEntry]] = {}
+        self._positions: dict[int, tuple[int, int]] = {}
+        self._names: dict[str, dict[int, str]] = {
+            "class": {},
+            "teacher": {},
+            "room": {},
+        }
+
+    def set_names(self, field: str, names: dict[int, str]):
+        """Replaces the class, teacher or room names used for new entries."""
+        self._names[field] = dict(names)
+
+    def update_names(self, field: str, names: dict[int, str]):
+        """Adds or replaces names without touching entries."""
+        self._names[field].update(names)
+
+    def add(self, schedule: dict):
+        entry: TimetableEntry = {
+            "id": schedule["id"],
+            "class_id": schedule["class_id"],
+            "teacher_id": schedule["teacher_id"],
+            "room_id": schedule.get("room_id"),
+            "class_name": self._name("class", schedule["class_id"]),
+            "teacher_name": self._name("teacher", schedule["teacher_id"]),
+            "room_name": (
+                ""
+                if schedule.get("room_id") is None
+                else self._name("room", schedule["room_id"])
+            ),
+            "start_time": schedule["start_time"],
+            "end_time": schedule["end_time"],
+        }
+        key = (
+            schedule["start_time"] // 60,
+            self.days.index(schedule["day_of_week"]),
+        )
+        cell = self._cells.setdefault(key, [])
+        at = bisect.bisect_left(
+            cell,
+            (entry["start_time"], entry["id"]),
+            key=lambda e: (e["start_time"], e["id"]),
+        )
+        cell.insert(at, entry)
+        self._positions[entry["id"]] = key
+
+    def remove(self, schedule_id: int):
+        key = self._positions.pop(schedule_id, None)
+        if key is None:
+            return
+        cell = [e for e in self._cells[key] if e["id"] != schedule_id]
+        if cell:
+            self._cells[key] = cell
+        else:
+            del self._cells[key]
+
+    def rename(self, field: str, record_id: int, name: str):
+        """Updates the class, teacher or room name shown on matching entries."""
+        self._names[field][record_id] = name
+        for cell in self._cells.values():
+            for i, entry in enumerate(cell):
+                if entry[f"{field}_id"] == record_id:
+                    cell[i] = {**entry, f"{field}_name": name}
+
+    def forget(self, field: str, record_id: int):
+        """Drops the name of a deleted record whose entries are gone."""
+        self._names[field].pop(record_id, None)
+
+    def clear(self):
+        self._cells.clear()
+        self._positions.clear()
+
+    def _name(self, field: str, record_id: int) -> str:
+        return self._names[field].get(record_id, f"Unknown {field.title()}")
+
+    def rows(self) -> list[TimetableRow]:
+        """Returns one row per hour that has entries, earliest first."""
+        hours = sorted({hour for hour, _ in self._cells})
+        return [
+            {
+                "hour": hour,
+                "label": f"{hour:02d}:00",
+                "cells": [
+                    list(self._cells.get((hour, day), []))
+                    for day in range(len(self.days))
+                ],
+            }
+            for hour in hours
+        ]
\ No newline at end of file
@@ -1,9 +1,32 @@
 import reflex as rx
-from typing import TypedDict, Literal
+from typing import Callable, TypedDict, Literal
 import asyncio
+import csv
+import functools
+import io
+import itertools
+from reflex.utils import prerequisites
+from app.bulk_import import (
+    IMPORTERS,
+    ImportLookups,
+    ImportRowError,
+    import_summary,
+    valid_rows,
+)
+from app.dataset import VIEWS, Dataset
+from app.models import ClassModel, insert_rows, load_rows, query_schedules
+from app.scheduling.bells import BellSchedule, Period, SlotTable
+from app.scheduling.jobs import GenerationJob, JobRunner
+from app.scheduling.repair import RepairPlan, plan_repair
+from app.scheduling.solver import SchedulingProblem, SolverResult
+from app.scheduling.subjects import split_subjects
+from app.scheduling.times import to_minutes, to_time_str
+from app.scheduling.timetable import TimetableRow
 
 
 class Teacher(TypedDict):
+    """A teacher; ``subject`` lists every subject they teach, comma separated."""
+
     id: int
     name: str
     email: str
@@ -15,15 +38,25 @@ class Class(TypedDict):
     name: str
     subject: str
     duration: int
+    size: int
+
+
+class Room(TypedDict):
+    id: int
+    name: str
+    capacity: int
 
 
 class Schedule(TypedDict):
+    """A booked class; times are minutes since midnight."""
+
     id: int
     class_id: int
     teacher_id: int
+    room_id: int | None
     day_of_week: Literal["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
-    start_time: str
-    end_time: str
+    start_time: int
+    end_time: int
 
 
 class Rule(TypedDict):
@@ -33,53 +66,76 @@ class Rule(TypedDict):
 
 
 class SubjectRequirement(TypedDict):
-    """Represents a requirement that a class must have a certain subject scheduled."""
+    """Represents a requirement that a class must have a certain subject scheduled.
+
+    ``sessions`` is how many lessons of it the class has each week.
+    """
 
     id: int
     class_id: int
     subject: str
-
-
-ModalType = Literal["teacher", "class", "schedule", "rule", "subject_requirement", ""]
+    sessions: int
+
+
+FORM_FIELDS = (
+    "teacher_name",
+    "teacher_email",
+    "teacher_subject",
+    "class_name",
+    "class_subject",
+    "class_duration",
+    "class_size",
+    "room_name",
+    "room_capacity",
+    "schedule_class_id",
+    "schedule_teacher_id",
+    "schedule_room_id",
+    "schedule_day_of_week",
+    "schedule_start_time",
+    "rule_teacher_id",
+    "rule_min_hours",
+    "subject_requirement_class_id",
+    "subject_requirement_subject",
+    "subject_requirement_sessions",
+)
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+BELL_SCHEDULE = BellSchedule(
+    days=WEEKDAYS,
+    periods=[
+        *(Period(f"Period {n}", (7 + n) * 60, (8 + n) * 60) for n in range(1, 5)),
+        Period("Lunch", 12 * 60, 13 * 60, is_break=True),
+        *(Period(f"Period {n}", (8 + n) * 60, (9 + n) * 60) for n in range(5, 9)),
+    ],
+)
+SLOTS = SlotTable(BELL_SCHEDULE)
+PROGRESS_INTERVAL = 0.25
+SCHEDULE_PAGE_SIZE = 25
+IMPORT_ERROR_PREVIEW = 100
+DATASET = Dataset(WEEKDAYS)
+JOBS = JobRunner(poll_interval=PROGRESS_INTERVAL)
+_JOB_TASKS: set[asyncio.Task] = set()
+_BROADCAST_TASKS: set[asyncio.Task] = set()
+SHARED_VIEWS = (
+    "teachers",
+    "classes",
+    "rooms",
+    "rules",
+    "subject_requirements",
+    "timetable",
+    "recent_schedules",
+    "teacher_hours",
+    "teacher_rules",
+)
+
+
+ModalType = Literal[
+    "teacher", "class", "room", "schedule", "rule", "subject_requirement", ""
+]
 
 
 class State(rx.State):
-    """The main state for the application, holding all data and business logic."""
+    """The per-session state: UI fields plus views of the shared dataset."""
 
-    teachers: list[Teacher] = [
-        {
-            "id": 1,
-            "name": "John Doe",
-            "email": "john.doe@example.com",
-            "subject": "Math",
-        },
-        {
-            "id": 2,
-            "name": "Jane Smith",
-            "email": "jane.smith@example.com",
-            "subject": "History",
-        },
-        {
-            "id": 3,
-            "name": "Peter Jones",
-            "email": "peter.jones@example.com",
-            "subject": "Science",
-        },
-    ]
-    classes: list[Class] = [
-        {"id": 1, "name": "Algebra 101", "subject": "Math", "duration": 60},
-        {"id": 2, "name": "World History", "subject": "History", "duration": 90},
-        {"id": 3, "name": "Physics I", "subject": "Science", "duration": 120},
-    ]
-    schedules: list[Schedule] = []
-    rules: list[Rule] = [
-        {"id": 1, "teacher_id": 1, "min_hours": 10},
-        {"id": 2, "teacher_id": 2, "min_hours": 8},
-    ]
-    subject_requirements: list[SubjectRequirement] = [
-        {"id": 1, "class_id": 1, "subject": "Math"},
-        {"id": 2, "class_id": 2, "subject": "History"},
-    ]
     show_modal: bool = False
     modal_type: ModalType = ""
     is_editing: bool = False
@@ -90,287 +146,454 @@ class State(rx.State):
     class_name: str = ""
     class_subject: str = ""
     class_duration: str = "60"
+    class_size: str = "0"
+    room_name: str = ""
+    room_capacity: str = "30"
     schedule_class_id: str = ""
     schedule_teacher_id: str = ""
+    schedule_room_id: str = ""
     schedule_day_of_week: str = "Monday"
     schedule_start_time: str = "09:00"
     rule_teacher_id: str = ""
     rule_min_hours: str = ""
     subject_requirement_class_id: str = ""
     subject_requirement_subject: str = ""
+    subject_requirement_sessions: str = "1"
     is_generating_schedule: bool = False
+    generation_job_status: str = ""
+    generation_resumable: bool = False
     generation_progress: int = 0
     generation_message: str = ""
-    _next_teacher_id: int = 4
-    _next_class_id: int = 4
-    _next_schedule_id: int = 1
-    _next_rule_id: int = 3
-    _next_subject_requirement_id: int = 3
+    generation_solver: str = "backtracking"
+    generation_attempts: str = "1"
+    generation_optimize_seconds: str = "0"
+    generation_mode: str = "rebuild"
+    unplaced_requirements: list[SubjectRequirement] = []
+    schedule_rows: list[Schedule] = []
+    schedule_total: int = 0
+    schedule_page: int = 0
+    schedule_filter_teacher_id: str = ""
+    schedule_filter_class_id: str = ""
+    schedule_filter_day: str = ""
+    schedule_sort: str = "day"
+    import_kind: str = "teacher"
+    import_summary: str = ""
+    import_errors: list[ImportRowError] = []
+    import_error_count: int = 0
+    _teachers_version: int = -1
+    _classes_version: int = -1
+    _rooms_version: int = -1
+    _rules_version: int = -1
+    _subject_requirements_version: int = -1
+    _schedules_version: int = -1
+    _import_report: list[ImportRowError] = []
 
     @rx.var
     def current_page(self) -> str:
         return self.router.page.path.strip("/") or "dashboard"
 
-    @rx.var
+    @rx.var(deps=["_teachers_version"], auto_deps=False)
+    def teachers(self) -> dict[int, Teacher]:
+        return DATASET.teachers
+
+    @rx.var(deps=["_classes_version"], auto_deps=False)
+    def classes(self) -> dict[int, Class]:
+        return DATASET.classes
+
+    @rx.var(deps=["_rooms_version"], auto_deps=False)
+    def rooms(self) -> dict[int, Room]:
+        return DATASET.rooms
+
+    @rx.var(deps=["_rules_version"], auto_deps=False)
+    def rules(self) -> dict[int, Rule]:
+        return DATASET.rules
+
+    @rx.var(deps=["_subject_requirements_version"], auto_deps=False)
+    def subject_requirements(self) -> dict[int, SubjectRequirement]:
+        return DATASET.subject_requirements
+
+    @rx.var(deps=["_schedules_version"], auto_deps=False)
+    def timetable(self) -> list[TimetableRow]:
+        return DATASET.timetable_rows()
+
+    @rx.var(deps=["_schedules_version"], auto_deps=False)
+    def schedule_count(self) -> int:
+        return len(DATASET.schedules)
+
+    @rx.var(deps=["_schedules_version"], auto_deps=False)
+    def recent_schedules(self) -> list[Schedule]:
+        return DATASET.recent_schedules()
+
+    @rx.var(deps=["schedule_total"], auto_deps=False)
+    def schedule_page_count(self) -> int:
+        return max(1, -(-self.schedule_total // SCHEDULE_PAGE_SIZE))
+
+    @rx.var(
+        deps=["_schedules_version", "_classes_version", "_teachers_version"],
+        auto_deps=False,
+    )
     def teacher_hours(self) -> dict[int, float]:
-        hours = {teacher["id"]: 0 for teacher in self.teachers}
-        class_durations = {c["id"]: c["duration"] for c in self.classes}
-        for schedule in self.schedules:
-            duration = class_durations.get(schedule["class_id"], 0)
-            hours[schedule["teacher_id"]] += duration / 60
-        return hours
+        return DATASET.teacher_hours()
 
-    @rx.var
+    @rx.var(deps=["_rules_version", "_teachers_version"], auto_deps=False)
     def teacher_rules(self) -> dict[int, int]:
-        return {rule["teacher_id"]: rule["min_hours"] for rule in self.rules}
+        return DATASET.teacher_rules()
 
-    @rx.var
+    @rx.var(
+        deps=["_rules_version", "_schedules_version", "_classes_version"],
+        auto_deps=False,
+    )
     def rule_compliance(self) -> float:
-        compliant_teachers = 0
-        total_teachers_with_rules = 0
-        teacher_hours = self.teacher_hours
-        teacher_rules = self.teacher_rules
-        for teacher_id, min_hours in teacher_rules.items():
-            total_teachers_with_rules += 1
-            if teacher_hours.get(teacher_id, 0) >= min_hours:
-                compliant_teachers += 1
-        if total_teachers_with_rules == 0:
-            return 100.0
-        return compliant_teachers / total_teachers_with_rules * 100
+        return DATASET.rule_compliance()
+
+    def __getstate__(self):
+        """Leaves the shared dataset views out of the serialized session.
+
+        They are rebuilt from the dataset on first use, so a stored session
+        only carries its UI fields and the view versions it last showed.
+        """
+        state = super().__getstate__()
+        for name in SHARED_VIEWS:
+            state.pop(self.computed_vars[name]._cache_attr, None)
+        return state
+
+    def _sync_views(self):
+        """Catches this session up with the dataset, re-sending changed views."""
+        for view in VIEWS:
+            if getattr(self, f"_{view}_version") != DATASET.versions[view]:
+                setattr(self, f"_{view}_version", DATASET.versions[view])
+                if view == "schedules" and self.router.url.path == "/schedules":
+                    self._refresh_schedule_rows()
+
+    def _publish(self):
+        """Shows a change to this session and pushes it to the other sessions."""
+        self._sync_views()
+        task = asyncio.get_running_loop().create_task(
+            _broadcast(self.router.session.client_token)
+        )
+        _BROADCAST_TASKS.add(task)
+        task.add_done_callback(_BROADCAST_TASKS.discard)
+
+    @rx.event
+    async def load_data(self):
+        """Subscribes this session to the shared dataset, loading it on first use.
+
+        When the app runs with Redis, the dataset first catches up with
+        changes made by other backend workers.
+        """
+        await _catch_up()
+        DATASET.subscribers.add(self.router.session.client_token)
+        self._sync_views()
+        self._sync_job()
+        self._refresh_schedule_rows()
 
     def _create_teacher(self):
         """Helper to create a new teacher."""
-        new_teacher: Teacher = {
-            "id": self._next_teacher_id,
-            "name": self.teacher_name,
-            "email": self.teacher_email,
-            "subject": self.teacher_subject,
-        }
-        self.teachers.append(new_teacher)
-        self._next_teacher_id += 1
+        DATASET.add_teacher(
+            {
+                "name": self.teacher_name,
+                "email": self.teacher_email,
+                "subject": self.teacher_subject,
+            }
+        )
 
     def _update_teacher(self):
-        if self.editing_id is not None:
-            for i, teacher in enumerate(self.teachers):
-                if teacher["id"] == self.editing_id:
-                    self.teachers[i]["name"] = self.teacher_name
-                    self.teachers[i]["email"] = self.teacher_email
-                    self.teachers[i]["subject"] = self.teacher_subject
-                    break
+        DATASET.update_teacher(
+            self.editing_id,
+            {
+                "name": self.teacher_name,
+                "email": self.teacher_email,
+                "subject": self.teacher_subject,
+            },
+        )
 
     @rx.event
-    def save_teacher(self):
+    async def save_teacher(self, form_data: dict):
+        await _catch_up()
+        self._apply_form(form_data)
+        self.teacher_subject = ", ".join(split_subjects(self.teacher_subject))
         if self.is_editing:
             self._update_teacher()
         else:
             self._create_teacher()
+        self._publish()
         yield State.close_modal()
 
     @rx.event
-    def delete_teacher(self, teacher_id: int):
-        self.teachers = [t for t in self.teachers if t["id"] != teacher_id]
+    async def delete_teacher(self, teacher_id: int):
+        """Deletes a teacher along with their schedules and rules."""
+        await _catch_up()
+        removed = DATASET.delete_teacher(teacher_id)
+        self._publish()
+        return _cascade_toast("teacher", removed)
 
     def _create_class(self):
-        new_class: Class = {
-            "id": self._next_class_id,
-            "name": self.class_name,
-            "subject": self.class_subject,
-            "duration": int(self.class_duration),
-        }
-        self.classes.append(new_class)
-        self._next_class_id += 1
+        DATASET.add_class(
+            {
+                "name": self.class_name,
+                "subject": self.class_subject,
+                "duration": int(self.class_duration),
+                "size": int(self.class_size or 0),
+            }
+        )
 
     def _update_class(self):
-        if self.editing_id is not None:
-            for i, c in enumerate(self.classes):
-                if c["id"] == self.editing_id:
-                    self.classes[i]["name"] = self.class_name
-                    self.classes[i]["subject"] = self.class_subject
-                    self.classes[i]["duration"] = int(self.class_duration)
-                    break
+        DATASET.update_class(
+            self.editing_id,
+            {
+                "name": self.class_name,
+                "subject": self.class_subject,
+                "duration": int(self.class_duration),
+                "size": int(self.class_size or 0),
+            },
+        )
 
     @rx.event
-    def save_class(self):
+    async def save_class(self, form_data: dict):
+        await _catch_up()
+        self._apply_form(form_data)
         if self.is_editing:
             self._update_class()
         else:
             self._create_class()
+        self._publish()
+        yield State.close_modal()
+
+    @rx.event
+    async def delete_class(self, class_id: int):
+        """Deletes a class along with its schedules and subject requirements."""
+        await _catch_up()
+        removed = DATASET.delete_class(class_id)
+        self._publish()
+        return _cascade_toast("class", removed)
+
+    def _create_room(self):
+        DATASET.add_room({"name": self.room_name, "capacity": int(self.room_capacity)})
+
+    def _update_room(self):
+        DATASET.update_room(
+            self.editing_id,
+            {"name": self.room_name, "capacity": int(self.room_capacity)},
+        )
+
+    @rx.event
+    async def save_room(self, form_data: dict):
+        await _catch_up()
+        self._apply_form(form_data)
+        if self.is_editing:
+            self._update_room()
+        else:
+            self._create_room()
+        self._publish()
         yield State.close_modal()
 
     @rx.event
-    def delete_class(self, class_id: int):
-        self.classes = [c for c in self.classes if c["id"] != class_id]
+    async def delete_room(self, room_id: int):
+        """Deletes a room; its schedules stay, without a room."""
+        await _catch_up()
+        detached = DATASET.delete_room(room_id)
+        self._publish()
+        if detached:
+            return rx.toast(f"Deleted the room; {detached} schedule(s) have no room.")
 
     def _create_rule(self):
-        new_rule: Rule = {
-            "id": self._next_rule_id,
-            "teacher_id": int(self.rule_teacher_id),
-            "min_hours": int(self.rule_min_hours),
-        }
-        self.rules.append(new_rule)
-        self._next_rule_id += 1
+        DATASET.add_rule(
+            {
+                "teacher_id": int(self.rule_teacher_id),
+                "min_hours": int(self.rule_min_hours),
+            }
+        )
 
     def _update_rule(self):
-        if self.editing_id is not None:
-            for i, rule in enumerate(self.rules):
-                if rule["id"] == self.editing_id:
-                    self.rules[i]["teacher_id"] = int(self.rule_teacher_id)
-                    self.rules[i]["min_hours"] = int(self.rule_min_hours)
-                    break
+        DATASET.update_rule(
+            self.editing_id,
+            {
+                "teacher_id": int(self.rule_teacher_id),
+                "min_hours": int(self.rule_min_hours),
+            },
+        )
 
     @rx.event
-    def save_rule(self):
+    async def save_rule(self, form_data: dict):
+        await _catch_up()
+        self._apply_form(form_data)
         if not self.rule_teacher_id or not self.rule_min_hours:
-            return rx.toast("Please select a teacher and set minimum hours.")
+            yield rx.toast("Please select a teacher and set minimum hours.")
+            return
         if self.is_editing:
             self._update_rule()
         else:
             self._create_rule()
+        self._publish()
         yield State.close_modal()
 
     @rx.event
-    def delete_rule(self, rule_id: int):
+    async def delete_rule(self, rule_id: int):
         """Deletes a rule by its ID."""
-        self.rules = [r for r in self.rules if r["id"] != rule_id]
+        await _catch_up()
+        DATASET.delete_rule(rule_id)
+        self._publish()
 
     def _create_subject_requirement(self):
         """Helper to create a new subject requirement."""
-        new_req: SubjectRequirement = {
-            "id": self._next_subject_requirement_id,
-            "class_id": int(self.subject_requirement_class_id),
-            "subject": self.subject_requirement_subject,
-        }
-        self.subject_requirements.append(new_req)
-        self._next_subject_requirement_id += 1
+        DATASET.add_subject_requirement(
+            {
+                "class_id": int(self.subject_requirement_class_id),
+                "subject": self.subject_requirement_subject,
+                "sessions": int(self.subject_requirement_sessions),
+            }
+        )
 
     def _update_subject_requirement(self):
         """Helper to update an existing subject requirement."""
-        if self.editing_id is not None:
-            for i, req in enumerate(self.subject_requirements):
-                if req["id"] == self.editing_id:
-                    self.subject_requirements[i]["class_id"] = int(
-                        self.subject_requirement_class_id
-                    )
-                    self.subject_requirements[i]["subject"] = (
-                        self.subject_requirement_subject
-                    )
-                    break
+        DATASET.update_subject_requirement(
+            self.editing_id,
+            {
+                "class_id": int(self.subject_requirement_class_id),
+                "subject": self.subject_requirement_subject,
+                "sessions": int(self.subject_requirement_sessions),
+            },
+        )
 
     @rx.event
-    def save_subject_requirement(self):
+    async def save_subject_requirement(self, form_data: dict):
         """Saves a new or existing subject requirement."""
+        await _catch_up()
+        self._apply_form(form_data)
         if (
             not self.subject_requirement_class_id
             or not self.subject_requirement_subject
         ):
             return rx.toast("Please select a class and enter a subject.")
+        if int(self.subject_requirement_sessions or 0) < 1:
+            return rx.toast("A requirement needs at least one session a week.")
         if self.is_editing:
             self._update_subject_requirement()
         else:
             self._create_subject_requirement()
+        self._publish()
         return State.close_modal()
 
     @rx.event
-    def delete_subject_requirement(self, req_id: int):
+    async def delete_subject_requirement(self, req_id: int):
         """Deletes a subject requirement by its ID."""
-        self.subject_requirements = [
-            r for r in self.subject_requirements if r["id"] != req_id
-        ]
+        await _catch_up()
+        DATASET.delete_subject_requirement(req_id)
+        self._publish()
 
-    def _calculate_end_time(self, start_time: str, duration_minutes: int) -> str:
-        from datetime import datetime, timedelta
-
-        start_dt = datetime.strptime(start_time, "%H:%M")
-        end_dt = start_dt + timedelta(minutes=duration_minutes)
-        return end_dt.strftime("%H:%M")
-
-    def _check_conflict(
-        self,
-        new_start_str: str,
-        new_end_str: str,
-        teacher_id: int,
-        day: str,
-        exclude_schedule_id: int | None = None,
-    ) -> bool:
-        from datetime import datetime
-
-        new_start = datetime.strptime(new_start_str, "%H:%M").time()
-        new_end = datetime.strptime(new_end_str, "%H:%M").time()
-        for schedule in self.schedules:
-            if schedule["id"] == exclude_schedule_id:
-                continue
-            if schedule["teacher_id"] == teacher_id and schedule["day_of_week"] == day:
-                existing_start = datetime.strptime(
-                    schedule["start_time"], "%H:%M"
-                ).time()
-                existing_end = datetime.strptime(schedule["end_time"], "%H:%M").time()
-                if new_start < existing_end and new_end > existing_start:
-                    return True
-        return False
+    @rx.event
+    async def import_files(self, files: list[rx.UploadFile]):
+        """Bulk-imports uploaded records of the selected kind.
+
+        Every file is read and validated row by row while it is inserted,
+        and all of them go in through a single transaction. Rejected rows are
+        collected into a report instead of aborting the import.
+        """
+        if not files:
+            return rx.toast("Choose at least one file to import.")
+        await _catch_up()
+        kind = self.import_kind
+        model, _ = IMPORTERS[kind]
+        classes = load_rows(ClassModel) if kind == "subject_requirement" else []
+        class_ids_by_name: dict[str, int | None] = {}
+        for c in classes:
+            class_ids_by_name[c["name"]] = (
+                None if c["name"] in class_ids_by_name else c["id"]
+            )
+        lookups: ImportLookups = {
+            "class_ids": {c["id"] for c in classes},
+            "class_ids_by_name": class_ids_by_name,
+        }
+        errors: list[ImportRowError] = []
+        created = insert_rows(
+            model,
+            itertools.chain.from_iterable(
+                valid_rows(kind, file.name, file.file, lookups, errors)
+                for file in files
+            ),
+        )
+        DATASET.add_imported(kind, created)
+        self._publish()
+        self._import_report = errors
+        self.import_errors = errors[:IMPORT_ERROR_PREVIEW]
+        self.import_error_count = len(errors)
+        self.import_summary = import_summary(len(created), len(files), errors)
 
-    def _create_schedule(self):
+    @rx.event
+    def download_import_report(self):
+        """Downloads every row rejected by the last import as CSV."""
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=["file", "row", "error"])
+        writer.writeheader()
+        writer.writerows(self._import_report)
+        return rx.download(data=output.getvalue(), filename="import_errors.csv")
+
+    def _schedule_values(self) -> dict | rx.event.EventSpec:
+        """Builds the schedule from the form, or a toast saying why it can't be.
+
+        The booking must fit the bell schedule, the room must seat the class
+        and none of the teacher, class or room may already be booked then.
+        """
         class_id = int(self.schedule_class_id)
         teacher_id = int(self.schedule_teacher_id)
-        selected_class = next((c for c in self.classes if c["id"] == class_id), None)
+        room_id = int(self.schedule_room_id) if self.schedule_room_id else None
+        selected_class = DATASET.classes.get(class_id)
         if not selected_class:
             return rx.toast("Selected class not found.")
-        end_time = self._calculate_end_time(
-            self.schedule_start_time, selected_class["duration"]
-        )
-        if self._check_conflict(
-            self.schedule_start_time, end_time, teacher_id, self.schedule_day_of_week
-        ):
+        start_time = to_minutes(self.schedule_start_time)
+        end_time = start_time + selected_class["duration"]
+        if not SLOTS.fits(self.schedule_day_of_week, start_time, end_time):
             return rx.toast(
-                "Schedule conflict: Teacher is already booked at this time.",
-                duration=5000,
+                "The class must fit within the school day without crossing a break."
             )
-        new_schedule: Schedule = {
-            "id": self._next_schedule_id,
+        if room_id is not None:
+            room = DATASET.rooms.get(room_id)
+            if not room:
+                return rx.toast("Selected room not found.")
+            if room["capacity"] < selected_class["size"]:
+                return rx.toast(
+                    f"{room['name']} seats {room['capacity']}, but the class has "
+                    f"{selected_class['size']} students.",
+                    duration=5000,
+                )
+        schedule = {
             "class_id": class_id,
             "teacher_id": teacher_id,
+            "room_id": room_id,
             "day_of_week": self.schedule_day_of_week,
-            "start_time": self.schedule_start_time,
+            "start_time": start_time,
             "end_time": end_time,
         }
-        self.schedules.append(new_schedule)
-        self._next_schedule_id += 1
+        clashes = DATASET.clashes(schedule, exclude_id=self.editing_id)
+        if clashes:
+            return rx.toast(
+                f"Schedule conflict: the {' and '.join(clashes)} "
+                f"{'is' if len(clashes) == 1 else 'are'} already booked at this time.",
+                duration=5000,
+            )
+        return schedule
+
+    def _create_schedule(self):
+        schedule = self._schedule_values()
+        if not isinstance(schedule, dict):
+            return schedule
+        DATASET.add_schedule(schedule)
+        self._publish()
         return State.close_modal()
 
     def _update_schedule(self):
         if self.editing_id is not None:
-            class_id = int(self.schedule_class_id)
-            teacher_id = int(self.schedule_teacher_id)
-            selected_class = next(
-                (c for c in self.classes if c["id"] == class_id), None
-            )
-            if not selected_class:
-                return rx.toast("Selected class not found.")
-            end_time = self._calculate_end_time(
-                self.schedule_start_time, selected_class["duration"]
-            )
-            if self._check_conflict(
-                self.schedule_start_time,
-                end_time,
-                teacher_id,
-                self.schedule_day_of_week,
-                exclude_schedule_id=self.editing_id,
-            ):
-                return rx.toast(
-                    "Schedule conflict: Teacher is already booked at this time.",
-                    duration=5000,
-                )
-            for i, schedule in enumerate(self.schedules):
-                if schedule["id"] == self.editing_id:
-                    self.schedules[i]["class_id"] = class_id
-                    self.schedules[i]["teacher_id"] = teacher_id
-                    self.schedules[i]["day_of_week"] = self.schedule_day_of_week
-                    self.schedules[i]["start_time"] = self.schedule_start_time
-                    self.schedules[i]["end_time"] = end_time
-                    break
+            schedule = self._schedule_values()
+            if not isinstance(schedule, dict):
+                return schedule
+            DATASET.update_schedule(self.editing_id, schedule)
+            self._publish()
             return State.close_modal()
 
     @rx.event
-    def save_schedule(self):
+    async def save_schedule(self, form_data: dict):
+        await _catch_up()
+        self._apply_form(form_data)
         if not self.schedule_class_id or not self.schedule_teacher_id:
             return rx.toast("Please select both a class and a teacher.")
         if self.is_editing:
@@ -379,79 +602,112 @@ class State(rx.State):
             return self._create_schedule()
 
     @rx.event
-    def delete_schedule(self, schedule_id: int):
+    async def delete_schedule(self, schedule_id: int):
         """Deletes a schedule by its ID."""
-        self.schedules = [s for s in self.schedules if s["id"] != schedule_id]
+        await _catch_up()
+        DATASET.delete_schedule(schedule_id)
+        self._publish()
+
+    def _refresh_schedule_rows(self):
+        """Re-queries the visible window of the schedules page."""
+        teacher_id = self.schedule_filter_teacher_id
+        class_id = self.schedule_filter_class_id
+        rows, total = query_schedules(
+            teacher_id=int(teacher_id) if teacher_id else None,
+            class_id=int(class_id) if class_id else None,
+            day=self.schedule_filter_day or None,
+            sort=self.schedule_sort,
+            offset=self.schedule_page * SCHEDULE_PAGE_SIZE,
+            limit=SCHEDULE_PAGE_SIZE,
+        )
+        if not rows and total and self.schedule_page:
+            self.schedule_page = (total - 1) // SCHEDULE_PAGE_SIZE
+            self._refresh_schedule_rows()
+            return
+        self.schedule_rows = rows
+        self.schedule_total = total
 
-    @rx.event(background=True)
+    @rx.event
+    def filter_schedules(self, field: str, value: str):
+        """Applies a schedules page filter or sort and jumps to the first page."""
+        if field == "teacher":
+            self.schedule_filter_teacher_id = value
+        elif field == "class":
+            self.schedule_filter_class_id = value
+        elif field == "day":
+            self.schedule_filter_day = value
+        elif field == "sort":
+            self.schedule_sort = value
+        self.schedule_page = 0
+        self._refresh_schedule_rows()
+
+    @rx.event
+    def change_schedule_page(self, delta: int):
+        self.schedule_page = min(
+            max(self.schedule_page + delta, 0), self.schedule_page_count - 1
+        )
+        self._refresh_schedule_rows()
+
+    @rx.event
     async def generate_schedule(self):
-        """Automatically generates schedules based on requirements and constraints."""
-        import random
-
-        async with self:
-            self.is_generating_schedule = True
-            self.schedules.clear()
-            self.generation_progress = 0
-            self.generation_message = "Starting schedule generation..."
-        days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
-        time_slots = [f"{h:02d}:00" for h in range(8, 17)]
-        total_requirements = len(self.subject_requirements)
-        generated_count = 0
-        for req in self.subject_requirements:
-            await asyncio.sleep(0.5)
-            async with self:
-                self.generation_message = (
-                    f"Processing requirement for class ID {req['class_id']}..."
-                )
-            target_class_id = req["class_id"]
-            target_subject = req["subject"]
-            target_class = next(
-                (c for c in self.classes if c["id"] == target_class_id), None
+        """Starts a generation job with the chosen options.
+
+        The job runs in a worker process of its own and carries on when this
+        tab closes. Every session follows its progress through ``_sync_job``,
+        which the job runner pushes to them, so no state lock is held while
+        it runs.
+        """
+        await _catch_up()
+        if JOBS.active() is not None:
+            return rx.toast("A schedule is already being generated.")
+        job = JOBS.create(
+            self.generation_mode,
+            self.generation_solver,
+            int(self.generation_attempts),
+            float(self.generation_optimize_seconds),
+        )
+        _start_job(job)
+        self._sync_job()
+
+    @rx.event
+    def cancel_generation(self):
+        """Stops the running job, keeping its checkpoint to resume from."""
+        job = JOBS.active()
+        cancelled = job is not None and JOBS.cancel(job.id)
+        self._sync_job()
+        if not cancelled:
+            return rx.toast("No job is running, so there is nothing to cancel.")
+
+    @rx.event
+    async def resume_generation(self):
+        """Runs the last job again with its options, from its checkpoint."""
+        await _catch_up()
+        job = JOBS.latest()
+        if job is None or not job.resumable or JOBS.active() is not None:
+            return
+        _start_job(job)
+        self._sync_job()
+
+    def _sync_job(self):
+        """Shows the latest generation job, whichever session started it."""
+        job = JOBS.latest()
+        if job is None:
+            return
+        self.is_generating_schedule = job.active
+        self.generation_job_status = job.status
+        self.generation_resumable = job.resumable
+        if job.status == "completed":
+            self.generation_progress = 100
+        else:
+            self.generation_progress = (
+                int(job.done / job.total * 100) if job.total else 0
             )
-            if not target_class:
-                continue
-            eligible_teachers = [
-                t for t in self.teachers if t["subject"] == target_subject
-            ]
-            random.shuffle(eligible_teachers)
-            scheduled = False
-            for teacher in eligible_teachers:
-                random.shuffle(days)
-                random.shuffle(time_slots)
-                for day in days:
-                    for start_time in time_slots:
-                        end_time = self._calculate_end_time(
-                            start_time, target_class["duration"]
-                        )
-                        if not self._check_conflict(
-                            start_time, end_time, teacher["id"], day
-                        ):
-                            async with self:
-                                new_schedule: Schedule = {
-                                    "id": self._next_schedule_id,
-                                    "class_id": target_class_id,
-                                    "teacher_id": teacher["id"],
-                                    "day_of_week": day,
-                                    "start_time": start_time,
-                                    "end_time": end_time,
-                                }
-                                self.schedules.append(new_schedule)
-                                self._next_schedule_id += 1
-                            scheduled = True
-                            break
-                    if scheduled:
-                        break
-                if scheduled:
-                    break
-            async with self:
-                generated_count += 1
-                self.generation_progress = int(
-                    generated_count / total_requirements * 100
-                )
-        async with self:
-            self.generation_message = "Schedule generation complete!"
-            await asyncio.sleep(2)
-            self.is_generating_schedule = False
+        self.generation_message = job.message
+        self.unplaced_requirements = [
+            DATASET.subject_requirements[req_id]
+            for req_id in job.unplaced
+            if req_id in DATASET.subject_requirements
+        ]
 
     def _reset_form_fields(self):
         """Resets all form fields to their default values."""
@@ -461,17 +717,28 @@ class State(rx.State):
         self.class_name = ""
         self.class_subject = ""
         self.class_duration = "60"
+        self.class_size = "0"
+        self.room_name = ""
+        self.room_capacity = "30"
         self.schedule_class_id = ""
         self.schedule_teacher_id = ""
+        self.schedule_room_id = ""
         self.schedule_day_of_week = "Monday"
         self.schedule_start_time = "09:00"
         self.rule_teacher_id = ""
         self.rule_min_hours = ""
         self.subject_requirement_class_id = ""
         self.subject_requirement_subject = ""
+        self.subject_requirement_sessions = "1"
         self.editing_id = None
         self.is_editing = False
 
+    def _apply_form(self, form_data: dict):
+        """Copies a submitted modal form onto the matching form fields."""
+        for name, value in form_data.items():
+            if name in FORM_FIELDS:
+                setattr(self, name, str(value))
+
     @rx.event
     def open_modal(self, modal_type: ModalType, item_id: int | None = None):
         self.modal_type = modal_type
@@ -481,39 +748,235 @@ class State(rx.State):
             self.is_editing = True
             self.editing_id = item_id
             if modal_type == "teacher":
-                teacher = next((t for t in self.teachers if t["id"] == item_id), None)
+                teacher = DATASET.teachers.get(item_id)
                 if teacher:
                     self.teacher_name = teacher["name"]
                     self.teacher_email = teacher["email"]
                     self.teacher_subject = teacher["subject"]
             elif modal_type == "class":
-                _class = next((c for c in self.classes if c["id"] == item_id), None)
+                _class = DATASET.classes.get(item_id)
                 if _class:
                     self.class_name = _class["name"]
                     self.class_subject = _class["subject"]
                     self.class_duration = str(_class["duration"])
+                    self.class_size = str(_class["size"])
+            elif modal_type == "room":
+                room = DATASET.rooms.get(item_id)
+                if room:
+                    self.room_name = room["name"]
+                    self.room_capacity = str(room["capacity"])
             elif modal_type == "schedule":
-                schedule = next((s for s in self.schedules if s["id"] == item_id), None)
+                schedule = DATASET.schedules.get(item_id)
                 if schedule:
                     self.schedule_class_id = str(schedule["class_id"])
                     self.schedule_teacher_id = str(schedule["teacher_id"])
+                    self.schedule_room_id = str(schedule["room_id"] or "")
                     self.schedule_day_of_week = schedule["day_of_week"]
-                    self.schedule_start_time = schedule["start_time"]
+                    self.schedule_start_time = to_time_str(schedule["start_time"])
             elif modal_type == "rule":
-                rule = next((r for r in self.rules if r["id"] == item_id), None)
+                rule = DATASET.rules.get(item_id)
                 if rule:
                     self.rule_teacher_id = str(rule["teacher_id"])
                     self.rule_min_hours = str(rule["min_hours"])
             elif modal_type == "subject_requirement":
-                req = next(
-                    (r for r in self.subject_requirements if r["id"] == item_id), None
-                )
+                req = DATASET.subject_requirements.get(item_id)
                 if req:
                     self.subject_requirement_class_id = str(req["class_id"])
                     self.subject_requirement_subject = req["subject"]
+                    self.subject_requirement_sessions = str(req["sessions"])
 
     @rx.event
     def close_modal(self):
         self.show_modal = False
         self.modal_type = ""
-        self._reset_form_fields()
\ No newline at end of file
+        self._reset_form_fields()
+
+
+@functools.cache
+def _shared_redis():
+    """Returns the Redis client of the state manager, or None without Redis."""
+    return prerequisites.get_redis()
+
+
+async def _catch_up():
+    """Brings this worker's dataset up to date before it is read or changed.
+
+    Edits are validated against the dataset, so with several backend workers
+    each one first catches up with the changes the others made; otherwise a
+    clash with a lesson booked elsewhere would go unnoticed.
+    """
+    client = _shared_redis()
+    if client is not None:
+        await DATASET.pull(client)
+    elif not DATASET.loaded:
+        DATASET.load()
+
+
+async def _broadcast(origin: str):
+    """Catches every other connected session up with the dataset.
+
+    Each session only compares view versions and re-sends the views that
+    moved, so the update it receives is limited to what changed. Sessions on
+    other workers see the change on their next page load.
+    """
+    client = _shared_redis()
+    if client is not None:
+        await DATASET.push(client)
+    await _update_sessions(State._sync_views, origin)
+
+
+async def _broadcast_job():
+    """Shows every connected session where the latest generation job is."""
+    await _update_sessions(State._sync_job)
+
+
+async def _update_sessions(update: Callable[["State"], None], origin: str = ""):
+    """Applies ``update`` to the state of every subscribed session but ``origin``."""
+    from app.app import app
+
+    connected = app.event_namespace.token_to_sid if app.event_namespace else {}
+    for token in list(DATASET.subscribers):
+        if token == origin:
+            continue
+        if token not in connected:
+            DATASET.subscribers.discard(token)
+            continue
+        async with app.modify_state(f"{token}_{State.get_full_name()}") as root:
+            update(await root.get_state(State))
+
+
+def _start_job(job: GenerationJob):
+    """Builds a job's problem from the dataset and runs the job in the background.
+
+    In repair mode only the classes edited since the last run are looked at:
+    their broken schedules are dropped or stretched and their unmet
+    requirements are placed around the rest of the timetable, which is left
+    as it is. A repair starts over when resumed, since it is quick.
+    """
+    JOBS.start(job)
+    plan = None
+    stale: set[int] = set()
+    try:
+        if job.mode == "repair":
+            schedules, requirements = DATASET.repair_scope()
+            stale = {row["class_id"] for row in schedules + requirements}
+            plan = plan_repair(
+                schedules,
+                requirements,
+                teachers=DATASET.teachers,
+                classes=DATASET.classes,
+                rooms=DATASET.rooms,
+                slots=SLOTS,
+                occupancy=DATASET.occupancy,
+                subjects=DATASET.subject_index,
+            )
+            requirements = plan.requirements
+            job.checkpoint = []
+        else:
+            requirements = [dict(r) for r in DATASET.subject_requirements.values()]
+        problem = SchedulingProblem(
+            teachers=[dict(t) for t in DATASET.teachers.values()],
+            classes=[dict(c) for c in DATASET.classes.values()],
+            requirements=requirements,
+            slots=SLOTS,
+            rules=[dict(r) for r in DATASET.rules.values()],
+            rooms=[dict(r) for r in DATASET.rooms.values()],
+            booked=plan.booked if plan is not None else None,
+            loads=dict(DATASET.teacher_minutes) if plan is not None else {},
+        )
+    except Exception as error:
+        # Started jobs block new ones, so one that cannot run must not stay
+        # running.
+        JOBS.fail(job, f"{type(error).__name__}: {error}")
+        DATASET.stale_classes.update(stale)
+        return
+    task = asyncio.get_running_loop().create_task(_run_job(job, problem, plan, stale))
+    _JOB_TASKS.add(task)
+    task.add_done_callback(_JOB_TASKS.discard)
+
+
+async def _run_job(
+    job: GenerationJob,
+    problem: SchedulingProblem,
+    plan: RepairPlan | None,
+    stale: set[int],
+):
+    """Waits for a job and commits its schedules in a single update.
+
+    A job that raises here, in its worker or while committing is marked
+    failed rather than left running.
+    """
+    try:
+        result = await JOBS.run(job, problem, _broadcast_job)
+        if result is not None:
+            # The data may have changed on another worker while the job ran.
+            await _catch_up()
+            message, unplaced_ids = _commit(result, plan)
+    except Exception as error:
+        JOBS.fail(job, f"{type(error).__name__}: {error}")
+        result = None
+    if result is None:
+        # Nothing was applied, so the edits still need a repair.
+        DATASET.stale_classes.update(stale)
+        await _broadcast_job()
+        return
+    JOBS.finish(job, message, sorted(unplaced_ids))
+    await _broadcast("")
+    await _broadcast_job()
+
+
+def _commit(result: SolverResult, plan: RepairPlan | None) -> tuple[str, set[int]]:
+    """Writes a job's schedules; returns its message and unplaced requirements.
+
+    Schedules whose records were deleted or booked elsewhere while the job
+    ran are left out, and their requirements reported as unplaced.
+    """
+    unplaced_ids = set(result.unplaced)
+    schedules = _schedules_of(result)
+    if plan is None:
+        dropped = DATASET.replace_schedules(schedules)
+        unplaced_ids.update(
+            result.placements[index]["requirement_id"] for index in dropped
+        )
+        if unplaced_ids:
+            message = (
+                f"Schedule generation complete, but {len(unplaced_ids)} "
+                "requirement(s) could not be fully placed."
+            )
+        else:
+            message = "Schedule generation complete!"
+    else:
+        dropped = DATASET.apply_repair(plan.removed, plan.stretched, schedules)
+        unplaced_ids.update(
+            result.placements[index]["requirement_id"] for index in dropped
+        )
+        message = (
+            f"Repair complete: {len(plan.removed)} schedule(s) removed, "
+            f"{len(plan.stretched)} adjusted and "
+            f"{len(schedules) - len(dropped)} placed."
+        )
+        if unplaced_ids:
+            message += f" {len(unplaced_ids)} requirement(s) could not be fully placed."
+    return message, unplaced_ids
+
+
+def _schedules_of(result: SolverResult) -> list[dict]:
+    """Turns a solver's placements into schedule rows."""
+    return [
+        {
+            "class_id": placement["class_id"],
+            "teacher_id": placement["teacher_id"],
+            "room_id": placement["room_id"],
+            "day_of_week": placement["day_of_week"],
+            "start_time": placement["start_time"],
+            "end_time": placement["end_time"],
+        }
+        for placement in result.placements
+    ]
+
+
+def _cascade_toast(kind: str, removed: dict[str, int]):
+    """Tells the user which dependent records went with a deleted record."""
+    parts = [f"{count} {label}(s)" for label, count in removed.items() if count]
+    if parts:
+        return rx.toast(f"Deleted the {kind} and its {', '.join(parts)}.")
\ No newline at end of file
@@ -0,0 +1,5 @@
+"""Reproducible benchmarks for the scheduling core.
+
+Run them from the repository root with ``python -m benchmarks.run``, or name
+the ones to run, e.g. ``python -m benchmarks.run conflicts generation``.
+"""
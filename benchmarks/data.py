@@ -0,0 +1,175 @@
+import random
+
+from app.scheduling.bells import BellSchedule, Period, SlotTable
+from app.scheduling.solver import SchedulingProblem
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+# The app's bell schedule: four hours, an hour for lunch, four more hours.
+BELLS = BellSchedule(
+    days=WEEKDAYS,
+    periods=[
+        *(Period(f"Period {n}", (7 + n) * 60, (8 + n) * 60) for n in range(1, 5)),
+        Period("Lunch", 12 * 60, 13 * 60, is_break=True),
+        *(Period(f"Period {n}", (8 + n) * 60, (9 + n) * 60) for n in range(5, 9)),
+    ],
+)
+HOURS = [period.start for period in BELLS.periods if not period.is_break]
+
+
+def random_school(
+    teachers: int,
+    requirements: int,
+    classes: int | None = None,
+    subjects: int = 10,
+    subjects_per_teacher: int = 2,
+    rooms: int = 0,
+    seed: int = 0,
+) -> SchedulingProblem:
+    """Builds a school with random subjects, durations and requirements.
+
+    Nothing guarantees that every requirement fits; large ones are usually
+    over-constrained. Every fourth teacher gets a minimum-hours rule.
+    """
+    rng = random.Random(seed)
+    names = [f"Subject {i}" for i in range(subjects)]
+    classes = classes or teachers * 2
+    return SchedulingProblem(
+        teachers=[
+            {
+                "id": i,
+                "name": f"Teacher {i}",
+                "email": "",
+                "subject": ", ".join(rng.sample(names, subjects_per_teacher)),
+            }
+            for i in range(1, teachers + 1)
+        ],
+        classes=[
+            {
+                "id": i,
+                "name": f"Class {i}",
+                "subject": "",
+                "duration": rng.choice((45, 60, 60, 90)),
+                "size": rng.randint(15, 30),
+            }
+            for i in range(1, classes + 1)
+        ],
+        requirements=[
+            {
+                "id": i,
+                "class_id": rng.randint(1, classes),
+                "subject": rng.choice(names),
+                "sessions": rng.choice((1, 1, 2, 3)),
+            }
+            for i in range(1, requirements + 1)
+        ],
+        slots=SlotTable(BELLS),
+        rules=[
+            {"id": i, "teacher_id": i, "min_hours": rng.randint(5, 15)}
+            for i in range(1, teachers + 1, 4)
+        ],
+        rooms=[
+            {"id": i, "name": f"Room {i}", "capacity": rng.choice((20, 30, 40))}
+            for i in range(1, rooms + 1)
+        ],
+    )
+
+
+def planted_school(
+    seed: int = 0,
+    teachers: int = 8,
+    subjects: int = 4,
+    subjects_per_teacher: int = 2,
+    classes: int = 24,
+    load: float = 0.9,
+) -> SchedulingProblem:
+    """Builds a school with a known timetable that meets every requirement.
+
+    Hour-long lessons are booked into the periods of the week until the
+    teachers are ``load`` busy, each with a teacher and class that are both
+    free then and a subject the teacher teaches. The sessions of a
+    requirement go on different days with one teacher, so the hidden
+    timetable satisfies every constraint the solvers enforce and a complete
+    solver should place everything.
+    """
+    rng = random.Random(seed)
+    names = [f"Subject {i}" for i in range(subjects)]
+    staff = [
+        {
+            "id": i,
+            "name": f"Teacher {i}",
+            "email": "",
+            "subject": ", ".join(rng.sample(names, subjects_per_teacher)),
+        }
+        for i in range(1, teachers + 1)
+    ]
+    busy: set[tuple[str, int, str, int]] = set()
+    target = int(teachers * len(WEEKDAYS) * len(HOURS) * load)
+    requirements: list[dict] = []
+    booked = 0
+    while booked < target:
+        teacher = rng.choice(staff)
+        class_id = rng.randint(1, classes)
+        sessions = min(rng.randint(1, 3), target - booked)
+        picks = []
+        for day in rng.sample(WEEKDAYS, len(WEEKDAYS)):
+            free = [
+                hour
+                for hour in HOURS
+                if ("teacher", teacher["id"], day, hour) not in busy
+                and ("class", class_id, day, hour) not in busy
+            ]
+            if free:
+                picks.append((day, rng.choice(free)))
+                if len(picks) == sessions:
+                    break
+        if len(picks) < sessions:
+            continue
+        for day, hour in picks:
+            busy.add(("teacher", teacher["id"], day, hour))
+            busy.add(("class", class_id, day, hour))
+        booked += sessions
+        requirements.append(
+            {
+                "id": len(requirements) + 1,
+                "class_id": class_id,
+                "subject": rng.choice(teacher["subject"].split(", ")),
+                "sessions": sessions,
+            }
+        )
+    return SchedulingProblem(
+        teachers=staff,
+        classes=[
+            {
+                "id": i,
+                "name": f"Class {i}",
+                "subject": "",
+                "duration": 60,
+                "size": 20,
+            }
+            for i in range(1, classes + 1)
+        ],
+        requirements=requirements,
+        slots=SlotTable(BELLS),
+    )
+
+
+def random_schedules(
+    count: int, teachers: int = 200, classes: int = 400, seed: int = 0
+) -> list[dict]:
+    """Returns ``count`` schedule rows at random hours, clashes and all."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(1, count + 1):
+        start = rng.choice(HOURS)
+        rows.append(
+            {
+                "id": i,
+                "class_id": rng.randint(1, classes),
+                "teacher_id": rng.randint(1, teachers),
+                "room_id": rng.choice((None, rng.randint(1, 50))),
+                "day_of_week": rng.choice(WEEKDAYS),
+                "start_time": start,
+                "end_time": start + 60,
+            }
+        )
+    return rows
@@ -0,0 +1,384 @@
+"""Runs the benchmarks named on the command line, or all of them."""
+
+import argparse
+import os
+import pickle
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable
+
+from app.scheduling.occupancy import OccupancyGrid
+from app.scheduling.schedule_table import ScheduleTable
+from app.scheduling.solver import SOLVERS, get_solver
+from app.scheduling.times import to_time_str
+from benchmarks.data import (
+    WEEKDAYS,
+    planted_school,
+    random_schedules,
+    random_school,
+)
+
+
+# Kept apart from the app's own keys, in case REDIS_URL is a live server.
+BENCHMARK_KEY = "school_scheduler:benchmark:snapshot"
+
+
+def best_of(repeat: int, run: Callable[[], object]) -> float:
+    """Returns the fastest of ``repeat`` runs, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - began)
+    return min(timings)
+
+
+def conflicts(lookups: int = 200):
+    """Cost of one teacher conflict check against n schedules.
+
+    The string scan is the check the app started with: parse every
+    schedule's "HH:MM" times and compare them. The minute scan does the same
+    on integer minutes, and the grid is the ``OccupancyGrid`` the app uses.
+    """
+    print("schedules   string scan   minute scan   occupancy grid   (us/check)")
+    for count in (1_000, 10_000, 100_000):
+        rows = random_schedules(count)
+        strings = [
+            {
+                **row,
+                "start_time": to_time_str(row["start_time"]),
+                "end_time": to_time_str(row["end_time"]),
+            }
+            for row in rows
+        ]
+        grid = OccupancyGrid()
+        for row in rows:
+            grid.add(
+                (("teacher", row["teacher_id"]),),
+                row["day_of_week"],
+                row["start_time"],
+                row["end_time"],
+                row["id"],
+            )
+        rng = random.Random(count)
+        checks = [
+            (rng.randint(1, 200), rng.choice(WEEKDAYS), rng.choice((540, 600, 840)))
+            for _ in range(lookups)
+        ]
+
+        def string_scan():
+            for teacher_id, day, start in checks:
+                new_start = datetime.strptime(to_time_str(start), "%H:%M").time()
+                new_end = datetime.strptime(to_time_str(start + 60), "%H:%M").time()
+                for row in strings:
+                    if row["teacher_id"] == teacher_id and row["day_of_week"] == day:
+                        if new_start < datetime.strptime(
+                            row["end_time"], "%H:%M"
+                        ).time() and new_end > datetime.strptime(
+                            row["start_time"], "%H:%M"
+                        ).time():
+                            break
+
+        def minute_scan():
+            for teacher_id, day, start in checks:
+                for row in rows:
+                    if (
+                        row["teacher_id"] == teacher_id
+                        and row["day_of_week"] == day
+                        and start < row["end_time"]
+                        and start + 60 > row["start_time"]
+                    ):
+                        break
+
+        def grid_check():
+            for teacher_id, day, start in checks:
+                grid.overlaps((("teacher", teacher_id),), day, start, start + 60)
+
+        repeat = 1 if count > 10_000 else 3
+        print(
+            f"{count:>9,}"
+            f"   {best_of(repeat, string_scan) / lookups * 1e6:>11.1f}"
+            f"   {best_of(repeat, minute_scan) / lookups * 1e6:>11.1f}"
+            f"   {best_of(5, grid_check) / lookups * 1e6:>14.2f}"
+        )
+
+
+def generation(planted_runs: int = 40):
+    """Wall clock and placements of each solver, and how often they solve.
+
+    The first table runs each solver once on random schools of 100
+    teachers, which are over-constrained at 2,000 requirements. The second
+    counts, over seeded schools with a planted timetable at 90% teacher
+    load, how often each solver places everything and how many sessions it
+    leaves unplaced in total, with teachers holding one or two subjects.
+    """
+    print("requirements   solver            seconds   placed   unplaced")
+    for requirements in (1_000, 2_000):
+        problem = random_school(teachers=100, requirements=requirements)
+        for name in SOLVERS:
+            solver = get_solver(name, seed=1)
+            began = time.perf_counter()
+            result = solver.solve(problem)
+            elapsed = time.perf_counter() - began
+            print(
+                f"{requirements:>12,}   {name:<15}   {elapsed:>7.2f}"
+                f"   {len(result.placements):>6}   {len(result.unplaced):>8}"
+            )
+    print()
+    print("subjects/teacher   solver            solved     unplaced   seconds")
+    for subjects_per_teacher in (1, 2):
+        problems = [
+            planted_school(seed, subjects_per_teacher=subjects_per_teacher)
+            for seed in range(planted_runs)
+        ]
+        for name in SOLVERS:
+            solved = unplaced = 0
+            began = time.perf_counter()
+            for seed, problem in enumerate(problems):
+                result = get_solver(name, seed=seed).solve(problem)
+                solved += not result.unplaced
+                unplaced += len(result.unplaced)
+            elapsed = time.perf_counter() - began
+            print(
+                f"{subjects_per_teacher:>16}   {name:<15}"
+                f"   {solved:>3} of {planted_runs:<3}   {unplaced:>7}   {elapsed:>7.2f}"
+            )
+
+
+def schedule_blob():
+    """Size and decode time of the schedule table, pickled or as a blob.
+
+    The round trip also stores the payload in Redis and reads it back the
+    way workers share the snapshot, with HSET and HMGET, before decoding
+    it. It uses the server at REDIS_URL when set, else fakeredis, and is
+    skipped when neither is available.
+    """
+    client = _redis_client()
+    header = "rows      pickled list   blob        decode pickle / blob (ms)"
+    if client is not None:
+        header += "   round trip pickle / blob (ms)"
+    print(header)
+    for count in (1_000, 10_000, 100_000):
+        rows = random_schedules(count)
+        pickled = pickle.dumps(rows)
+        blob = ScheduleTable.from_records(WEEKDAYS, rows).to_bytes()
+
+        def decode_pickle(payload: bytes):
+            return pickle.loads(payload)
+
+        def decode_blob(payload: bytes):
+            return list(ScheduleTable.from_bytes(WEEKDAYS, payload).records())
+
+        def round_trip(payload: bytes, decode: Callable[[bytes], object]):
+            client.hset(
+                BENCHMARK_KEY, mapping={"generation": count, "schedules": payload}
+            )
+            _, stored = client.hmget(BENCHMARK_KEY, ["generation", "schedules"])
+            decode(stored)
+
+        from_pickle = best_of(7, lambda: decode_pickle(pickled))
+        from_blob = best_of(7, lambda: decode_blob(blob))
+        line = (
+            f"{count:>7,}   {len(pickled) / 1000:>9.1f} KB"
+            f"   {len(blob) / 1000:>7.1f} KB"
+            f"   {from_pickle * 1000:>8.1f} / {from_blob * 1000:<8.1f}"
+        )
+        if client is not None:
+            via_pickle = best_of(7, lambda: round_trip(pickled, decode_pickle))
+            via_blob = best_of(7, lambda: round_trip(blob, decode_blob))
+            line += f"          {via_pickle * 1000:>8.1f} / {via_blob * 1000:.1f}"
+        print(line.rstrip())
+    if client is None:
+        print("round trip skipped: it needs fakeredis or a server at REDIS_URL")
+    else:
+        client.delete(BENCHMARK_KEY)
+
+
+def _redis_client():
+    """Returns a client of the server at REDIS_URL, else of fakeredis, or None."""
+    try:
+        if os.environ.get("REDIS_URL"):
+            import redis
+
+            return redis.Redis.from_url(os.environ["REDIS_URL"])
+        import fakeredis
+    except ImportError:
+        return None
+    return fakeredis.FakeRedis()
+
+
+def dataset(sizes: tuple[int, ...] = (100, 10_000, 100_000), repeat: int = 20):
+    """Median time of the dataset's edit and delete paths with n of each record.
+
+    Runs against a scratch SQLite database, so each timing includes the
+    write. The save_* rows time the dataset update behind each edit form,
+    and open_modal the lookups that fill a form from the record being
+    edited. Also compares reloading the dataset from the database with
+    taking its schedules from the blob another worker shared. Needs the
+    app's dependencies.
+    """
+    try:
+        import reflex as rx
+    except ImportError:
+        print("skipped: the dataset benchmark needs the app's dependencies")
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DB_URL"] = f"sqlite:///{directory}/benchmark.db"
+        from app.dataset import Dataset
+        from app.models import (
+            ClassModel,
+            RuleModel,
+            ScheduleModel,
+            SubjectRequirementModel,
+            TeacherModel,
+            insert_rows,
+        )
+
+        rx.Model.create_all()
+        print("records   operation                  median ms")
+        for count in sizes:
+            problem = random_school(teachers=count, requirements=count, classes=count)
+            with rx.session() as session:
+                for model in (
+                    ScheduleModel,
+                    SubjectRequirementModel,
+                    RuleModel,
+                    ClassModel,
+                    TeacherModel,
+                ):
+                    session.exec(model.__table__.delete())
+                session.commit()
+            teachers = insert_rows(
+                TeacherModel, [_without_id(t) for t in problem.teachers]
+            )
+            classes = insert_rows(
+                ClassModel, [_without_id(c) for c in problem.classes]
+            )
+            insert_rows(
+                RuleModel,
+                [
+                    {"teacher_id": teachers[i]["id"], "min_hours": 5}
+                    for i in range(count)
+                ],
+            )
+            insert_rows(
+                SubjectRequirementModel,
+                [
+                    {
+                        **_without_id(req),
+                        "class_id": classes[req["class_id"] - 1]["id"],
+                    }
+                    for req in problem.requirements
+                ],
+            )
+            insert_rows(
+                ScheduleModel,
+                [
+                    {
+                        **_without_id(row),
+                        "teacher_id": teachers[row["teacher_id"] % count]["id"],
+                        "class_id": classes[row["class_id"] % count]["id"],
+                        "room_id": None,
+                    }
+                    for row in random_schedules(count)
+                ],
+            )
+            data = Dataset(WEEKDAYS)
+            data.load()
+            ids = {
+                "teacher": list(data.teachers),
+                "class": list(data.classes),
+                "schedule": list(data.schedules),
+                "rule": list(data.rules),
+                "subject_requirement": list(data.subject_requirements),
+            }
+            stores = {
+                "teacher": data.teachers,
+                "class": data.classes,
+                "schedule": data.schedules,
+                "rule": data.rules,
+                "subject_requirement": data.subject_requirements,
+            }
+            operations = {
+                "open_modal": lambda i: [
+                    store.get(ids[kind][i]) for kind, store in stores.items()
+                ],
+                "update_teacher": lambda i: data.update_teacher(
+                    ids["teacher"][i],
+                    {"name": f"Renamed {i}", "email": "", "subject": "Subject 0"},
+                ),
+                "save_class": lambda i: data.update_class(
+                    ids["class"][i],
+                    {"name": f"Renamed {i}", "subject": "", "duration": 60, "size": 20},
+                ),
+                "save_rule": lambda i: data.update_rule(
+                    ids["rule"][i],
+                    {"teacher_id": ids["teacher"][i + 1], "min_hours": 6},
+                ),
+                "save_subject_requirement": lambda i: data.update_subject_requirement(
+                    ids["subject_requirement"][i],
+                    {
+                        "class_id": ids["class"][i + 1],
+                        "subject": "Subject 1",
+                        "sessions": 2,
+                    },
+                ),
+                "update_schedule": lambda i: data.update_schedule(
+                    ids["schedule"][i], {"start_time": 600, "end_time": 660}
+                ),
+                "delete_schedule": lambda i: data.delete_schedule(ids["schedule"][-i - 1]),
+                "delete_rule": lambda i: data.delete_rule(ids["rule"][-i - 1]),
+                "delete_teacher": lambda i: data.delete_teacher(ids["teacher"][-i - 1]),
+                "delete_class": lambda i: data.delete_class(ids["class"][-i - 1]),
+            }
+            for name, operation in operations.items():
+                timings = []
+                for i in range(repeat):
+                    began = time.perf_counter()
+                    operation(i)
+                    timings.append(time.perf_counter() - began)
+                print(
+                    f"{count:>7,}   {name:<24}   {statistics.median(timings) * 1000:>9.2f}"
+                )
+            blob = data.schedule_blob()
+            from_db = best_of(3, data.load)
+            from_blob = best_of(
+                3,
+                lambda: data.load(ScheduleTable.from_bytes(WEEKDAYS, blob).records()),
+            )
+            print(f"{count:>7,}   {'load from database':<24}   {from_db * 1000:>9.2f}")
+            print(f"{count:>7,}   {'load from blob':<24}   {from_blob * 1000:>9.2f}")
+
+
+def _without_id(row: dict) -> dict:
+    return {key: value for key, value in row.items() if key != "id"}
+
+
+BENCHMARKS = {
+    "conflicts": conflicts,
+    "generation": generation,
+    "schedule_blob": schedule_blob,
+    "dataset": dataset,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "names", nargs="*", help=f"any of {', '.join(BENCHMARKS)}; all by default"
+    )
+    names = parser.parse_args().names or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    for name in names:
+        print(f"== {name}: {BENCHMARKS[name].__doc__.splitlines()[0]}")
+        BENCHMARKS[name]()
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+from app.scheduling.occupancy import OccupancyGrid, booking_resources
+from app.scheduling.solver import SchedulingProblem, daily_limit
+from app.scheduling.subjects import SubjectIndex
+
+
+def violations(problem: SchedulingProblem, placements: list[dict]) -> list[str]:
+    """Returns every hard constraint the placements break, as messages.
+
+    Lessons already booked in ``problem.booked`` count as taken. Placements
+without a ``requirement_id`` are stored schedules and are only checked
+against the bell schedule, rooms and other lessons.
+    """
+    classes = {c["id"]: c for c in problem.classes}
+    rooms = {r["id"]: r for r in problem.rooms}
+    requirements = {req["id"]: req for req in problem.requirements}
+    subjects = SubjectIndex(problem.teachers)
+    grid = problem.booked.snapshot() if problem.booked else OccupancyGrid()
+    teachers: dict[int, set[int]] = {}
+    days: dict[tuple[int, str], int] = {}
+    found = []
+    for i, p in enumerate(placements):
+        req = requirements.get(p.get("requirement_id"))
+        _class = classes[p["class_id"]]
+        day, start, end = p["day_of_week"], p["start_time"], p["end_time"]
+        if req is not None:
+            if p["class_id"] != req["class_id"]:
+                found.append(f"{p} is not for the requirement's class")
+            if not subjects.qualified(p["teacher_id"], req["subject"]):
+                found.append(f"{p} has a teacher not qualified in {req['subject']}")
+            teachers.setdefault(req["id"], set()).add(p["teacher_id"])
+            days[(req["id"], day)] = days.get((req["id"], day), 0) + 1
+        if end - start != _class["duration"]:
+            found.append(f"{p} does not last the class's duration")
+        if not problem.slots.fits(day, start, end):
+            found.append(f"{p} does not fit the bell schedule")
+        if problem.rooms:
+            room = rooms.get(p["room_id"])
+            if room is None or room["capacity"] < _class["size"]:
+                found.append(f"{p} has no room that seats the class")
+        elif p["room_id"] is not None:
+            found.append(f"{p} has a room in a problem without rooms")
+        resources = booking_resources(p["teacher_id"], p["class_id"], p["room_id"])
+        for kind, _ in grid.clashes(resources, day, start, end):
+            found.append(f"{p} double-books its {kind}")
+        grid.add(resources, day, start, end, i)
+    for req_id, taught_by in teachers.items():
+        if len(taught_by) > 1:
+            found.append(f"requirement {req_id} is split between teachers")
+    for (req_id, day), count in days.items():
+        sessions = requirements[req_id].get("sessions", 1)
+        if count > daily_limit(sessions, len(problem.slots.days)):
+            found.append(f"requirement {req_id} has {count} sessions on {day}")
+    return found
+
+
+def session_count(problem: SchedulingProblem) -> int:
+    return sum(req.get("sessions", 1) for req in problem.requirements)
@@ -0,0 +1,85 @@
+import io
+import itertools
+
+import pytest
+
+pytest.importorskip("reflex")
+
+from app.bulk_import import import_summary, valid_rows  # noqa: E402
+
+LOOKUPS = {"class_ids": {1, 2}, "class_ids_by_name": {"7A": 1, "7B": 2, "8": None}}
+
+
+def _rows(kind, filename, content, errors):
+    return list(valid_rows(kind, filename, io.BytesIO(content), LOOKUPS, errors))
+
+
+def test_csv_rows_are_validated_and_rejects_reported_by_line():
+    errors = []
+    rows = _rows(
+        "teacher",
+        "teachers.csv",
+        b"\xef\xbb\xbfname,email,subject\n"
+        b'Ada,ada@example.com,"Math,Science"\n'
+        b",nobody@example.com,Art\n"
+        b"Grace,not-an-email,Physics\n",
+        errors,
+    )
+    assert rows == [
+        {"name": "Ada", "email": "ada@example.com", "subject": "Math, Science"}
+    ]
+    assert [(e["file"], e["row"]) for e in errors] == [
+        ("teachers.csv", 3),
+        ("teachers.csv", 4),
+    ]
+
+
+def test_json_lines_keep_going_past_a_broken_line():
+    errors = []
+    rows = _rows(
+        "subject_requirement",
+        "requirements.jsonl",
+        b'{"class_name": "7B", "subject": "Math", "sessions": 2}\n'
+        b"{not json\n"
+        b'{"class_name": "8", "subject": "Art"}\n'
+        b'{"class_id": 1, "subject": "Art"}\n',
+        errors,
+    )
+    assert rows == [
+        {"class_id": 2, "subject": "Math", "sessions": 2},
+        {"class_id": 1, "subject": "Art", "sessions": 1},
+    ]
+    assert [e["row"] for e in errors] == [2, 3]
+    assert errors[0]["error"].startswith("Not valid JSON")
+    assert "ambiguous" in errors[1]["error"]
+
+
+def test_unreadable_file_keeps_the_rows_before_it():
+    # Files are decoded a buffer at a time, so the bad byte has to come
+    # well after the rows that are kept.
+    errors = []
+    content = b"name,subject,duration\n" + b"7A,Math,45\n" * 2000 + b"\xff\n"
+    rows = _rows("class", "classes.csv", content, errors)
+    assert rows
+    assert rows[0] == {"name": "7A", "subject": "Math", "duration": 45, "size": 0}
+    assert len(errors) == 1
+    assert errors[0]["row"] == len(rows) + 1
+    assert errors[0]["error"].startswith("Unreadable file")
+
+
+def test_summary_counts_every_file_of_an_import():
+    errors = []
+    uploads = [
+        ("a.json", b'[{"name": "7C", "subject": "Art", "duration": 60}, 3]'),
+        ("b.csv", b"name,subject,duration\n7D,Math,0\n"),
+    ]
+    created = list(
+        itertools.chain.from_iterable(
+            valid_rows("class", name, io.BytesIO(content), LOOKUPS, errors)
+            for name, content in uploads
+        )
+    )
+    assert len(created) == 1
+    assert import_summary(len(created), len(uploads), errors) == (
+        "Imported 1 record(s) from 2 file(s); 2 row(s) skipped."
+    )
@@ -0,0 +1,134 @@
+import asyncio
+import dataclasses
+
+from app.scheduling.jobs import JobRunner, complete_placements, resume_problem
+from app.scheduling.solver import GreedySolver
+from benchmarks.data import planted_school, random_school
+from tests.helpers import session_count, violations
+
+
+def test_complete_placements_keeps_only_whole_requirements():
+    placements = [
+        {"requirement_id": 1},
+        {"requirement_id": 1},
+        {"requirement_id": 2},
+        {"requirement_id": 3},
+    ]
+    kept = complete_placements(placements, {1: 2, 2: 3, 3: 1})
+    assert [p["requirement_id"] for p in kept] == [1, 1, 3]
+
+
+def test_resume_keeps_valid_checkpoint_and_solves_the_rest_around_it():
+    problem = planted_school(1)
+    checkpoint = GreedySolver(seed=1).solve(problem).placements
+    gone = checkpoint[0]["teacher_id"]
+    problem = dataclasses.replace(
+        problem, teachers=[t for t in problem.teachers if t["id"] != gone]
+    )
+    narrowed, kept = resume_problem(problem, checkpoint)
+    assert kept and all(p["teacher_id"] != gone for p in kept)
+    assert {p["requirement_id"] for p in kept}.isdisjoint(
+        req["id"] for req in narrowed.requirements
+    )
+    result = GreedySolver(seed=2).solve(narrowed)
+    assert violations(problem, kept + result.placements) == []
+
+
+def test_resume_drops_checkpointed_sessions_that_clash():
+    problem = planted_school(2)
+    checkpoint = GreedySolver(seed=1).solve(problem).placements
+    twin = {**checkpoint[0], "requirement_id": checkpoint[-1]["requirement_id"]}
+    narrowed, kept = resume_problem(problem, checkpoint + [twin])
+    assert twin not in kept
+    assert violations(problem, kept) == []
+
+
+def _start(runner, problem):
+    job = runner.create("rebuild", "backtracking", 1, 0.0)
+    runner.start(job)
+    task = asyncio.get_running_loop().create_task(
+        runner.run(job, problem, _nothing)
+    )
+    return job, task
+
+
+async def _nothing():
+    pass
+
+
+async def _wait_for_progress(job):
+    while not job.done:
+        await asyncio.sleep(0.05)
+
+
+def test_cancelled_job_resumes_from_its_checkpoint(tmp_path):
+    problem = random_school(teachers=100, requirements=2000)
+
+    async def cancel_midway():
+        runner = JobRunner(tmp_path, poll_interval=0.05)
+        job, task = _start(runner, problem)
+        await _wait_for_progress(job)
+        assert runner.cancel(job.id)
+        return job, await task
+
+    job, result = asyncio.run(cancel_midway())
+    assert result is None
+    saved = JobRunner(tmp_path).latest()
+    assert saved.status == "cancelled" and saved.resumable
+    assert saved.checkpoint == job.checkpoint
+    narrowed, kept = resume_problem(problem, saved.checkpoint)
+    assert len(kept) == len(saved.checkpoint) > 0
+    assert session_count(narrowed) + len(kept) == session_count(problem)
+    assert violations(problem, kept) == []
+
+
+def test_another_runner_can_cancel_a_job_it_does_not_run(tmp_path):
+    problem = random_school(teachers=100, requirements=2000)
+
+    async def cancel_from_elsewhere():
+        runner, elsewhere = JobRunner(tmp_path, poll_interval=0.05), JobRunner(tmp_path)
+        job, task = _start(runner, problem)
+        await _wait_for_progress(job)
+        assert elsewhere.cancel(job.id)
+        result = await task
+        assert not elsewhere.cancel(job.id)
+        return result
+
+    assert asyncio.run(cancel_from_elsewhere()) is None
+    saved = JobRunner(tmp_path).latest()
+    assert saved.status == "cancelled" and saved.checkpoint
+    assert list(tmp_path.glob("*.cancel")) == []
+
+
+def test_shutdown_interrupts_running_job_with_a_checkpoint(tmp_path):
+    problem = random_school(teachers=100, requirements=2000)
+
+    async def shut_down_midway():
+        runner = JobRunner(tmp_path, poll_interval=0.05)
+        job, task = _start(runner, problem)
+        await _wait_for_progress(job)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return runner
+
+    runner = asyncio.run(shut_down_midway())
+    assert runner.active() is None
+    saved = JobRunner(tmp_path).latest()
+    assert saved.status == "interrupted" and saved.checkpoint
+    _, kept = resume_problem(problem, saved.checkpoint)
+    assert violations(problem, kept) == []
+
+
+def test_active_sees_jobs_started_and_failed_by_another_runner(tmp_path):
+    here, elsewhere = JobRunner(tmp_path), JobRunner(tmp_path)
+    assert here.active() is None
+    job = elsewhere.create("rebuild", "greedy", 1, 0.0)
+    elsewhere.start(job)
+    assert here.active().id == job.id
+    elsewhere.fail(job, "RuntimeError: boom")
+    assert here.active() is None
+    assert here.latest().status == "failed" and here.latest().resumable
+    assert elsewhere.latest() is job
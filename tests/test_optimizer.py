@@ -0,0 +1,44 @@
+from collections import Counter
+
+import pytest
+
+from app.scheduling.optimizer import LocalSearchOptimizer
+from app.scheduling.solver import GreedySolver
+from benchmarks.data import random_school
+from tests.helpers import violations
+
+
+@pytest.mark.parametrize("rooms", [0, 12])
+def test_optimizing_keeps_every_lesson_valid_and_never_costs_more(rooms):
+    problem = random_school(teachers=12, requirements=80, rooms=rooms, seed=6)
+    solved = GreedySolver(seed=1).solve(problem)
+    optimizer = LocalSearchOptimizer(time_budget=0.3, seed=2)
+    result = optimizer.optimize(problem, solved)
+    assert optimizer.moves > 0
+    assert optimizer.final_cost <= optimizer.initial_cost
+    assert violations(problem, result.placements) == []
+    assert Counter(p["requirement_id"] for p in result.placements) == Counter(
+        p["requirement_id"] for p in solved.placements
+    )
+    assert result.unplaced == solved.unplaced
+
+
+@pytest.mark.parametrize("rooms", [0, 12])
+def test_optimizer_returns_the_best_timetable_it_saw(rooms):
+    # Kept this hot, the search wanders and rarely ends on its best state.
+    problem = random_school(teachers=12, requirements=80, rooms=rooms, seed=6)
+    solved = GreedySolver(seed=1).solve(problem)
+    optimizer = LocalSearchOptimizer(
+        time_budget=0.3, seed=2, start_temperature=50.0, end_temperature=50.0
+    )
+    result = optimizer.optimize(problem, solved)
+    assert optimizer.final_cost < optimizer.initial_cost
+    assert optimizer.cost() == pytest.approx(optimizer.final_cost)
+    assert violations(problem, result.placements) == []
+
+
+def test_stopped_optimizer_returns_the_timetable_it_was_given():
+    problem = random_school(teachers=12, requirements=80, seed=6)
+    solved = GreedySolver(seed=1).solve(problem)
+    optimizer = LocalSearchOptimizer(time_budget=5.0, should_stop=lambda: True)
+    assert optimizer.optimize(problem, solved) is solved
@@ -0,0 +1,102 @@
+import dataclasses
+
+from app.scheduling.occupancy import OccupancyGrid, booking_resources
+from app.scheduling.repair import plan_repair
+from app.scheduling.solver import GreedySolver
+from app.scheduling.subjects import SubjectIndex
+from benchmarks.data import random_school
+from tests.helpers import violations
+
+
+def _timetable(problem):
+    """Solves the problem and stores the result as schedule rows would be."""
+    result = GreedySolver(seed=1).solve(problem)
+    schedules = []
+    grid = OccupancyGrid()
+    for i, p in enumerate(result.placements, 1):
+        schedule = {key: value for key, value in p.items() if key != "requirement_id"}
+        schedule["id"] = i
+        schedules.append(schedule)
+        grid.add(
+            booking_resources(p["teacher_id"], p["class_id"], p["room_id"]),
+            p["day_of_week"],
+            p["start_time"],
+            p["end_time"],
+            i,
+        )
+    return schedules, grid
+
+
+def _repair(problem, schedules, grid):
+    """Plans a repair over every class and places what it leaves unmet."""
+    plan = plan_repair(
+        schedules,
+        problem.requirements,
+        {t["id"]: t for t in problem.teachers},
+        {c["id"]: c for c in problem.classes},
+        {r["id"]: r for r in problem.rooms},
+        problem.slots,
+        grid,
+        SubjectIndex(problem.teachers),
+    )
+    kept = [
+        {**s, "end_time": plan.stretched.get(s["id"], s["end_time"])}
+        for s in schedules
+        if s["id"] not in plan.removed
+    ]
+    result = GreedySolver(seed=2).solve(
+        dataclasses.replace(problem, requirements=plan.requirements, booked=plan.booked)
+    )
+    return plan, kept, result
+
+
+def test_repair_after_deleting_a_teacher_keeps_the_timetable_valid():
+    problem = random_school(teachers=10, requirements=40, rooms=8, seed=7)
+    schedules, grid = _timetable(problem)
+    gone = schedules[0]["teacher_id"]
+    problem = dataclasses.replace(
+        problem, teachers=[t for t in problem.teachers if t["id"] != gone]
+    )
+    plan, kept, result = _repair(problem, schedules, grid)
+    assert {s["id"] for s in schedules if s["teacher_id"] == gone} <= set(plan.removed)
+    assert all(p["teacher_id"] != gone for p in kept + result.placements)
+    assert violations(problem, kept + result.placements) == []
+
+
+def test_repair_after_deleting_a_room_and_a_class_keeps_the_timetable_valid():
+    problem = random_school(teachers=10, requirements=40, rooms=8, seed=8)
+    schedules, grid = _timetable(problem)
+    room = schedules[0]["room_id"]
+    class_id = schedules[-1]["class_id"]
+    problem = dataclasses.replace(
+        problem,
+        rooms=[r for r in problem.rooms if r["id"] != room],
+        classes=[c for c in problem.classes if c["id"] != class_id],
+        requirements=[r for r in problem.requirements if r["class_id"] != class_id],
+    )
+    plan, kept, result = _repair(problem, schedules, grid)
+    assert {
+        s["id"] for s in schedules if s["room_id"] == room or s["class_id"] == class_id
+    } <= set(plan.removed)
+    assert violations(problem, kept + result.placements) == []
+
+
+def test_repair_after_shortening_a_class_stretches_its_lessons_in_place():
+    problem = random_school(teachers=10, requirements=40, seed=9)
+    schedules, grid = _timetable(problem)
+    class_id = next(
+        s["class_id"] for s in schedules if s["end_time"] - s["start_time"] == 60
+    )
+    problem = dataclasses.replace(
+        problem,
+        classes=[
+            {**c, "duration": 45} if c["id"] == class_id else c
+            for c in problem.classes
+        ],
+    )
+    plan, kept, result = _repair(problem, schedules, grid)
+    lessons = [s for s in schedules if s["class_id"] == class_id]
+    assert lessons and all(s["id"] in plan.stretched for s in lessons)
+    assert all(plan.stretched[s["id"]] == s["start_time"] + 45 for s in lessons)
+    assert not set(plan.removed)
+    assert violations(problem, kept + result.placements) == []
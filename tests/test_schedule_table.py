@@ -0,0 +1,33 @@
+import pytest
+
+from app.scheduling.schedule_table import HEADER, ScheduleTable
+from benchmarks.data import WEEKDAYS, random_schedules
+
+
+def test_blob_round_trip_keeps_every_row():
+    rows = random_schedules(500)
+    blob = ScheduleTable.from_records(WEEKDAYS, rows).to_bytes()
+    table = ScheduleTable.from_bytes(WEEKDAYS, blob)
+    assert len(table) == len(rows)
+    assert list(table.records()) == rows
+
+
+def test_empty_table_round_trips():
+    blob = ScheduleTable.from_records(WEEKDAYS, []).to_bytes()
+    assert len(blob) == HEADER.size
+    assert list(ScheduleTable.from_bytes(WEEKDAYS, blob).records()) == []
+
+
+@pytest.mark.parametrize("cut", [0, HEADER.size - 1, HEADER.size + 1, -1])
+def test_truncated_blob_is_rejected(cut):
+    blob = ScheduleTable.from_records(WEEKDAYS, random_schedules(10)).to_bytes()
+    with pytest.raises(ValueError):
+        ScheduleTable.from_bytes(WEEKDAYS, blob[:cut])
+
+
+def test_blob_of_another_format_is_rejected():
+    blob = ScheduleTable.from_records(WEEKDAYS, random_schedules(10)).to_bytes()
+    with pytest.raises(ValueError):
+        ScheduleTable.from_bytes(WEEKDAYS, b"XXXX" + blob[4:])
+    with pytest.raises(ValueError):
+        ScheduleTable.from_bytes(WEEKDAYS, blob[:4] + b"\x01" + blob[5:])
@@ -0,0 +1,77 @@
+import dataclasses
+
+import pytest
+
+from app.scheduling.occupancy import OccupancyGrid, booking_resources
+from app.scheduling.solver import SOLVERS, BacktrackingSolver, GreedySolver, get_solver
+from benchmarks.data import planted_school, random_school
+from tests.helpers import session_count, violations
+
+
+@pytest.mark.parametrize("name", SOLVERS)
+@pytest.mark.parametrize("rooms", [0, 12])
+def test_solvers_never_break_hard_constraints(name, rooms):
+    problem = random_school(teachers=12, requirements=80, rooms=rooms, seed=3)
+    result = get_solver(name, seed=1).solve(problem)
+    assert violations(problem, result.placements) == []
+    assert len(result.placements) + len(result.unplaced) == session_count(problem)
+
+
+@pytest.mark.parametrize("name", SOLVERS)
+def test_solvers_work_around_booked_lessons(name):
+    problem = random_school(teachers=6, requirements=30, seed=4)
+    booked = OccupancyGrid()
+    for i, teacher in enumerate(problem.teachers):
+        for day in problem.slots.days:
+            booked.add(booking_resources(teacher["id"], -1, None), day, 480, 600, -i)
+    problem = dataclasses.replace(problem, booked=booked)
+    result = get_solver(name, seed=1).solve(problem)
+    assert result.placements
+    assert violations(problem, result.placements) == []
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("subjects_per_teacher", [1, 2])
+def test_backtracking_places_planted_timetable(seed, subjects_per_teacher):
+    # Teachers holding several subjects make the requirements' eligible
+    # teachers overlap; a known timetable exists, so nothing should be left.
+    problem = planted_school(seed, subjects_per_teacher=subjects_per_teacher)
+    result = BacktrackingSolver(seed=0).solve(problem)
+    assert result.unplaced == []
+    assert violations(problem, result.placements) == []
+
+
+def test_backtracking_restarts_until_everything_is_placed():
+    # With this seed the first run gives one session up.
+    problem = planted_school(17, subjects_per_teacher=1)
+    assert BacktrackingSolver(seed=17, time_budget=0).solve(problem).unplaced
+    result = BacktrackingSolver(seed=17).solve(problem)
+    assert result.unplaced == []
+    assert violations(problem, result.placements) == []
+
+
+@pytest.mark.parametrize("subjects_per_teacher", [1, 2])
+def test_backtracking_solves_planted_timetables_at_least_as_often_as_greedy(
+    subjects_per_teacher,
+):
+    problems = [
+        planted_school(seed, subjects_per_teacher=subjects_per_teacher)
+        for seed in range(20)
+    ]
+    solved = {
+        solver: sum(not solver(seed=0).solve(problem).unplaced for problem in problems)
+        for solver in (BacktrackingSolver, GreedySolver)
+    }
+    assert solved[BacktrackingSolver] >= solved[GreedySolver]
+
+
+@pytest.mark.parametrize("name", SOLVERS)
+def test_stopped_solver_reports_the_rest_unplaced(name):
+    problem = random_school(teachers=12, requirements=80, seed=5)
+    calls = []
+    solver = get_solver(name, seed=1, should_stop=lambda: len(calls) > 5)
+    solver.on_progress = lambda done, total: calls.append(done)
+    result = solver.solve(problem)
+    assert result.unplaced
+    assert len(result.placements) + len(result.unplaced) == session_count(problem)
+    assert violations(problem, result.placements) == []